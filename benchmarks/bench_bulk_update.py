@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: repricing a seller's whole inventory - per-row UPDATEs vs. executemany vs. one set-based UPDATE
+
+Every strategy applies the same change (price +/- ₹1, stock +/- 1 on
+alternate runs, so every run writes every row) to SKUS products:
+  per-row commits  one UPDATE and one commit per product, as a screen saving
+                   rows one at a time would
+  per-row, 1 txn   the same UPDATEs inside one transaction
+  executemany      update_products() with the new values computed in Python
+  set-based        bulk_update_products(), the values computed by SQLite
+The dry run (preview_bulk_update) is timed too, since the screen shows it first.
+
+Usage: python benchmarks/bench_bulk_update.py [skus] [repeats]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.bulk import BulkChange
+from database.db_manager import DatabaseManager
+
+SELLER = "7000000000"
+UPDATE_ROW = "UPDATE products SET price = ?, stock_qty = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+
+
+def build_inventory(db, skus):
+    with db.connection() as conn:
+        conn.execute("INSERT INTO users (name, phone, email, password, role, location) VALUES (?, ?, '', 'pw', 'seller', 'Mandi')",
+                     ("Seller", SELLER))
+        conn.executemany("""INSERT INTO products (seller_phone, name, category, unit, price, stock_qty)
+                            VALUES (?, ?, 'Vegetables', 'kg', ?, ?)""",
+                         [(SELLER, f"Crop {i}", 10 + i % 90 + 0.25, 10 + i % 50) for i in range(skus)])
+        conn.commit()
+
+
+def new_values(db, step):
+    return [(p.id, round(p.price + step, 2), p.stock_qty + step, p.status) for p in db.get_user_products(SELLER)]
+
+
+def per_row_commits(db, step):
+    rows = new_values(db, step)
+    with db.connection() as conn:
+        for product_id, price, stock_qty, _ in rows:
+            conn.execute(UPDATE_ROW, (price, stock_qty, product_id))
+            conn.commit()
+    db.invalidate_tables("products")
+    return len(rows)
+
+
+def per_row_one_transaction(db, step):
+    rows = new_values(db, step)
+    with db.connection() as conn:
+        for product_id, price, stock_qty, _ in rows:
+            conn.execute(UPDATE_ROW, (price, stock_qty, product_id))
+        conn.commit()
+    db.invalidate_tables("products")
+    return len(rows)
+
+
+def executemany(db, step):
+    return db.update_products(SELLER, new_values(db, step))
+
+
+def set_based(db, step):
+    return db.bulk_update_products(SELLER, BulkChange(price_delta=step, stock_delta=step))
+
+
+def dry_run(db, step):
+    return len(db.preview_bulk_update(SELLER, BulkChange(price_delta=step, stock_delta=step)).changed)
+
+
+STRATEGIES = [("per-row commits", per_row_commits), ("per-row, 1 txn", per_row_one_transaction),
+              ("executemany", executemany), ("set-based", set_based), ("dry run", dry_run)]
+
+
+def time_ms(function, db, repeats):
+    samples = []
+    for run in range(repeats):
+        step = 1 if run % 2 == 0 else -1
+        started = time.perf_counter()
+        written = function(db, step)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), written
+
+
+def main():
+    skus = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), "bench_bulk_update.db"))
+    db.init_database()
+    build_inventory(db, skus)
+
+    print(f"{skus} SKUs, median of {repeats} runs\n")
+    print(f"{'strategy':<18}{'ms':>10}{'rows':>8}{'vs set-based':>14}")
+    results = [(name, *time_ms(function, db, repeats)) for name, function in STRATEGIES]
+    baseline = dict((name, ms) for name, ms, _ in results)["set-based"]
+    for name, ms, written in results:
+        print(f"{name:<18}{ms:>10.1f}{written:>8}{ms / baseline:>13.1f}x")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pricing a cart in one SQL aggregate vs. per-line Python arithmetic
+
+The Python path is what CartScreen used to do plus what it lacked: fetch the
+cart lines, multiply price by quantity per row, then look up each product's
+stock and status to flag shortages. The SQL path is get_cart_summary().
+
+Usage: python benchmarks/bench_cart_summary.py [repeats]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+
+CART_SIZES = [10, 100, 500, 1000]
+SELLERS = 25
+BUYER = "8000000000"
+
+
+def build_market(db, products):
+    with db.connection() as conn:
+        users = [(f"Seller {i}", f"7{i:09d}", "", "pw", "seller", "Mandi") for i in range(SELLERS)]
+        users.append(("Buyer", BUYER, "", "pw", "buyer", "Hamirpur"))
+        conn.executemany("INSERT INTO users (name, phone, email, password, role, location) VALUES (?, ?, ?, ?, ?, ?)",
+                         users)
+        conn.executemany("""INSERT INTO products (seller_phone, name, category, unit, price, stock_qty)
+                            VALUES (?, ?, 'Vegetables', 'kg', ?, ?)""",
+                         [(f"7{i % SELLERS:09d}", f"Crop {i}", 10 + i % 90 + 0.25, i % 7)
+                          for i in range(products)])
+        conn.commit()
+
+
+def fill_cart(db, lines):
+    with db.connection() as conn:
+        conn.execute("DELETE FROM cart")
+        conn.execute("""INSERT INTO cart (buyer_phone, product_id, quantity, price_at_add)
+                        SELECT ?, id, 1 + id % 4, price - (id % 10 = 0) FROM products ORDER BY id LIMIT ?""",
+                     (BUYER, lines))
+        conn.commit()
+
+
+def python_summary(db):
+    """Line totals, seller subtotals, grand total and flags computed row by row"""
+    items = db.get_cart_items(BUYER)
+    sellers, total, shortages = {}, 0.0, []
+    with db.connection() as conn:
+        for item in items:
+            line_total = round(item.price * item.quantity, 2)
+            sellers[item.seller_name] = sellers.get(item.seller_name, 0.0) + line_total
+            total += line_total
+            stock_qty, status = conn.execute("SELECT stock_qty, status FROM products WHERE id = ?",
+                                             (item.product_id,)).fetchone()
+            if status != 'active' or stock_qty < item.quantity:
+                shortages.append(item)
+    return round(total, 2), sellers, shortages
+
+
+def sql_summary(db):
+    summary = db.get_cart_summary(BUYER)
+    return summary.total, summary.sellers, summary.shortages
+
+
+def time_ms(function, db, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function(db)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), "bench_cart_summary.db"))
+    db.init_database()
+    build_market(db, max(CART_SIZES))
+
+    print(f"Median of {repeats} runs, {SELLERS} sellers\n")
+    print(f"{'lines':>6}{'python ms':>12}{'sql ms':>10}{'speedup':>10}{'flagged':>10}")
+    for lines in CART_SIZES:
+        fill_cart(db, lines)
+        python_ms, (python_total, _, python_short) = time_ms(python_summary, db, repeats)
+        sql_ms, (sql_total, _, sql_short) = time_ms(sql_summary, db, repeats)
+        assert python_total == sql_total and len(python_short) == len(sql_short), (python_total, sql_total)
+        print(f"{lines:>6}{python_ms:>12.2f}{sql_ms:>10.2f}{python_ms / sql_ms:>9.1f}x{len(sql_short):>10}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent checkouts against one database file
+
+Many buyer threads check out carts drawn from a small pool of hot products,
+so most checkouts contend for the same rows and some must be refused. At the
+end every product's stock is reconciled against the orders placed.
+
+Usage: python benchmarks/bench_checkout.py [buyers] [threads]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import CheckoutError, DatabaseManager
+
+SELLERS = 20
+PRODUCTS = 50
+STOCK_PER_PRODUCT = 40
+
+
+def build_market(db, buyers):
+    rng = random.Random(7)
+    with db.connection() as conn:
+        users = [(f"Seller {i}", f"7{i:09d}", "", "pw", "seller", "Mandi") for i in range(SELLERS)]
+        users += [(f"Buyer {i}", f"8{i:09d}", "", "pw", "buyer", "Hamirpur") for i in range(buyers)]
+        conn.executemany("INSERT INTO users (name, phone, email, password, role, location) VALUES (?, ?, ?, ?, ?, ?)",
+                         users)
+        conn.executemany("""INSERT INTO products (seller_phone, name, category, unit, price, stock_qty)
+                            VALUES (?, ?, 'Vegetables', 'kg', ?, ?)""",
+                         [(f"7{i % SELLERS:09d}", f"Crop {i}", 10 + i, STOCK_PER_PRODUCT)
+                          for i in range(PRODUCTS)])
+        cart = []
+        for i in range(buyers):
+            for product_id in rng.sample(range(1, PRODUCTS + 1), rng.randint(1, 4)):
+                cart.append((f"8{i:09d}", product_id, rng.randint(1, 3)))
+        conn.executemany("INSERT INTO cart (buyer_phone, product_id, quantity) VALUES (?, ?, ?)", cart)
+        conn.commit()
+
+
+def run_checkouts(db, buyers, threads):
+    queue = list(range(buyers))
+    lock = threading.Lock()
+    latencies, outcomes = [], {"ordered": 0, "sold out": 0, "failed": 0}
+
+    def worker():
+        while True:
+            with lock:
+                if not queue:
+                    return
+                buyer = queue.pop()
+            started = time.perf_counter()
+            try:
+                db.create_order(f"8{buyer:09d}", "Bench address", "Cash on delivery")
+                outcome = "ordered"
+            except CheckoutError:
+                outcome = "sold out"
+            except Exception as e:
+                print(f"Checkout error: {e}")
+                outcome = "failed"
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+                outcomes[outcome] += 1
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started, latencies, outcomes
+
+
+def reconcile(db):
+    """Products whose remaining stock does not match the orders placed against them"""
+    with db.connection() as conn:
+        return conn.execute("""SELECT p.id, p.stock_qty, COALESCE(SUM(o.quantity), 0) as ordered
+                               FROM products p LEFT JOIN orders o ON o.product_id = p.id
+                               GROUP BY p.id
+                               HAVING p.stock_qty < 0 OR p.stock_qty + ordered != ?""",
+                            (STOCK_PER_PRODUCT,)).fetchall()
+
+
+def main():
+    buyers = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), "bench_checkout.db"),
+                         pool_size=8, pool_timeout=30.0, pragma_profile="server-throughput")
+    db.init_database()
+    build_market(db, buyers)
+
+    # The per-checkout success line would drown the report
+    real_stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        elapsed, latencies, outcomes = run_checkouts(db, buyers, threads)
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+    latencies.sort()
+    print(f"{buyers:,} checkouts on {threads} threads over {PRODUCTS} products in {elapsed:.2f}s "
+          f"({buyers / elapsed:,.0f} checkouts/s)")
+    print(f"  ordered: {outcomes['ordered']:,}  sold out: {outcomes['sold out']:,}  failed: {outcomes['failed']:,}")
+    print(f"  latency p50 {statistics.median(latencies):.1f} ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.1f} ms  max {latencies[-1]:.1f} ms")
+    stats = db.pool_stats()
+    print(f"  busy retries: {db.checkout_retries}  pool waits: {stats['waits']:,}  "
+          f"avg pool wait {stats['avg_wait_ms']:.1f} ms")
+
+    mismatched = reconcile(db)
+    print("✅ No overselling: stock + ordered == initial stock for every product" if not mismatched
+          else f"❌ Stock mismatch for {len(mismatched)} products: {mismatched[:5]}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
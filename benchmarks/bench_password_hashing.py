@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: login latency and throughput at each password hashing cost
+
+Usage: python benchmarks/bench_password_hashing.py [logins_per_level] [batch_size]
+"""
+
+import os
+import statistics
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.credentials import PBKDF2, SCRYPT, PasswordHasher, calibrate
+
+LEVELS = [
+    (PBKDF2, 100_000),
+    (PBKDF2, 200_000),
+    (PBKDF2, 400_000),
+    (PBKDF2, 600_000),
+    (SCRYPT, 2 ** 14),
+    (SCRYPT, 2 ** 15),
+]
+
+
+def time_logins(hasher, stored, logins):
+    """Median and max ms of uncached verifications"""
+    samples = []
+    for _ in range(logins):
+        hasher.forget(stored)
+        started = time.perf_counter()
+        assert hasher.verify("Kisan@123", stored)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def time_batch(hasher, batch_size):
+    """Hashes per second when registering batch_size users at once"""
+    passwords = [f"Imported#{i}" for i in range(batch_size)]
+    started = time.perf_counter()
+    hasher.hash_many(passwords)
+    return batch_size / (time.perf_counter() - started)
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    levels = LEVELS + [(PBKDF2, calibrate(PBKDF2))]
+
+    print(f"{logins} logins per level, batches of {batch_size}, {os.cpu_count()} CPUs\n")
+    print(f"{'algorithm':<15}{'cost':>10}{'login ms':>11}{'max':>9}{'logins/s':>10}{'batch hashes/s':>16}")
+    for algorithm, cost in levels:
+        hasher = PasswordHasher(algorithm, cost)
+        stored = hasher.hash("Kisan@123")
+        median_ms, max_ms = time_logins(hasher, stored, logins)
+        label = f"{cost:,}" + ("*" if (algorithm, cost) == levels[-1] else "")
+        print(f"{algorithm:<15}{label:>10}{median_ms:>11.1f}{max_ms:>9.1f}"
+              f"{1000 / median_ms:>10.1f}{time_batch(hasher, batch_size):>16.1f}")
+
+    hasher = PasswordHasher(*levels[-1])
+    stored = hasher.hash("Kisan@123")
+    hasher.verify("Kisan@123", stored)
+    started = time.perf_counter()
+    for _ in range(1000):
+        hasher.verify("Kisan@123", stored)
+    cached_us = (time.perf_counter() - started) * 1000
+    print(f"\n* calibrated for this device. Cached re-verification: {cached_us:.1f} µs per login")
+
+
+if __name__ == "__main__":
+    main()
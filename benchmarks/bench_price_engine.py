@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-tick cost of the NumPy price engine vs the old per-product loop
+
+Usage: python benchmarks/bench_price_engine.py [commodities] [sellers] [products_per_seller]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.price_engine import PriceEngine
+
+
+def build(commodities, sellers, per_seller):
+    rng = random.Random(11)
+    names = [f"Commodity {i}" for i in range(commodities)]
+    market = {name: {"base_price": rng.uniform(10, 500), "volatility": rng.uniform(0.02, 0.2)}
+              for name in names}
+    holdings = [(f"9{s:09d}", name) for s in range(sellers) for name in rng.sample(names, per_seller)]
+    return market, holdings
+
+
+def loop_tick(market, holdings, last_prices):
+    """The previous PriceMonitor algorithm, run for every seller's products"""
+    alerts = []
+    for seller, name in holdings:
+        data = market[name]
+        price = data["base_price"] * (1 + random.uniform(-data["volatility"], data["volatility"]))
+        last = last_prices.get(name, price)
+        change = (price - last) / last * 100
+        if change > 5.0:
+            alerts.append((seller, name, price, change))
+        last_prices[name] = price
+    return alerts
+
+
+def engine_tick(engine):
+    alerted, prices, changes = engine.tick()
+    sellers, commodities = engine.seller_alerts(alerted)
+    return len(sellers)
+
+
+def time_ticks(fn, ticks):
+    samples = []
+    for _ in range(ticks):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    commodities = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    sellers = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    per_seller = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    market, holdings = build(commodities, sellers, per_seller)
+
+    engine = PriceEngine.from_market_data(market, threshold=5.0, seed=11)
+    engine.set_holdings(holdings)
+    engine.tick()
+    last_prices = {}
+    loop_tick(market, holdings, last_prices)
+
+    print(f"{commodities:,} commodities, {sellers:,} sellers x {per_seller} products "
+          f"= {len(holdings):,} holdings (numpy {np.__version__})\n")
+    loop_ms, loop_max = time_ticks(lambda: loop_tick(market, holdings, last_prices), 20)
+    engine_ms, engine_max = time_ticks(lambda: engine_tick(engine), 200)
+    print(f"{'per-product loop':<20}{loop_ms:>9.2f} ms/tick (max {loop_max:.2f})")
+    print(f"{'numpy engine':<20}{engine_ms:>9.2f} ms/tick (max {engine_max:.2f})")
+    print(f"\nSpeed-up: {loop_ms / engine_ms:.0f}x, "
+          f"{engine_tick(engine):,} seller alerts in the last tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory and fetch time of a marketplace listing as tuples, dicts,
+sqlite3.Row and the __slots__ ProductListing record
+
+Usage: python benchmarks/bench_row_memory.py [product_count]
+"""
+
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager, LISTING_COLUMNS
+from database.models import ProductListing
+
+LISTING_QUERY = f"""SELECT {LISTING_COLUMNS} FROM products p
+                    LEFT JOIN users u ON p.seller_phone = u.phone
+                    WHERE p.status = 'active'
+                    ORDER BY p.created_at DESC, p.id DESC"""
+
+
+def dict_factory(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+ROW_FACTORIES = [
+    ("tuple", None),
+    ("dict", dict_factory),
+    ("sqlite3.Row", sqlite3.Row),
+    ("ProductListing", ProductListing.row_factory),
+]
+
+
+def build_catalog(db, count):
+    with db.connection() as conn:
+        conn.execute("INSERT INTO users (name, phone, email, password, role, location) VALUES (?, ?, ?, ?, ?, ?)",
+                     ("Bench Seller", "9000000000", "bench@example.com", "pw", "seller", "Hamirpur"))
+        conn.executemany("""INSERT INTO products (seller_phone, name, category, variety, unit, price, stock_qty, description)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                         [("9000000000", f"Crop {i}", "Grains", "Desi", "kg", 20 + i % 50, i % 200,
+                           "Freshly harvested, cleaned and sorted")
+                          for i in range(count)])
+        conn.commit()
+
+
+def measure(conn, row_factory):
+    """Peak bytes held by the fetched rows and median fetch time in ms"""
+    samples = []
+    for _ in range(3):
+        cursor = conn.cursor()
+        cursor.row_factory = row_factory
+        started = time.perf_counter()
+        cursor.execute(LISTING_QUERY).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    cursor = conn.cursor()
+    cursor.row_factory = row_factory
+    tracemalloc.start()
+    rows = cursor.execute(LISTING_QUERY).fetchall()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, statistics.median(samples), len(rows)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), "bench_rows.db"))
+    db.init_database()
+    build_catalog(db, count)
+
+    print(f"{'row type':<16}{'memory':>12}{'per row':>10}{'fetch':>12}")
+    with db.connection() as conn:
+        for label, row_factory in ROW_FACTORIES:
+            size, fetch_ms, rows = measure(conn, row_factory)
+            print(f"{label:<16}{size / 1024 / 1024:>9.1f} MB{size / rows:>8.0f} B{fetch_ms:>9.1f} ms")
+    print(f"\n{count:,} listing rows, {len(ProductListing.FIELDS)} columns each. Field values are")
+    print("counted too, so the difference between rows is the container overhead.")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
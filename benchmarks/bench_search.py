@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FTS5 product search vs the old LIKE '%term%' query at 100k products
+
+Usage: python benchmarks/bench_search.py [product_count]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.search import build_match_query
+
+CROPS = ["Tomatoes", "Onions", "Wheat", "Rice", "Potatoes", "Apples", "Bananas", "Mustard",
+         "Maize", "Cauliflower", "Cabbage", "Garlic", "Ginger", "Peas", "Lentils", "Soybean"]
+CATEGORIES = ["Vegetables", "Fruits", "Grains", "Pulses", "Spices", "Other"]
+VARIETIES = ["Hybrid", "Organic", "Desi", "Basmati", "Sharbati", "Kufri", ""]
+WORDS = ["fresh", "farm", "grade", "premium", "harvest", "sorted", "clean", "local", "bulk", "sweet"]
+
+# The query the app used before the FTS index
+LIKE_QUERY = """SELECT p.*, u.name as seller_name FROM products p
+                JOIN users u ON p.seller_phone = u.phone
+                WHERE p.stock_qty > 0 AND p.status = 'active'
+                AND (p.name LIKE ? OR p.category LIKE ?)
+                ORDER BY p.name"""
+
+TERMS = ["tom", "wheat", "organic", "pot", "garlic", "veg", "basmati", "xyz"]
+
+
+def build_catalog(db, count):
+    rng = random.Random(42)
+    with db.connection() as conn:
+        sellers = [(f"Seller {i}", f"9{i:09d}", "", "pw", "seller", "Hamirpur") for i in range(1000)]
+        conn.executemany("INSERT INTO users (name, phone, email, password, role, location) VALUES (?, ?, ?, ?, ?, ?)",
+                         sellers)
+        rows = []
+        for i in range(count):
+            description = " ".join(rng.choice(WORDS) for _ in range(12))
+            rows.append((rng.choice(sellers)[1], rng.choice(CROPS), rng.choice(CATEGORIES),
+                         rng.choice(VARIETIES), "kg", rng.uniform(10, 100), rng.choice([0, 5, 50, 500]),
+                         description))
+        conn.executemany("""INSERT INTO products (seller_phone, name, category, variety, unit, price, stock_qty, description)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+        conn.commit()
+
+
+def time_query(fn, repeats=5):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), "bench_search.db"), pragma_profile="server-throughput")
+    db.init_database()
+
+    started = time.perf_counter()
+    build_catalog(db, count)
+    print(f"Inserted {count:,} products (FTS kept in sync by triggers) in {time.perf_counter() - started:.1f}s\n")
+
+    print(f"{'term':<10}{'LIKE all rows':>16}{'FTS all rows':>15}{'FTS page (20)':>16}{'matches':>10}")
+    with db.connection() as conn:
+        for term in TERMS:
+            pattern = f"%{term}%"
+            like_ms, like_rows = time_query(lambda: conn.execute(LIKE_QUERY, (pattern, pattern)).fetchall())
+            fts_ms, fts_rows = time_query(lambda: db.search_products(term))
+            page_ms, _ = time_query(lambda: db.search_products_page(term, 20))
+            print(f"{term:<10}{like_ms:>13.1f} ms{fts_ms:>12.1f} ms{page_ms:>13.1f} ms"
+                  f"{len(fts_rows):>10,}")
+
+    print("\nLIKE matches name/category substrings only; FTS matches word prefixes across")
+    print("name, category, variety, description and seller name, ranked by bm25.")
+    print(f"Sample match query: {build_match_query('red tom')}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ source.include_exts = py,png,jpg,kv,atlas,json,txt,md
 version = 1.0
 
 # (list) Application requirements
-requirements = python3,kivy,kivymd,plyer,requests,sqlite3
+requirements = python3,kivy,kivymd,plyer,requests,sqlite3,numpy
 
 # (str) Supported orientation (landscape, sensorLandscape, portrait, sensorPortrait)
 orientation = portrait
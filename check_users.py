@@ -77,7 +77,8 @@ def check_products():
 
     if products:
         for i, product in enumerate(products, 1):
-            product_id, seller_phone, name, category, variety, unit, price, stock_qty, description, image_path, status, created_at, updated_at, seller_name, seller_location = product
+            name, category, seller_name, seller_phone = product.name, product.category, product.seller_name, product.seller_phone
+            price, unit, stock_qty, description = product.price, product.unit, product.stock_qty, product.description
             print(f"{i}. {name} ({category})")
             print(f"   Seller: {seller_name} ({seller_phone})")
             print(f"   Price: ₹{price}/{unit}")
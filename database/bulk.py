@@ -0,0 +1,220 @@
+# database/bulk.py - Seller bulk edits: price, stock and status changes over a filtered product set
+import json
+
+from database.models import BulkPreviewRow
+
+# Statuses a seller can give a product; only 'active' products are listed
+PRODUCT_STATUSES = ("active", "inactive")
+
+# One grid row each (apply_product_edits); rows whose values already match are skipped
+UPDATE_PRICE_STOCK = """UPDATE products SET price = :price, stock_qty = :stock_qty, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = :id AND (price IS NOT :price OR stock_qty IS NOT :stock_qty)"""
+UPDATE_PRICE_STOCK_STATUS = """UPDATE products
+                               SET price = :price, stock_qty = :stock_qty, status = :status,
+                                   updated_at = CURRENT_TIMESTAMP
+                               WHERE id = :id"""
+
+
+class BulkUpdateError(ValueError):
+    """A bulk edit that cannot be applied as asked (bad values, or prices that would drop to 0 or below)
+
+    invalid lists (product_id, product_name, reason) for every product that
+    blocked the edit; nothing is written when this is raised.
+    """
+
+    def __init__(self, message, invalid=()):
+        super().__init__(message)
+        self.invalid = list(invalid)
+
+
+class BulkChange:
+    """One edit applied to every product a bulk update selects
+
+    Price: price_percent (+10 raises by 10%, -5 cuts by 5%), price_delta
+    (₹ added, may be negative) or price (the new price). Stock: stock_delta
+    (added, clamped at 0) or stock_qty (the new quantity). status: the new
+    status. Anything left as None is not changed. New prices are rounded to
+    paise by SQLite in both the preview and the update, so a preview shows
+    exactly what applying writes.
+    """
+
+    def __init__(self, price_percent=None, price_delta=None, price=None,
+                 stock_delta=None, stock_qty=None, status=None):
+        if sum(value is not None for value in (price_percent, price_delta, price)) > 1:
+            raise BulkUpdateError("Choose one price change: percent, amount or new price")
+        if stock_delta is not None and stock_qty is not None:
+            raise BulkUpdateError("Choose one stock change: adjustment or new quantity")
+        if price is not None and price <= 0:
+            raise BulkUpdateError("Price must be greater than 0")
+        if price_percent is not None and price_percent <= -100:
+            raise BulkUpdateError("A price cut must be less than 100%")
+        if stock_qty is not None and stock_qty < 0:
+            raise BulkUpdateError("Stock cannot be negative")
+        if status is not None and status not in PRODUCT_STATUSES:
+            raise BulkUpdateError(f"Unknown status: {status}")
+        self.price_percent = price_percent
+        self.price_delta = price_delta
+        self.price = price
+        self.stock_delta = stock_delta
+        self.stock_qty = stock_qty
+        self.status = status
+
+    @property
+    def is_empty(self):
+        return all(value is None for value in self.params().values())
+
+    def params(self):
+        """Named parameters for the expressions below"""
+        return {"price_percent": self.price_percent, "price_delta": self.price_delta, "price": self.price,
+                "stock_delta": self.stock_delta, "stock_qty": self.stock_qty, "status": self.status}
+
+    def expressions(self):
+        """{column: SQL computing the new value from the current products row}, changed columns only"""
+        columns = {}
+        if self.price_percent is not None:
+            columns["price"] = "ROUND(price * (100 + :price_percent) / 100.0, 2)"
+        elif self.price_delta is not None:
+            columns["price"] = "ROUND(price + :price_delta, 2)"
+        elif self.price is not None:
+            columns["price"] = ":price"
+        if self.stock_delta is not None:
+            columns["stock_qty"] = "MAX(stock_qty + :stock_delta, 0)"
+        elif self.stock_qty is not None:
+            columns["stock_qty"] = ":stock_qty"
+        if self.status is not None:
+            columns["status"] = ":status"
+        return columns
+
+
+class BulkPreview:
+    """Dry run of a BulkChange: every selected product with its current and new values
+
+    changed lists the rows the update would write; invalid lists the rows
+    whose new price would not be above 0, which block the update.
+    """
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.changed = [row for row in self.rows if row.changed]
+        self.invalid = [row for row in self.rows if row.new_price <= 0]
+
+    @property
+    def can_apply(self):
+        return bool(self.changed) and not self.invalid
+
+
+def product_filter(seller_phone, product_ids=None, category=None, status=None, name_contains=None,
+                   max_stock=None):
+    """(WHERE clause, named params) selecting a seller's products
+
+    Every filter left as None matches everything; max_stock picks low-stock
+    products. product_ids travel as one JSON parameter, so any number of
+    ids fits in a single statement.
+    """
+    conditions = ["seller_phone = :seller_phone"]
+    params = {"seller_phone": seller_phone}
+    if product_ids is not None:
+        conditions.append("id IN (SELECT value FROM json_each(:product_ids))")
+        params["product_ids"] = json.dumps(list(product_ids))
+    if category:
+        conditions.append("category = :category")
+        params["category"] = category
+    if status:
+        conditions.append("status = :filter_status")
+        params["filter_status"] = status
+    if name_contains:
+        conditions.append("name LIKE :name_pattern ESCAPE '\\'")
+        escaped = name_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params["name_pattern"] = f"%{escaped}%"
+    if max_stock is not None:
+        conditions.append("stock_qty <= :max_stock")
+        params["max_stock"] = max_stock
+    return " AND ".join(conditions), params
+
+
+def preview_bulk_change(conn, change, where, params):
+    """BulkPreview of change over the products matching where - reads only"""
+    columns = change.expressions()
+    rows = conn.execute(f"""SELECT id, name, category, unit, price, stock_qty, status,
+                                   {columns.get("price", "price")},
+                                   {columns.get("stock_qty", "stock_qty")},
+                                   {columns.get("status", "status")}
+                            FROM products
+                            WHERE {where}
+                            ORDER BY name, id""", {**params, **change.params()}).fetchall()
+    return BulkPreview(BulkPreviewRow(*row) for row in rows)
+
+
+def apply_bulk_change(conn, change, where, params):
+    """Apply change to the products matching where with one set-based UPDATE; returns rows updated
+
+    Runs as a single BEGIN IMMEDIATE transaction. Rows whose values would not
+    change are left alone, so their updated_at (and the incremental product
+    list refresh keyed on it) is untouched. Raises BulkUpdateError, writing
+    nothing, if any selected price would fall to 0 or below.
+    """
+    columns = change.expressions()
+    if not columns:
+        return 0
+    params = {**params, **change.params()}
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if "price" in columns:
+            invalid = conn.execute(f"""SELECT id, name FROM products
+                                       WHERE {where} AND {columns["price"]} <= 0""", params).fetchall()
+            if invalid:
+                names = ", ".join(name for _, name in invalid)
+                raise BulkUpdateError(f"Price would drop to 0 or below for: {names}",
+                                      [(product_id, name, "price") for product_id, name in invalid])
+        # Setting updated_at here keeps products_touch_updated_at from
+        # issuing a second UPDATE per row
+        assignments = ", ".join(f"{column} = {sql}" for column, sql in columns.items())
+        differs = " OR ".join(f"{column} IS NOT {sql}" for column, sql in columns.items())
+        updated = conn.execute(f"""UPDATE products SET {assignments}, updated_at = CURRENT_TIMESTAMP
+                                   WHERE {where} AND ({differs})""", params).rowcount
+        conn.commit()
+        return updated
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def apply_product_edits(conn, seller_phone, edits):
+    """Write per-row grid edits [(product_id, price, stock_qty, status), ...] with executemany
+
+    All rows are checked before anything is written and go in one BEGIN
+    IMMEDIATE transaction; ids of other sellers' products are dropped.
+    Returns the number of rows whose values actually changed.
+    """
+    edits = list(edits)
+    invalid = []
+    for product_id, price, stock_qty, status in edits:
+        if price is None or price <= 0:
+            invalid.append((product_id, None, "price"))
+        elif stock_qty is None or stock_qty < 0:
+            invalid.append((product_id, None, "stock_qty"))
+        elif status not in PRODUCT_STATUSES:
+            invalid.append((product_id, None, "status"))
+    if invalid:
+        raise BulkUpdateError(f"{len(invalid)} rows have an invalid price, stock or status", invalid)
+    if not edits:
+        return 0
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        stored = dict(conn.execute("""SELECT id, status FROM products
+                                      WHERE seller_phone = ? AND id IN (SELECT value FROM json_each(?))""",
+                                   (seller_phone, json.dumps([edit[0] for edit in edits]))).fetchall())
+        rows = [{"id": product_id, "price": price, "stock_qty": stock_qty, "status": status}
+                for product_id, price, stock_qty, status in edits if product_id in stored]
+        # Assigning status makes SQLite re-check the partial "status = 'active'"
+        # indexes for the row, so it is only assigned where it actually changes
+        updated = conn.executemany(UPDATE_PRICE_STOCK,
+                                   [row for row in rows if stored[row["id"]] == row["status"]]).rowcount
+        updated += conn.executemany(UPDATE_PRICE_STOCK_STATUS,
+                                    [row for row in rows if stored[row["id"]] != row["status"]]).rowcount
+        conn.commit()
+        return updated
+    except Exception:
+        conn.rollback()
+        raise
@@ -0,0 +1,243 @@
+# database/cache.py - Small thread-safe in-memory caches for DatabaseManager
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Dict-like cache whose entries expire `ttl` seconds after being stored"""
+
+    def __init__(self, ttl=300.0, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > self._clock():
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SnapshotCache:
+    """Latest result of an expensive query, rebuilt in the background when stale
+
+    Writers call invalidate() after changing the source data; readers get the
+    last snapshot instantly and can ask for a background refresh. version
+    identifies a snapshot, so a screen can skip re-rendering one it has shown.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._source_version = 0
+        self._refreshing = False
+        self._callbacks = []
+        self.snapshot = None
+        self.version = -1
+        self.refreshes = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._source_version += 1
+
+    @property
+    def stale(self):
+        return self.version != self._source_version
+
+    def refresh(self):
+        """Rebuild on the calling thread; returns the new snapshot"""
+        with self._lock:
+            version = self._source_version
+        snapshot = self._loader()
+        with self._lock:
+            self.snapshot, self.version = snapshot, version
+            self.refreshes += 1
+        return snapshot
+
+    def refresh_async(self, on_ready=None, on_error=None):
+        """Rebuild on a worker thread; on_ready(snapshot, version) runs on that thread
+
+        Concurrent requests share one rebuild, and data invalidated while a
+        rebuild runs is picked up by another pass before callbacks fire. If
+        the rebuild fails, on_error(exception) runs instead; callers without
+        one get on_ready with the last good snapshot.
+        """
+        with self._lock:
+            if on_ready is not None or on_error is not None:
+                self._callbacks.append((on_ready, on_error))
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_worker, daemon=True).start()
+
+    def _refresh_worker(self):
+        error = None
+        try:
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Error refreshing snapshot: {e}")
+                    error = e
+                    break
+                if not self.stale:
+                    break
+        finally:
+            with self._lock:
+                self._refreshing = False
+                callbacks, self._callbacks = self._callbacks, []
+            for on_ready, on_error in callbacks:
+                if error is not None and on_error is not None:
+                    on_error(error)
+                elif on_ready is not None:
+                    on_ready(self.snapshot, self.version)
+
+
+_TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE)
+
+
+def tables_read(sql):
+    """Names of the tables a SELECT reads, from its FROM and JOIN clauses"""
+    return frozenset(name.lower() for name in _TABLE_REFERENCE.findall(sql))
+
+
+def estimate_size(value):
+    """Approximate bytes held by a cached result: a list of rows and the values in them"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        for row in value:
+            size += sys.getsizeof(row)
+            values = row if isinstance(row, tuple) else [getattr(row, field) for field in getattr(row, "FIELDS", ())]
+            size += sum(map(sys.getsizeof, values))
+    return size
+
+
+class QueryCache:
+    """Read-through cache of query results with LRU, TTL and memory limits
+
+    Entries are keyed by the caller (e.g. SQL plus parameters) and tagged with
+    the tables they read; invalidate(tables) drops exactly the entries that
+    depend on them. A load that was running while one of its tables was
+    invalidated is returned to its caller but not stored, so a slow read can
+    never put data older than the last write back into the cache.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024, ttl=120.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, tables, expires_at, size), oldest first
+        self._by_table = {}            # table -> {key, ...}
+        self._versions = {}            # table -> invalidation count
+        self._generation = 0           # bumped by clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key, tables, loader, ttl=None):
+        """Cached value for key, else loader()'s result (stored unless too big or invalidated meanwhile)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            versions = (self._generation, [self._versions.get(table, 0) for table in tables])
+
+        value = loader()
+        size = estimate_size(value)
+        with self._lock:
+            if size > self.max_bytes or versions != (self._generation,
+                                                     [self._versions.get(table, 0) for table in tables]):
+                return value
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, tables, self._clock() + (self.ttl if ttl is None else ttl), size)
+            self.bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def _remove(self, key):
+        _, tables, _, size = self._entries.pop(key)
+        self.bytes -= size
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    def invalidate(self, *tables):
+        """Drop every entry that read any of these tables; returns how many"""
+        with self._lock:
+            dropped = 0
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+                for key in list(self._by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        dropped += 1
+            self.invalidations += dropped
+            return dropped
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_table.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,292 @@
+# database/cart.py - In-memory buyer carts written back to the cart table in batches
+import json
+import threading
+from datetime import datetime, timezone
+from operator import attrgetter
+
+from database.models import CartItem, CartLine
+
+# price_at_add is the price the buyer saw when the line was created; later
+# quantity changes keep it, so the summary can flag prices that moved since.
+UPSERT_CART_LINE = """INSERT INTO cart (buyer_phone, product_id, quantity, price_at_add) VALUES (?, ?, ?, ?)
+                      ON CONFLICT(buyer_phone, product_id) DO UPDATE SET quantity = excluded.quantity"""
+
+# One aggregate pass over the buyer's cart (found through UNIQUE(buyer_phone,
+# product_id)), grouped per seller: each group row carries the seller's
+# subtotal, the cart total (a window over the few group rows, not the lines)
+# and the group's lines as a JSON array, which json.loads() unpacks in C.
+# Seller names are joined once per group instead of once per line. Line totals
+# are rounded the way checkout_cart() rounds order amounts, so the subtotals
+# add up to what the buyer will be charged.
+CART_SUMMARY_SQL = """
+    SELECT g.seller_phone, u.name, g.subtotal, ROUND(SUM(g.subtotal) OVER (), 2), g.lines
+    FROM (SELECT p.seller_phone, ROUND(SUM(ROUND(p.price * c.quantity, 2)), 2) AS subtotal,
+                 json_group_array(json_array(
+                     c.id, c.product_id, c.quantity, p.name, p.unit, p.price,
+                     COALESCE(c.price_at_add, p.price),
+                     CASE WHEN p.status = 'active' THEN p.stock_qty ELSE 0 END,
+                     ROUND(p.price * c.quantity, 2),
+                     p.price <> COALESCE(c.price_at_add, p.price),
+                     p.status <> 'active' OR p.stock_qty < c.quantity)) AS lines
+          FROM cart c
+          JOIN products p ON c.product_id = p.id
+          WHERE c.buyer_phone = ?
+          GROUP BY p.seller_phone) g
+    JOIN users u ON u.phone = g.seller_phone
+    ORDER BY g.seller_phone"""
+
+# Cart lines with product and seller names, in the order they were added
+CART_ITEMS_SQL = """SELECT c.id, c.product_id, c.quantity, c.added_at,
+                           p.name, p.price, p.unit, u.name as seller_name
+                    FROM cart c
+                    JOIN products p ON c.product_id = p.id
+                    JOIN users u ON p.seller_phone = u.phone
+                    WHERE c.buyer_phone = ?
+                    ORDER BY c.id"""
+
+_line_order = attrgetter("id")
+
+
+class CartSummary:
+    """Everything the cart and checkout screens show, from one CART_SUMMARY_SQL read
+
+    sellers is a list of (seller_phone, seller_name, subtotal, [CartLine, ...]);
+    lines lists every CartLine, seller by seller, each seller's in the order added.
+    """
+
+    def __init__(self, sellers=(), total=0.0):
+        self.sellers = list(sellers)
+        self.total = total
+        self.lines = [line for _, _, _, lines in self.sellers for line in lines]
+        self.price_changes = [line for line in self.lines if line.price_changed]
+        self.shortages = [line for line in self.lines if line.short_of_stock]
+
+    @property
+    def can_checkout(self):
+        return bool(self.lines) and not self.shortages
+
+
+def cart_summary(conn, buyer_phone):
+    """CartSummary of the buyer's cart as it stands in the cart table"""
+    make_line = CartLine.row_factory
+    sellers, grand_total = [], 0.0
+    for seller_phone, seller_name, subtotal, grand_total, lines in conn.execute(CART_SUMMARY_SQL, (buyer_phone,)):
+        # json_group_array keeps no particular order within a group
+        lines = [make_line(None, values) for values in json.loads(lines)]
+        lines.sort(key=_line_order)
+        sellers.append((seller_phone, seller_name, subtotal, lines))
+    return CartSummary(sellers, grand_total)
+
+
+def cart_items(conn, buyer_phone):
+    """The buyer's cart lines as CartItem records; errors propagate"""
+    c = conn.cursor()
+    c.row_factory = CartItem.row_factory
+    return c.execute(CART_ITEMS_SQL, (buyer_phone,)).fetchall()
+
+
+class _BuyerCart:
+    __slots__ = ("lines", "dirty")
+
+    def __init__(self, items):
+        self.lines = {item.product_id: item for item in items}   # product_id -> CartItem
+        self.dirty = {}                                           # product_id -> quantity, 0 = removed
+
+
+class CartService:
+    """Holds each buyer's cart in memory and writes changes back in batches
+
+    Taps only touch memory; the screens read the cart and its item count from
+    here. Changes are recorded as the line's latest absolute quantity, so any
+    number of taps on one product collapse into a single row of the next
+    flush. flush() runs `flush_delay` seconds after the first unsaved change
+    (on a timer thread), and screens call it directly when the user navigates
+    away. A flush writes every pending line with one executemany UPSERT and
+    one executemany DELETE in a single transaction.
+
+    A buyer's first call reads the saved cart, and flush(), clear() and
+    summary() write or read the table, so screens run those on
+    app.db_executor; once is_loaded() is true, taps only touch memory.
+    """
+
+    def __init__(self, db_manager, flush_delay=2.0):
+        self.db_manager = db_manager
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._carts = {}
+        self._timer = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    def _cart(self, buyer_phone):
+        """The buyer's cart, read from the database on first use
+
+        A failed read raises and caches nothing, so the next call tries
+        again instead of showing an empty cart for good.
+        """
+        with self._lock:
+            cart = self._carts.get(buyer_phone)
+        if cart is not None:
+            return cart
+        with self.db_manager.connection() as conn:
+            items = cart_items(conn, buyer_phone)
+        with self._lock:
+            # Another thread may have loaded it meanwhile; keep that one
+            return self._carts.setdefault(buyer_phone, _BuyerCart(items))
+
+    def is_loaded(self, buyer_phone):
+        """True once the buyer's cart is in memory, so calls no longer read the database"""
+        with self._lock:
+            return buyer_phone in self._carts
+
+    def items(self, buyer_phone):
+        """Cart lines as CartItem records, in the order they were added"""
+        cart = self._cart(buyer_phone)
+        with self._lock:
+            return list(cart.lines.values())
+
+    def count(self, buyer_phone):
+        """Number of distinct products in the cart, for badges"""
+        cart = self._cart(buyer_phone)
+        with self._lock:
+            return len(cart.lines)
+
+    def quantity_of(self, buyer_phone, product_id):
+        cart = self._cart(buyer_phone)
+        with self._lock:
+            item = cart.lines.get(product_id)
+            return item.quantity if item else 0
+
+    def add(self, buyer_phone, product, quantity=1):
+        """Add quantity (negative to take away) of a product record; returns the new line quantity"""
+        cart = self._cart(buyer_phone)
+        with self._lock:
+            item = cart.lines.get(product.id)
+            new_quantity = (item.quantity if item else 0) + quantity
+            if item is None and new_quantity > 0:
+                cart.lines[product.id] = CartItem(
+                    None, product.id, new_quantity,
+                    datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                    product.name, product.price, product.unit, getattr(product, "seller_name", ""))
+            elif item is not None:
+                self._set(cart, item, new_quantity)
+            else:
+                return 0
+            cart.dirty[product.id] = max(new_quantity, 0)
+            self._schedule_flush()
+            return max(new_quantity, 0)
+
+    def set_quantity(self, buyer_phone, product_id, quantity):
+        """Set a line already in the cart; 0 or less removes it"""
+        cart = self._cart(buyer_phone)
+        with self._lock:
+            item = cart.lines.get(product_id)
+            if item is None:
+                return False
+            self._set(cart, item, quantity)
+            cart.dirty[product_id] = max(quantity, 0)
+            self._schedule_flush()
+            return True
+
+    def remove(self, buyer_phone, product_id):
+        return self.set_quantity(buyer_phone, product_id, 0)
+
+    def _set(self, cart, item, quantity):
+        if quantity > 0:
+            item.quantity = quantity
+        else:
+            del cart.lines[item.product_id]
+
+    def clear(self, buyer_phone):
+        """Empty the cart and write that through immediately"""
+        cart = self._cart(buyer_phone)
+        with self._lock:
+            for product_id in list(cart.lines):
+                cart.dirty[product_id] = 0
+            cart.lines.clear()
+        return self.flush(buyer_phone)
+
+    def forget(self, buyer_phone):
+        """Drop the cached cart after the table changed underneath it, e.g. checkout"""
+        with self._lock:
+            cart = self._carts.get(buyer_phone)
+            if cart is not None and not cart.dirty:
+                del self._carts[buyer_phone]
+
+    def pending(self, buyer_phone=None):
+        """Unsaved line changes, for one buyer or all"""
+        with self._lock:
+            carts = [self._carts.get(buyer_phone)] if buyer_phone else list(self._carts.values())
+            return sum(len(cart.dirty) for cart in carts if cart is not None)
+
+    def _schedule_flush(self):
+        if self._timer is None and self.flush_delay is not None:
+            self._timer = threading.Timer(self.flush_delay, self._timer_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timer_flush(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def summary(self, buyer_phone):
+        """Save the buyer's pending changes, then read the cart summary
+
+        None if either fails; raises if the cart cannot be loaded at all.
+        """
+        # Loaded here, on the worker, so the screen's +/- taps only touch memory
+        self._cart(buyer_phone)
+        if not self.flush(buyer_phone):
+            return None
+        return self.db_manager.get_cart_summary(buyer_phone)
+
+    def flush(self, buyer_phone=None):
+        """Write pending changes (of one buyer, or everyone) to the cart table; returns True on success"""
+        with self._flush_lock:
+            with self._lock:
+                buyers = [buyer_phone] if buyer_phone else list(self._carts)
+                batch = {}
+                for buyer in buyers:
+                    cart = self._carts.get(buyer)
+                    if cart is not None and cart.dirty:
+                        batch[buyer], cart.dirty = cart.dirty, {}
+                # Prices the buyer saw, stored as price_at_add for new lines
+                upserts = [(buyer, product_id, quantity, self._carts[buyer].lines[product_id].price)
+                           for buyer, lines in batch.items()
+                           for product_id, quantity in lines.items() if quantity > 0]
+            if not batch:
+                return True
+
+            deletes = [(buyer, product_id) for buyer, lines in batch.items()
+                       for product_id, quantity in lines.items() if quantity <= 0]
+            conn = self.db_manager.get_connection()
+            try:
+                with conn:
+                    conn.executemany(UPSERT_CART_LINE, upserts)
+                    conn.executemany("DELETE FROM cart WHERE buyer_phone = ? AND product_id = ?", deletes)
+                self.db_manager.invalidate_tables("cart")
+                self.flushes += 1
+                self.rows_written += len(upserts) + len(deletes)
+                return True
+            except Exception as e:
+                print(f"Error saving cart: {e}")
+                with self._lock:
+                    # Put the batch back unless the user has changed those lines since
+                    for buyer, lines in batch.items():
+                        cart = self._carts.get(buyer)
+                        if cart is not None:
+                            for product_id, quantity in lines.items():
+                                cart.dirty.setdefault(product_id, quantity)
+                return False
+            finally:
+                conn.close()
+
+    def close(self):
+        """Cancel the timer and write anything still pending"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return self.flush()
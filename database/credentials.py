@@ -0,0 +1,163 @@
+# database/credentials.py - Salted password hashing with per-device cost calibration
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database.cache import TTLCache
+
+PBKDF2 = "pbkdf2_sha256"
+SCRYPT = "scrypt"
+
+# How long one hash should take on this device. Every login and registration
+# pays it once; brute-forcing a stolen database pays it per guess.
+TARGET_MS = 200.0
+# Floors that calibration never goes below, however slow the device
+MIN_PBKDF2_ITERATIONS = 100_000
+MIN_SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+# Iterations timed when measuring a device's PBKDF2 speed
+CALIBRATION_ITERATIONS = 20_000
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unb64(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def is_hashed(stored):
+    """False for plaintext passwords written by builds before hashing"""
+    return isinstance(stored, str) and stored.startswith((PBKDF2 + "$", SCRYPT + "$"))
+
+
+def derive(password, algorithm, cost, salt):
+    """Raw derived key; cost is PBKDF2 iterations or scrypt N"""
+    secret = password.encode("utf-8")
+    if algorithm == PBKDF2:
+        return hashlib.pbkdf2_hmac("sha256", secret, salt, cost)
+    if algorithm == SCRYPT:
+        return hashlib.scrypt(secret, salt=salt, n=cost, r=SCRYPT_R, p=SCRYPT_P,
+                              maxmem=128 * SCRYPT_R * (cost + SCRYPT_P + 2))
+    raise ValueError(f"Unknown password hash algorithm '{algorithm}'")
+
+
+def encode(algorithm, cost, salt, key):
+    """'<algorithm>$<cost>$<salt>$<key>', the format stored in users.password"""
+    return f"{algorithm}${cost}${_b64(salt)}${_b64(key)}"
+
+
+def decode(stored):
+    """(algorithm, cost, salt, key) of an encoded hash"""
+    algorithm, cost, salt, key = stored.split("$")
+    return algorithm, int(cost), _unb64(salt), _unb64(key)
+
+
+def calibrate(algorithm=PBKDF2, target_ms=TARGET_MS):
+    """Cost that makes one hash take about target_ms on this device"""
+    salt = secrets.token_bytes(SALT_BYTES)
+    if algorithm == PBKDF2:
+        started = time.perf_counter()
+        derive("calibration", PBKDF2, CALIBRATION_ITERATIONS, salt)
+        per_iteration_ms = (time.perf_counter() - started) * 1000 / CALIBRATION_ITERATIONS
+        iterations = int(target_ms / per_iteration_ms) // 10_000 * 10_000
+        return max(MIN_PBKDF2_ITERATIONS, iterations)
+    # scrypt cost is a power of two; double N while a hash stays under target
+    n = MIN_SCRYPT_N
+    while True:
+        started = time.perf_counter()
+        derive("calibration", SCRYPT, n, salt)
+        if (time.perf_counter() - started) * 1000 * 2 > target_ms or n >= 2 ** 20:
+            return n
+        n *= 2
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords at one algorithm and cost
+
+    verify() accepts any supported encoding, including the plaintext values
+    of older builds; needs_rehash() tells callers to re-store a password
+    that verified under an outdated algorithm or cost. Successful checks are
+    remembered for `cache_ttl` seconds as a keyed HMAC (never the password),
+    so repeat logins and re-authentication skip the slow derivation.
+    """
+
+    def __init__(self, algorithm=PBKDF2, cost=None, cache_ttl=300.0):
+        if algorithm == SCRYPT and not hasattr(hashlib, "scrypt"):
+            raise ValueError("hashlib.scrypt needs Python built against OpenSSL 1.1+")
+        self.algorithm = algorithm
+        self.cost = cost or (MIN_PBKDF2_ITERATIONS if algorithm == PBKDF2 else MIN_SCRYPT_N)
+        self._cache_key = secrets.token_bytes(32)
+        self._verified = TTLCache(ttl=cache_ttl)
+
+    @classmethod
+    def for_device(cls, params_path, algorithm=PBKDF2, target_ms=TARGET_MS):
+        """Hasher calibrated for this device; the result is saved to params_path and reused"""
+        try:
+            with open(params_path) as f:
+                params = json.load(f)
+            if params["algorithm"] == algorithm and params["target_ms"] == target_ms:
+                return cls(algorithm, params["cost"])
+        except (OSError, ValueError, KeyError):
+            pass
+        cost = calibrate(algorithm, target_ms)
+        try:
+            with open(params_path, "w") as f:
+                json.dump({"algorithm": algorithm, "cost": cost, "target_ms": target_ms}, f)
+        except OSError as e:
+            print(f"Could not save password hash parameters: {e}")
+        return cls(algorithm, cost)
+
+    def hash(self, password):
+        salt = secrets.token_bytes(SALT_BYTES)
+        return encode(self.algorithm, self.cost, salt, derive(password, self.algorithm, self.cost, salt))
+
+    def hash_many(self, passwords, workers=None):
+        """Hash a batch on a thread pool; hashlib releases the GIL while deriving"""
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            return list(pool.map(self.hash, passwords))
+
+    def _fingerprint(self, password, stored):
+        return hmac.new(self._cache_key, f"{stored}\0{password}".encode("utf-8"), hashlib.sha256).digest()
+
+    def verify(self, password, stored):
+        """True when password matches the stored hash (or legacy plaintext)"""
+        if not stored:
+            return False
+        if not is_hashed(stored):
+            return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        fingerprint = self._fingerprint(password, stored)
+        cached = self._verified.get(stored)
+        if cached is not None and hmac.compare_digest(cached, fingerprint):
+            return True
+        try:
+            algorithm, cost, salt, key = decode(stored)
+            matched = hmac.compare_digest(derive(password, algorithm, cost, salt), key)
+        except ValueError as e:
+            print(f"Unreadable password hash: {e}")
+            return False
+        if matched:
+            self._verified.set(stored, fingerprint)
+        return matched
+
+    def needs_rehash(self, stored):
+        if not is_hashed(stored):
+            return True
+        algorithm, cost, _, _ = decode(stored)
+        return algorithm != self.algorithm or cost < self.cost
+
+    def forget(self, stored):
+        """Drop a cached verification, e.g. after the password was changed"""
+        self._verified.invalidate(stored)
+
+
+# Cost used where no calibrated hasher is at hand, e.g. the plaintext migration
+default_hasher = PasswordHasher()
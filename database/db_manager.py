@@ -2,224 +2,237 @@
 import sqlite3
 from datetime import datetime
 import os
+import threading
+import time
+
+from database.bulk import (BulkUpdateError, apply_bulk_change, apply_product_edits, preview_bulk_change,
+                           product_filter)
+from database.cache import QueryCache, SnapshotCache, TTLCache, tables_read
+from database.cart import cart_items, cart_summary
+from database.credentials import PasswordHasher
+from database.indexes import explain_query_plans, find_full_scans, small_tables
+from database.models import (Notification, Order, PriceBar, PriceTrend, Product, ProductListing, Scheme,
+                             SearchHit)
+from database.maintenance import run_maintenance
+from database.migrations import (DEFERRABLE_MIGRATIONS, LATEST_VERSION, get_schema_version,
+                                 run_deferred_migrations, run_migrations)
+from database.orders import CheckoutError, checkout_cart
+from database.pagination import decode_cursor, encode_cursor
+from database.pool import ConnectionPool
+from database.pragmas import CheckpointScheduler, apply_pragmas, resolve_profile
+from database.search import BM25_WEIGHTS, HIGHLIGHT_CLOSE, HIGHLIGHT_OPEN, build_match_query
+from database.stats import UserStats
+from database.timeseries import (DEFAULT_LOCATION, LATEST_CLOSES, RESOLUTIONS, format_timestamp, ingest_prices,
+                                 range_bounds)
+
+# Own-products projection, in Product.FIELDS order
+PRODUCT_COLUMNS = """id, seller_phone, name, category, variety, unit, price, stock_qty,
+                     description, status, created_at, updated_at"""
+
+# Marketplace listing projection, in ProductListing.FIELDS order: product
+# fields the cards show plus the seller's contact details, so no per-product
+# users lookup is needed.
+LISTING_COLUMNS = """p.id, p.seller_phone, p.name, p.category, p.variety, p.unit, p.price,
+                     p.stock_qty, p.description, p.created_at,
+                     COALESCE(u.name, '') as seller_name,
+                     COALESCE(u.location, '') as seller_location,
+                     u.email as seller_email"""
+
+# Order projection, in Order.FIELDS order minus the trailing counterparty_name
+ORDER_COLUMNS = """o.id, o.order_number, o.product_id, o.quantity, o.unit_price, o.total_amount,
+                   o.status, o.created_at, o.delivered_at, p.name as product_name"""
+
+# Tables changed by triggers when a table is written (search index, counters)
+TRIGGER_WRITES = {
+    "products": ("products_fts", "user_stats"),
+    "orders": ("user_stats",),
+    "users": ("products_fts",),
+    "notifications": ("notification_counts",),
+}
 
 class DatabaseManager:
-    def __init__(self, db_path="data/agrimart.db"):
+    # How long a seller profile learnt from a listing stays valid
+    SELLER_PROFILE_TTL = 300.0
+    # Query result cache limits; writes invalidate entries long before the TTL
+    QUERY_CACHE_ENTRIES = 256
+    QUERY_CACHE_BYTES = 8 * 1024 * 1024
+    QUERY_CACHE_TTL = 120.0
+    # Checkout attempts when the write lock stays busy past busy_timeout
+    CHECKOUT_ATTEMPTS = 3
+    # Read notifications older than this are dropped by the deferred maintenance pass
+    NOTIFICATION_RETENTION_DAYS = 30
+
+    def __init__(self, db_path="data/agrimart.db", pool_size=5, pool_timeout=10.0,
+                 pragma_profile="mobile-battery", password_hasher=None):
+        """pragma_profile: "mobile-battery", "server-throughput" or a custom profile dict
+
+        password_hasher defaults to one calibrated for this device on first use.
+        """
         self.db_path = db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.pragma_profile = resolve_profile(pragma_profile)
+        self.pool = ConnectionPool(self._open_connection, max_size=pool_size, timeout=pool_timeout)
+        self.checkpointer = CheckpointScheduler(self, **self.pragma_profile.get("checkpoint", {}))
+        self.migration_timings = []
+        self.deferred_timings = []
+        self.maintenance_report = None
+        self._deferred_thread = None
+        self.seller_profiles = TTLCache(ttl=self.SELLER_PROFILE_TTL)
+        # Repeated screen reads (schemes, listings, a seller's products, profile stats)
+        self.query_cache = QueryCache(self.QUERY_CACHE_ENTRIES, self.QUERY_CACHE_BYTES, self.QUERY_CACHE_TTL)
+        self.checkout_retries = 0
+        # Latest close per commodity for MarketPricesScreen, rebuilt off the UI thread
+        self.price_snapshot = SnapshotCache(self.get_price_trends)
+        # Checkouts from this process queue here rather than in SQLite's busy
+        # handler, which sleeps in steps of up to 100 ms between lock attempts
+        self._checkout_lock = threading.Lock()
+        self._password_hasher = password_hasher
+        self._hasher_lock = threading.Lock()
+
+    def _open_connection(self):
+        """Open a raw connection; only the pool should call this"""
+        # Pooled connections move between the UI thread and worker threads
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        apply_pragmas(conn, self.pragma_profile)
+        return conn
 
     def get_connection(self):
-        return sqlite3.connect(self.db_path)
+        """Borrow a pooled connection - conn.close() returns it to the pool"""
+        return self.pool.acquire()
 
-    def check_and_migrate_database(self):
-        """Check database schema and migrate if needed"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        
+    def connection(self):
+        """Context manager checkout: with db_manager.connection() as conn: ..."""
+        return self.pool.connection()
+
+    def pool_stats(self):
+        """Connection pool size and wait-time metrics"""
+        return self.pool.stats()
+
+    def _cached_fetchall(self, cursor, sql, params=()):
+        """cursor.execute(sql, params).fetchall() through the query cache
+
+        Keyed by the SQL, parameters and row factory, and tagged with the
+        tables the SQL reads. Callers get their own list; the records in it
+        are shared with the cache and must not be modified.
+        """
+        params = tuple(params)
+        rows = self.query_cache.get_or_load(
+            (sql, params, cursor.row_factory), tables_read(sql),
+            lambda: cursor.execute(sql, params).fetchall())
+        return list(rows)
+
+    def invalidate_tables(self, *tables):
+        """Drop cached results that read these tables, or tables their triggers write
+
+        Every method that writes calls this after committing; code writing
+        through a raw connection must do the same.
+        """
+        affected = set(tables)
+        for table in tables:
+            affected.update(TRIGGER_WRITES.get(table, ()))
+        self.query_cache.invalidate(*affected)
+
+    def cache_stats(self):
+        """Query cache size, hit/miss counts and hit rate"""
+        return self.query_cache.stats()
+
+    def start_checkpointing(self):
+        """Start the background WAL checkpoint scheduler"""
+        self.checkpointer.start()
+
+    def close(self):
+        """Stop background checkpoints and shut down the connection pool"""
+        if self.pool.closed:
+            return
+        if self._deferred_thread is not None:
+            # Let a running VACUUM finish rather than pull its connection away
+            self._deferred_thread.join()
+        self.checkpointer.stop()
         try:
-            # Check if users table exists and get its schema
-            c.execute("PRAGMA table_info(users)")
-            columns = [column[1] for column in c.fetchall()]
-            
-            # If location column doesn't exist, add it
-            if columns and 'location' not in columns:
-                print("🔄 Migrating database: Adding location column...")
-                c.execute("ALTER TABLE users ADD COLUMN location TEXT DEFAULT ''")
-                conn.commit()
-                print("✅ Database migration completed")
-                
-        except sqlite3.OperationalError as e:
-            # Table doesn't exist yet, will be created in init_database
-            pass
+            # Fold the WAL back into the main file so it starts small next launch
+            self.checkpointer.checkpoint("TRUNCATE")
         except Exception as e:
-            print(f"Migration error: {e}")
-        finally:
-            conn.close()
+            print(f"Final WAL checkpoint skipped: {e}")
+        self.pool.close()
 
-    def init_database(self):
-        """Initialize database with proper migration support"""
-        # First check and migrate existing database
-        self.check_and_migrate_database()
-        
-        conn = self.get_connection()
-        c = conn.cursor()
-        
-        # Users table - Create with full schema
-        c.execute("""CREATE TABLE IF NOT EXISTS users(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            phone TEXT UNIQUE NOT NULL,
-            email TEXT,
-            password TEXT NOT NULL,
-            role TEXT NOT NULL CHECK(role IN ('seller', 'buyer')),
-            location TEXT DEFAULT '',
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )""")
-        
-        # Products table
-        c.execute("""CREATE TABLE IF NOT EXISTS products(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            seller_phone TEXT NOT NULL,
-            name TEXT NOT NULL,
-            category TEXT NOT NULL,
-            variety TEXT,
-            unit TEXT NOT NULL,
-            price REAL NOT NULL CHECK(price > 0),
-            stock_qty REAL NOT NULL CHECK(stock_qty >= 0),
-            description TEXT,
-            image_path TEXT,
-            status TEXT DEFAULT 'active',
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(seller_phone) REFERENCES users(phone)
-        )""")
-        
-        # Orders table
-        c.execute("""CREATE TABLE IF NOT EXISTS orders(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            order_number TEXT UNIQUE NOT NULL,
-            buyer_phone TEXT NOT NULL,
-            seller_phone TEXT NOT NULL,
-            product_id INTEGER NOT NULL,
-            quantity REAL NOT NULL CHECK(quantity > 0),
-            unit_price REAL NOT NULL CHECK(unit_price > 0),
-            total_amount REAL NOT NULL CHECK(total_amount > 0),
-            status TEXT DEFAULT 'pending',
-            delivery_address TEXT,
-            payment_method TEXT,
-            notes TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            delivered_at TEXT,
-            FOREIGN KEY(buyer_phone) REFERENCES users(phone),
-            FOREIGN KEY(seller_phone) REFERENCES users(phone),
-            FOREIGN KEY(product_id) REFERENCES products(id)
-        )""")
-        
-        # Shopping cart table
-        c.execute("""CREATE TABLE IF NOT EXISTS cart(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            buyer_phone TEXT NOT NULL,
-            product_id INTEGER NOT NULL,
-            quantity REAL NOT NULL CHECK(quantity > 0),
-            added_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(buyer_phone) REFERENCES users(phone),
-            FOREIGN KEY(product_id) REFERENCES products(id),
-            UNIQUE(buyer_phone, product_id)
-        )""")
-        
-        # Government schemes table
-        c.execute("""CREATE TABLE IF NOT EXISTS govt_schemes(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            description TEXT NOT NULL,
-            benefits TEXT,
-            eligibility TEXT,
-            how_to_apply TEXT,
-            department TEXT,
-            website_url TEXT,
-            contact_info TEXT,
-            is_active INTEGER DEFAULT 1,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )""")
-        
-        # Price history table
-        c.execute("""CREATE TABLE IF NOT EXISTS price_history(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product_name TEXT NOT NULL,
-            market_price REAL NOT NULL,
-            source TEXT DEFAULT 'market_api',
-            location TEXT DEFAULT 'Hamirpur',
-            recorded_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )""")
-        
-        # User addresses table
-        c.execute("""CREATE TABLE IF NOT EXISTS addresses(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_phone TEXT NOT NULL,
-            label TEXT NOT NULL,
-            address_line1 TEXT NOT NULL,
-            address_line2 TEXT,
-            city TEXT NOT NULL,
-            state TEXT NOT NULL,
-            pincode TEXT NOT NULL,
-            is_default INTEGER DEFAULT 0,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(user_phone) REFERENCES users(phone)
-        )""")
-        
-        # Notifications table
-        c.execute("""CREATE TABLE IF NOT EXISTS notifications(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_phone TEXT NOT NULL,
-            title TEXT NOT NULL,
-            message TEXT NOT NULL,
-            notification_type TEXT DEFAULT 'general',
-            is_read INTEGER DEFAULT 0,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(user_phone) REFERENCES users(phone)
-        )""")
-        
-        conn.commit()
-        conn.close()
-        
-        # Verify migration worked
-        self.verify_schema()
-        self.insert_sample_data()
-        print("✅ Database initialized successfully")
-
-    def verify_schema(self):
-        """Verify that all expected columns exist"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        
+    def init_database(self, defer=False):
+        """Bring the schema up to date via versioned migrations
+
+        When the database is already current this is a single
+        PRAGMA user_version read. defer=True leaves the data-only steps
+        (sample seeding) to run_deferred_init().
+        """
+        deferred = DEFERRABLE_MIGRATIONS if defer else ()
+        with self.connection() as conn:
+            self.migration_timings = run_migrations(conn, defer=deferred)
+        for version, name, elapsed_ms in self.migration_timings:
+            outcome = "queued for after startup" if version in deferred else "applied"
+            print(f"🔄 Migration {version} ({name}) {outcome} in {elapsed_ms:.1f} ms")
+        if self.migration_timings:
+            print(f"✅ Database migrated to schema version {LATEST_VERSION}")
+        return self.migration_timings
+
+    def run_deferred_init(self):
+        """Deferred seeding plus integrity check, ANALYZE and VACUUM; returns the maintenance report"""
         try:
-            c.execute("PRAGMA table_info(users)")
-            columns = [column[1] for column in c.fetchall()]
-            
-            expected_columns = ['id', 'name', 'phone', 'email', 'password', 'role', 'location', 'created_at', 'updated_at']
-            missing_columns = [col for col in expected_columns if col not in columns]
-            
-            if missing_columns:
-                print(f"❌ Missing columns in users table: {missing_columns}")
-                # Try to add missing columns
-                for col in missing_columns:
-                    if col == 'location':
-                        c.execute("ALTER TABLE users ADD COLUMN location TEXT DEFAULT ''")
-                conn.commit()
-                print("✅ Added missing columns")
-            else:
-                print("✅ Database schema verified")
-                
+            with self.connection() as conn:
+                self.deferred_timings = run_deferred_migrations(conn)
+                if self.deferred_timings:
+                    # Migration 8 seeds the market prices the snapshot shows
+                    self.price_snapshot.invalidate()
+                    # Seeding steps may write any table
+                    self.query_cache.clear()
+                self.maintenance_report = run_maintenance(conn)
+            self.maintenance_report["notifications_pruned"] = self.prune_notifications()
+            for version, name, elapsed_ms in self.deferred_timings:
+                print(f"🔄 Deferred migration {version} ({name}) applied in {elapsed_ms:.1f} ms")
+            for problem in self.maintenance_report["problems"]:
+                print(f"⚠️ Database integrity: {problem}")
+            return self.maintenance_report
         except Exception as e:
-            print(f"Schema verification error: {e}")
-        finally:
-            conn.close()
+            print(f"Error in deferred database init: {e}")
+            return None
 
-    def insert_sample_data(self):
-        schemes = [
-            ("PM-KISAN", "Pradhan Mantri Kisan Samman Nidhi", "₹6000 per year in 3 installments", 
-             "Small and marginal farmers", "Apply through CSC centers", 
-             "Ministry of Agriculture", "https://pmkisan.gov.in", "1800-115-526"),
-            ("Soil Health Card", "Free soil testing", "Free soil testing", 
-             "All farmers", "Contact agriculture department", 
-             "Department of Agriculture", "https://soilhealth.dac.gov.in", "1800-180-1551"),
-            ("KCC", "Kisan Credit Card", "Credit up to ₹3 lakh", 
-             "All farmers", "Apply through banks", 
-             "NABARD", "https://nabard.org", "1800-103-0982")
-        ]
-        
-        conn = self.get_connection()
-        c = conn.cursor()
-        for scheme in schemes:
-            try:
-                c.execute("""INSERT OR IGNORE INTO govt_schemes 
-                           (name, description, benefits, eligibility, how_to_apply, department, website_url, contact_info) 
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""", scheme)
-            except Exception as e:
-                pass
-        conn.commit()
-        conn.close()
+    def start_deferred_init(self):
+        """run_deferred_init() on a background thread, then start WAL checkpointing"""
+        def work():
+            self.run_deferred_init()
+            if not self.pool.closed:
+                self.start_checkpointing()
+
+        self._deferred_thread = threading.Thread(target=work, name="db-deferred-init", daemon=True)
+        self._deferred_thread.start()
+        return self._deferred_thread
+
+    def schema_version(self):
+        """Current PRAGMA user_version of the database"""
+        with self.connection() as conn:
+            return get_schema_version(conn)
+
+    def verify_query_plans(self):
+        """Check via EXPLAIN QUERY PLAN that public queries avoid full table scans"""
+        report = explain_query_plans(self)
+        with self.connection() as conn:
+            small = small_tables(conn)
+        scans = find_full_scans(report, small=small)
+        for method_name, sql, detail in scans:
+            print(f"❌ {method_name} does a full scan: {detail}")
+        for method_name, sql, detail in find_full_scans(report, ignore=()):
+            if (method_name, sql, detail) not in scans:
+                print(f"⚠️ {method_name} scan expected (by design or small table): {detail}")
+        if not scans:
+            print(f"✅ Query plans verified for {len(report)} methods")
+        return scans
+
+    @property
+    def password_hasher(self):
+        """Calibrated lazily: only hashing new passwords needs the device's cost"""
+        if self._password_hasher is None:
+            with self._hasher_lock:
+                if self._password_hasher is None:
+                    params_path = os.path.join(os.path.dirname(self.db_path) or ".", "password_params.json")
+                    self._password_hasher = PasswordHasher.for_device(params_path)
+        return self._password_hasher
 
     def create_user(self, name, phone, email, password, role, location=""):
         """Create user with proper error handling and duplicate detection"""
@@ -234,10 +247,12 @@ class DatabaseManager:
                 print(f"❌ User with phone {phone} already exists")
                 return False
             
-            # Insert new user
+            # Insert new user - only the salted hash is stored
             c.execute("""INSERT INTO users (name, phone, email, password, role, location) 
-                        VALUES (?, ?, ?, ?, ?, ?)""", (name, phone, email, password, role, location))
+                        VALUES (?, ?, ?, ?, ?, ?)""",
+                      (name, phone, email, self.password_hasher.hash(password), role, location))
             conn.commit()
+            self.invalidate_tables("users")
             print(f"✅ User {name} ({role}) created successfully")
             return True
             
@@ -251,15 +266,29 @@ class DatabaseManager:
             conn.close()
 
     def authenticate_user(self, phone, password):
-        """Authenticate user with proper error handling"""
+        """(name, role, location) when the password matches, else None
+
+        Passwords stored in plaintext or at an outdated cost are re-hashed
+        with the current parameters on a successful login.
+        """
         conn = self.get_connection()
         c = conn.cursor()
         try:
             # Use COALESCE to handle null location values
-            c.execute("SELECT name, role, COALESCE(location, '') FROM users WHERE phone = ? AND password = ?", 
-                     (phone, password))
-            result = c.fetchone()
-            return result
+            c.execute("SELECT name, role, COALESCE(location, ''), password FROM users WHERE phone = ?",
+                      (phone,))
+            row = c.fetchone()
+            hasher = self.password_hasher
+            if row is None or not hasher.verify(password, row[3]):
+                return None
+            if hasher.needs_rehash(row[3]):
+                # Only replace the hash we verified; a concurrent change wins
+                c.execute("UPDATE users SET password = ? WHERE phone = ? AND password = ?",
+                          (hasher.hash(password), phone, row[3]))
+                conn.commit()
+                self.invalidate_tables("users")
+                hasher.forget(row[3])
+            return row[:3]
         except Exception as e:
             print(f"Authentication error: {e}")
             return None
@@ -267,32 +296,155 @@ class DatabaseManager:
             conn.close()
 
     def get_user_products(self, phone):
+        """A seller's products, newest first, as Product records"""
         conn = self.get_connection()
         c = conn.cursor()
+        c.row_factory = Product.row_factory
         try:
-            c.execute("SELECT * FROM products WHERE seller_phone = ? ORDER BY created_at DESC", (phone,))
-            products = c.fetchall()
-            return products
+            return self._cached_fetchall(
+                c, f"SELECT {PRODUCT_COLUMNS} FROM products WHERE seller_phone = ? ORDER BY created_at DESC, id DESC",
+                (phone,))
         except Exception as e:
             print(f"Error getting products: {e}")
             return []
         finally:
             conn.close()
 
-    def get_all_products(self):
-        """Get all active products from all sellers for marketplace"""
+    def get_user_products_changed(self, phone, since=None):
+        """A seller's products updated at or after the `since` watermark (all when None)
+
+        updated_at has one-second resolution, so rows from the watermark second
+        come back again; callers skip the ones they already show unchanged.
+        """
+        if since is None:
+            return self.get_user_products(phone)
         conn = self.get_connection()
         c = conn.cursor()
+        c.row_factory = Product.row_factory
         try:
-            c.execute("SELECT * FROM products WHERE status = 'active' ORDER BY created_at DESC")
+            c.execute(f"""SELECT {PRODUCT_COLUMNS} FROM products
+                         WHERE seller_phone = ? AND updated_at >= ?
+                         ORDER BY created_at DESC, id DESC""", (phone, since))
             products = c.fetchall()
             return products
+        except Exception as e:
+            print(f"Error getting changed products: {e}")
+            return []
+        finally:
+            conn.close()
+
+    def get_user_product_ids(self, phone):
+        """Ids of all a seller's products - lets a cached view detect removals"""
+        conn = self.get_connection()
+        c = conn.cursor()
+        try:
+            c.execute("SELECT id FROM products WHERE seller_phone = ?", (phone,))
+            return {row[0] for row in c.fetchall()}
+        except Exception as e:
+            print(f"Error getting product ids: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def get_all_products(self):
+        """Get all active products from all sellers for marketplace, as ProductListing records"""
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.row_factory = ProductListing.row_factory
+        try:
+            return self._cached_fetchall(c, f"""SELECT {LISTING_COLUMNS}
+                         FROM products p
+                         LEFT JOIN users u ON u.phone = p.seller_phone
+                         WHERE p.status = 'active'
+                         ORDER BY p.created_at DESC, p.id DESC""")
         except Exception as e:
             print(f"Error getting all products: {e}")
             return []
         finally:
             conn.close()
 
+    def get_products_page(self, page_size=20, cursor=None, category=None, seller_phone=None, in_stock=False):
+        """One page of active products, newest first, via a (created_at, id) seek
+
+        Rows are ProductListing records (product fields plus seller name,
+        location and email) and also prime the seller profile cache. Returns
+        (products, next_cursor); next_cursor is an opaque token for the
+        following page, or None when this was the last one.
+        """
+        conditions = ["p.status = 'active'"]
+        params = []
+        if category:
+            conditions.append("p.category = ?")
+            params.append(category)
+        if seller_phone:
+            conditions.append("p.seller_phone = ?")
+            params.append(seller_phone)
+        if in_stock:
+            conditions.append("p.stock_qty > 0")
+
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.row_factory = ProductListing.row_factory
+        try:
+            if cursor:
+                created_at, last_id = decode_cursor(cursor)
+                conditions.append("(p.created_at, p.id) < (?, ?)")
+                params.extend([created_at, last_id])
+
+            # Fetch one extra row to know whether another page exists
+            products = self._cached_fetchall(c, f"""SELECT {LISTING_COLUMNS}
+                         FROM products p
+                         LEFT JOIN users u ON u.phone = p.seller_phone
+                         WHERE {' AND '.join(conditions)}
+                         ORDER BY p.created_at DESC, p.id DESC
+                         LIMIT ?""", params + [page_size + 1])
+
+            next_cursor = None
+            if len(products) > page_size:
+                products = products[:page_size]
+                last = products[-1]
+                next_cursor = encode_cursor(last.created_at, last.id)
+            self._remember_sellers(products)
+            return products, next_cursor
+        except Exception as e:
+            print(f"Error getting products page: {e}")
+            return [], None
+        finally:
+            conn.close()
+
+    def _remember_sellers(self, rows):
+        """Cache seller contact details that arrived with listing rows"""
+        for row in rows:
+            self.seller_profiles.set(row.seller_phone, {
+                'name': row.seller_name or "Unknown Seller",
+                'email': row.seller_email,
+                'location': row.seller_location,
+            })
+
+    def get_seller_profile(self, seller_phone):
+        """Seller name/email/location - from memory when the seller was listed recently"""
+        profile = self.seller_profiles.get(seller_phone)
+        if profile is not None:
+            return profile
+
+        conn = self.get_connection()
+        c = conn.cursor()
+        try:
+            c.execute("SELECT name, email, location FROM users WHERE phone = ?", (seller_phone,))
+            result = c.fetchone()
+        except Exception as e:
+            print(f"Error getting seller info: {e}")
+            result = None
+        finally:
+            conn.close()
+
+        if not result:
+            return {'name': "Unknown Seller", 'email': None, 'location': None}
+        name, email, location = result
+        profile = {'name': name or "Unknown Seller", 'email': email, 'location': location}
+        self.seller_profiles.set(seller_phone, profile)
+        return profile
+
     def add_product(self, seller_phone, name, category, variety, unit, price, stock_qty, description=""):
         conn = self.get_connection()
         c = conn.cursor()
@@ -302,6 +454,7 @@ class DatabaseManager:
                         VALUES (?, ?, ?, ?, ?, ?, ?, ?)""", 
                       (seller_phone, name, category, variety, unit, price, stock_qty, description))
             conn.commit()
+            self.invalidate_tables("products")
             return c.lastrowid
         except Exception as e:
             print(f"Error adding product: {e}")
@@ -309,20 +462,82 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def preview_bulk_update(self, seller_phone, change, product_ids=None, category=None, status=None,
+                            name_contains=None, max_stock=None):
+        """Dry run of a BulkChange over a seller's filtered products, as a BulkPreview
+
+        Filters left as None match everything; max_stock picks low-stock
+        products. Nothing is written.
+        """
+        where, params = product_filter(seller_phone, product_ids, category, status, name_contains, max_stock)
+        conn = self.get_connection()
+        try:
+            return preview_bulk_change(conn, change, where, params)
+        except Exception as e:
+            print(f"Error previewing bulk update: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def bulk_update_products(self, seller_phone, change, product_ids=None, category=None, status=None,
+                             name_contains=None, max_stock=None, dry_run=False):
+        """Apply a BulkChange to a seller's filtered products in one transaction; returns rows updated
+
+        Filters are preview_bulk_update()'s. dry_run=True returns preview_bulk_update()'s BulkPreview instead of
+        writing. Raises BulkUpdateError, with nothing written, when a new
+        price would not be above 0.
+        """
+        if dry_run:
+            return self.preview_bulk_update(seller_phone, change, product_ids, category, status,
+                                            name_contains, max_stock)
+        where, params = product_filter(seller_phone, product_ids, category, status, name_contains, max_stock)
+        with self.connection() as conn:
+            try:
+                updated = apply_bulk_change(conn, change, where, params)
+            except BulkUpdateError:
+                raise
+            except Exception as e:
+                print(f"❌ Error applying bulk update for {seller_phone}: {e}")
+                return None
+        if updated:
+            self.invalidate_tables("products")
+        print(f"✅ Bulk update changed {updated} products for {seller_phone}")
+        return updated
+
+    def update_products(self, seller_phone, edits):
+        """Save edited grid rows [(product_id, price, stock_qty, status), ...] in one transaction
+
+        Returns the number of products changed. Raises BulkUpdateError, with
+        nothing written, if any row has an invalid value.
+        """
+        with self.connection() as conn:
+            try:
+                updated = apply_product_edits(conn, seller_phone, edits)
+            except BulkUpdateError:
+                raise
+            except Exception as e:
+                print(f"❌ Error saving product edits for {seller_phone}: {e}")
+                return None
+        if updated:
+            self.invalidate_tables("products")
+        return updated
+
     def get_available_products(self, limit=None):
+        """In-stock active products with seller details, as ProductListing records"""
         conn = self.get_connection()
         c = conn.cursor()
+        c.row_factory = ProductListing.row_factory
         try:
-            query = """SELECT p.*, u.name as seller_name, COALESCE(u.location, '') as seller_location 
-                      FROM products p 
-                      JOIN users u ON p.seller_phone = u.phone 
-                      WHERE p.stock_qty > 0 AND p.status = 'active' 
-                      ORDER BY p.created_at DESC"""
+            query = f"""SELECT {LISTING_COLUMNS}
+                       FROM products p 
+                       JOIN users u ON p.seller_phone = u.phone 
+                       WHERE p.stock_qty > 0 AND p.status = 'active' 
+                       ORDER BY p.created_at DESC"""
+            params = ()
             if limit:
-                query += f" LIMIT {limit}"
-            c.execute(query)
-            products = c.fetchall()
-            return products
+                query += " LIMIT ?"
+                params = (int(limit),)
+            return self._cached_fetchall(c, query, params)
         except Exception as e:
             print(f"Error getting available products: {e}")
             return []
@@ -330,14 +545,22 @@ class DatabaseManager:
             conn.close()
 
     def search_products(self, search_term):
+        """Active, in-stock products matching search_term, by name, as ProductListing records"""
+        match_query = build_match_query(search_term)
+        if match_query is None:
+            return []
         conn = self.get_connection()
         c = conn.cursor()
+        c.row_factory = ProductListing.row_factory
         try:
-            c.execute("""SELECT p.*, u.name as seller_name FROM products p 
-                        JOIN users u ON p.seller_phone = u.phone 
-                        WHERE p.stock_qty > 0 AND p.status = 'active' 
-                        AND (p.name LIKE ? OR p.category LIKE ?) 
-                        ORDER BY p.name""", (f"%{search_term}%", f"%{search_term}%"))
+            # CROSS JOIN keeps the MATCH driving the join: on small or freshly
+            # analyzed tables SQLite would otherwise scan products and re-run it per row
+            c.execute(f"""SELECT {LISTING_COLUMNS} FROM products_fts f
+                        CROSS JOIN products p ON p.id = f.rowid
+                        JOIN users u ON p.seller_phone = u.phone
+                        WHERE products_fts MATCH ?
+                        AND p.stock_qty > 0 AND p.status = 'active'
+                        ORDER BY p.name""", (match_query,))
             products = c.fetchall()
             return products
         except Exception as e:
@@ -346,22 +569,65 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def search_products_page(self, search_text, page_size=20, cursor=None, in_stock=True):
+        """Ranked full-text search with prefix matching, one page at a time
+
+        Rows are SearchHit records: a listing plus the highlighted name, a
+        highlighted description snippet and the bm25 score (lower is
+        better). Returns (rows, next_cursor).
+        """
+        match_query = build_match_query(search_text)
+        if match_query is None:
+            return [], None
+
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.row_factory = SearchHit.row_factory
+        try:
+            offset = decode_cursor(cursor, size=1)[0] if cursor else 0
+            stock_filter = "AND p.stock_qty > 0" if in_stock else ""
+            # Same fixed join order as search_products
+            weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+            c.execute(f"""SELECT {LISTING_COLUMNS},
+                             highlight(products_fts, 0, ?, ?) as name_highlight,
+                             snippet(products_fts, 3, ?, ?, '…', 10) as description_snippet,
+                             bm25(products_fts, {weights}) as score
+                         FROM products_fts
+                         CROSS JOIN products p ON p.id = products_fts.rowid
+                         LEFT JOIN users u ON u.phone = p.seller_phone
+                         WHERE products_fts MATCH ? AND p.status = 'active' {stock_filter}
+                         ORDER BY score, p.id
+                         LIMIT ? OFFSET ?""",
+                      (HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE,
+                       match_query, page_size + 1, offset))
+            rows = c.fetchall()
+
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = encode_cursor(offset + page_size)
+            self._remember_sellers(rows)
+            return rows, next_cursor
+        except Exception as e:
+            print(f"Error searching products: {e}")
+            return [], None
+        finally:
+            conn.close()
+
     def add_to_cart(self, buyer_phone, product_id, quantity):
+        """Add quantity to the buyer's cart line for a product in one UPSERT"""
         conn = self.get_connection()
         c = conn.cursor()
         try:
-            c.execute("SELECT quantity FROM cart WHERE buyer_phone = ? AND product_id = ?", 
-                     (buyer_phone, product_id))
-            existing = c.fetchone()
-            if existing:
-                new_qty = existing[0] + quantity
-                c.execute("UPDATE cart SET quantity = ? WHERE buyer_phone = ? AND product_id = ?", 
-                         (new_qty, buyer_phone, product_id))
-            else:
-                c.execute("INSERT INTO cart (buyer_phone, product_id, quantity) VALUES (?, ?, ?)", 
-                         (buyer_phone, product_id, quantity))
+            # A new line records today's price as price_at_add; WHERE keeps the
+            # upsert's ON CONFLICT from parsing as part of the SELECT
+            c.execute("""INSERT INTO cart (buyer_phone, product_id, quantity, price_at_add)
+                         SELECT ?, id, ?, price FROM products WHERE id = ?
+                         ON CONFLICT(buyer_phone, product_id) DO UPDATE SET quantity = quantity + excluded.quantity""",
+                      (buyer_phone, quantity, product_id))
             conn.commit()
-            return True
+            self.invalidate_tables("cart")
+            return c.rowcount == 1
         except Exception as e:
             print(f"Error adding to cart: {e}")
             return False
@@ -369,29 +635,39 @@ class DatabaseManager:
             conn.close()
 
     def get_cart_items(self, buyer_phone):
+        """Cart lines with product and seller names, as CartItem records"""
         conn = self.get_connection()
-        c = conn.cursor()
         try:
-            c.execute("""SELECT c.*, p.name, p.price, p.unit, u.name as seller_name 
-                        FROM cart c 
-                        JOIN products p ON c.product_id = p.id 
-                        JOIN users u ON p.seller_phone = u.phone 
-                        WHERE c.buyer_phone = ?""", (buyer_phone,))
-            items = c.fetchall()
-            return items
+            return cart_items(conn, buyer_phone)
         except Exception as e:
             print(f"Error getting cart items: {e}")
             return []
         finally:
             conn.close()
 
+    def get_cart_summary(self, buyer_phone):
+        """Line totals, per-seller subtotals, grand total and stock/price flags in one query
+
+        Returns a CartSummary, or None when the query fails.
+        """
+        conn = self.get_connection()
+        try:
+            return cart_summary(conn, buyer_phone)
+        except Exception as e:
+            print(f"Error getting cart summary: {e}")
+            return None
+        finally:
+            conn.close()
+
     def get_govt_schemes(self):
+        """Active government schemes, as Scheme records"""
         conn = self.get_connection()
         c = conn.cursor()
+        c.row_factory = Scheme.row_factory
         try:
-            c.execute("SELECT * FROM govt_schemes WHERE is_active = 1 ORDER BY name")
-            schemes = c.fetchall()
-            return schemes
+            return self._cached_fetchall(c, """SELECT id, name, description, benefits, eligibility, how_to_apply,
+                               department, website_url, contact_info
+                        FROM govt_schemes WHERE is_active = 1 ORDER BY name""")
         except Exception as e:
             print(f"Error getting schemes: {e}")
             return []
@@ -399,18 +675,20 @@ class DatabaseManager:
             conn.close()
 
     def get_user_orders(self, phone, role):
+        """Orders for a seller or buyer, newest first, as Order records"""
         conn = self.get_connection()
         c = conn.cursor()
+        c.row_factory = Order.row_factory
         try:
             if role == 'seller':
-                c.execute("""SELECT o.*, p.name as product_name, u.name as buyer_name 
+                c.execute(f"""SELECT {ORDER_COLUMNS}, u.name as buyer_name 
                             FROM orders o 
                             JOIN products p ON o.product_id = p.id 
                             JOIN users u ON o.buyer_phone = u.phone 
                             WHERE o.seller_phone = ? 
                             ORDER BY o.created_at DESC""", (phone,))
             else:
-                c.execute("""SELECT o.*, p.name as product_name, u.name as seller_name 
+                c.execute(f"""SELECT {ORDER_COLUMNS}, u.name as seller_name 
                             FROM orders o 
                             JOIN products p ON o.product_id = p.id 
                             JOIN users u ON o.seller_phone = u.phone 
@@ -424,17 +702,159 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def get_orders_page(self, phone, role, page_size=20, cursor=None, status=None, since=None, until=None):
+        """One page of a seller's or buyer's orders, newest first, via a (created_at, id) seek
+
+        status keeps only orders in that status; since (inclusive) and until
+        (exclusive) bound created_at and take a date or date-time string or a
+        datetime. Returns (orders, next_cursor) like get_products_page.
+        """
+        side, other = ("o.seller_phone", "o.buyer_phone") if role == 'seller' else ("o.buyer_phone", "o.seller_phone")
+        conditions = [f"{side} = ?"]
+        params = [phone]
+        if status:
+            conditions.append("o.status = ?")
+            params.append(status)
+        if since:
+            conditions.append("o.created_at >= ?")
+            params.append(format_timestamp(since))
+        if until:
+            conditions.append("o.created_at < ?")
+            params.append(format_timestamp(until))
+
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.row_factory = Order.row_factory
+        try:
+            if cursor:
+                created_at, last_id = decode_cursor(cursor)
+                conditions.append("(o.created_at, o.id) < (?, ?)")
+                params.extend([created_at, last_id])
+
+            # Fetch one extra row to know whether another page exists
+            c.execute(f"""SELECT {ORDER_COLUMNS}, u.name
+                         FROM orders o
+                         JOIN products p ON o.product_id = p.id
+                         JOIN users u ON {other} = u.phone
+                         WHERE {' AND '.join(conditions)}
+                         ORDER BY o.created_at DESC, o.id DESC
+                         LIMIT ?""", params + [page_size + 1])
+            orders = c.fetchall()
+
+            next_cursor = None
+            if len(orders) > page_size:
+                orders = orders[:page_size]
+                last = orders[-1]
+                next_cursor = encode_cursor(last.created_at, last.id)
+            return orders, next_cursor
+        except Exception as e:
+            print(f"Error getting orders page: {e}")
+            return [], None
+        finally:
+            conn.close()
+
+    def get_user_stats(self, phone, role):
+        """Product count, orders by status and lifetime GMV from the user_stats counters"""
+        conn = self.get_connection()
+        try:
+            rows = self._cached_fetchall(conn.cursor(), "SELECT stat, count, amount FROM user_stats WHERE phone = ?",
+                                         (phone,))
+            return UserStats(role, rows)
+        except Exception as e:
+            print(f"Error getting user stats: {e}")
+            return UserStats(role)
+        finally:
+            conn.close()
+
+    def create_order(self, buyer_phone, delivery_address=None, payment_method=None, notes=None):
+        """Check out the buyer's cart: {seller_phone: [order_number, ...]}, one order per cart line
+
+        Raises CheckoutError when the cart is empty or stock ran out; the cart
+        and stock are left untouched in that case.
+        """
+        for attempt in range(self.CHECKOUT_ATTEMPTS):
+            with self.connection() as conn, self._checkout_lock:
+                try:
+                    placed = checkout_cart(conn, buyer_phone, delivery_address, payment_method, notes)
+                    self.invalidate_tables("orders", "products", "cart")
+                    count = sum(len(numbers) for numbers in placed.values())
+                    print(f"✅ Placed {count} orders with {len(placed)} sellers for {buyer_phone}")
+                    return placed
+                except sqlite3.OperationalError as e:
+                    # Still locked after busy_timeout: many checkouts queued on the write lock
+                    if "locked" not in str(e) and "busy" not in str(e):
+                        raise
+                    error = e
+                except sqlite3.IntegrityError as e:
+                    # Random order reference collided with an existing order
+                    if "order_number" not in str(e):
+                        raise
+                    error = e
+            self.checkout_retries += 1
+            time.sleep(0.01 * (attempt + 1))
+        print(f"❌ Checkout failed for {buyer_phone}: {error}")
+        raise error
+
     def record_price_data(self, product_name, market_price, location="Hamirpur"):
+        """Record one market price sample - prefer record_prices for more than one"""
+        return self.record_prices([(product_name, market_price, location)]) == 1
+
+    def record_prices(self, samples):
+        """Batch-record (product_name, price[, location[, recorded_at[, source]]]) samples
+
+        Raw rows and the hourly/daily rollups are written in one transaction.
+        Returns how many samples were stored.
+        """
+        conn = self.get_connection()
+        try:
+            stored = ingest_prices(conn, samples)
+            if stored:
+                self.price_snapshot.invalidate()
+                self.invalidate_tables("price_history", "price_hourly", "price_daily")
+            return stored
+        except Exception as e:
+            print(f"Error recording prices: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def get_price_series(self, product_name, resolution="day", start=None, end=None, location=DEFAULT_LOCATION):
+        """OHLC bars for a commodity between start and end (default: last 30 days), oldest first
+
+        resolution is "hour" or "day"; reads only the rollup table, never raw samples.
+        """
+        table = RESOLUTIONS[resolution][0]
+        sma_columns = "sma_short, sma_long" if resolution == "day" else "NULL, NULL"
+        first, last = range_bounds(start, end, resolution)
         conn = self.get_connection()
         c = conn.cursor()
+        c.row_factory = PriceBar.row_factory
         try:
-            c.execute("INSERT INTO price_history (product_name, market_price, location) VALUES (?, ?, ?)", 
-                     (product_name, market_price, location))
-            conn.commit()
-            return True
+            c.execute(f"""SELECT bucket, open, high, low, close, samples, total / samples, {sma_columns}
+                         FROM {table}
+                         WHERE product_name = ? AND location = ? AND bucket BETWEEN ? AND ?
+                         ORDER BY bucket""", (product_name, location, first, last))
+            bars = c.fetchall()
+            return bars
         except Exception as e:
-            print(f"Error recording price: {e}")
-            return False
+            print(f"Error getting price series: {e}")
+            return []
+        finally:
+            conn.close()
+
+    def get_price_trends(self, location=DEFAULT_LOCATION):
+        """Latest daily close per commodity with the previous day's close, by name"""
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.row_factory = PriceTrend.row_factory
+        try:
+            # Seeks each commodity's last two days instead of reading its whole history
+            c.execute(LATEST_CLOSES, {"location": location})
+            trends = c.fetchall()
+            return trends
+        except Exception as e:
+            print(f"Error getting price trends: {e}")
+            return []
         finally:
             conn.close()
 
@@ -445,6 +865,7 @@ class DatabaseManager:
         try:
             c.execute("DELETE FROM cart WHERE buyer_phone = ?", (buyer_phone,))
             conn.commit()
+            self.invalidate_tables("cart")
             return True
         except Exception as e:
             print(f"Error clearing cart: {e}")
@@ -452,6 +873,129 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def add_notifications(self, notifications):
+        """Store many (user_phone, title, message[, notification_type]) rows in one transaction
+
+        Returns the number stored.
+        """
+        rows = [(user_phone, title, message, rest[0] if rest else "general")
+                for user_phone, title, message, *rest in notifications]
+        if not rows:
+            return 0
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.executemany("""INSERT INTO notifications (user_phone, title, message, notification_type)
+                                    VALUES (?, ?, ?, ?)""", rows)
+            self.invalidate_tables("notifications")
+            return len(rows)
+        except Exception as e:
+            print(f"Error storing notifications: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def add_notification(self, user_phone, title, message, notification_type="general"):
+        """Store one notification; returns its id or None"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                cursor = conn.execute("""INSERT INTO notifications (user_phone, title, message, notification_type)
+                                         VALUES (?, ?, ?, ?)""", (user_phone, title, message, notification_type))
+            self.invalidate_tables("notifications")
+            return cursor.lastrowid
+        except Exception as e:
+            print(f"Error storing notification: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def get_notifications_page(self, user_phone, page_size=20, cursor=None, unread_only=False):
+        """One page of a user's notifications, newest first; returns (notifications, next_cursor)"""
+        conditions = ["user_phone = ?"]
+        params = [user_phone]
+        if unread_only:
+            conditions.append("is_read = 0")
+
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.row_factory = Notification.row_factory
+        try:
+            if cursor:
+                created_at, last_id = decode_cursor(cursor)
+                conditions.append("(created_at, id) < (?, ?)")
+                params.extend([created_at, last_id])
+
+            c.execute(f"""SELECT id, user_phone, title, message, notification_type, is_read, created_at
+                         FROM notifications
+                         WHERE {' AND '.join(conditions)}
+                         ORDER BY created_at DESC, id DESC
+                         LIMIT ?""", params + [page_size + 1])
+            notifications = c.fetchall()
+
+            next_cursor = None
+            if len(notifications) > page_size:
+                notifications = notifications[:page_size]
+                last = notifications[-1]
+                next_cursor = encode_cursor(last.created_at, last.id)
+            return notifications, next_cursor
+        except Exception as e:
+            print(f"Error getting notifications: {e}")
+            return [], None
+        finally:
+            conn.close()
+
+    def get_unread_count(self, user_phone):
+        """Unread notifications for the badge - a single primary-key lookup"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT unread FROM notification_counts WHERE user_phone = ?",
+                               (user_phone,)).fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            print(f"Error counting unread notifications: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def mark_notifications_read(self, user_phone, notification_ids=None):
+        """Mark the given notifications (default: all) of one user read; returns how many changed"""
+        conn = self.get_connection()
+        try:
+            with conn:
+                if notification_ids is None:
+                    cursor = conn.execute("UPDATE notifications SET is_read = 1 WHERE user_phone = ? AND is_read = 0",
+                                          (user_phone,))
+                else:
+                    cursor = conn.executemany("""UPDATE notifications SET is_read = 1
+                                                 WHERE id = ? AND user_phone = ? AND is_read = 0""",
+                                              [(notification_id, user_phone) for notification_id in notification_ids])
+            self.invalidate_tables("notifications")
+            return cursor.rowcount
+        except Exception as e:
+            print(f"Error marking notifications read: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def prune_notifications(self, retention_days=None, include_unread=False):
+        """Delete notifications older than retention_days (read ones only by default); returns how many"""
+        retention_days = self.NOTIFICATION_RETENTION_DAYS if retention_days is None else retention_days
+        conn = self.get_connection()
+        try:
+            with conn:
+                cursor = conn.execute(f"""DELETE FROM notifications
+                                          WHERE created_at < datetime('now', ?)
+                                          {'' if include_unread else 'AND is_read = 1'}""",
+                                      (f"-{int(retention_days)} days",))
+            self.invalidate_tables("notifications")
+            return cursor.rowcount
+        except Exception as e:
+            print(f"Error pruning notifications: {e}")
+            return 0
+        finally:
+            conn.close()
+
     def update_user(self, phone, name=None, email=None, location=None):
         """Update user profile information"""
         conn = self.get_connection()
@@ -481,6 +1025,8 @@ class DatabaseManager:
             query = f"UPDATE users SET {', '.join(update_fields)} WHERE phone = ?"
             c.execute(query, values)
             conn.commit()
+            self.seller_profiles.invalidate(phone)
+            self.invalidate_tables("users")
 
             if c.rowcount > 0:
                 print(f"✅ User {phone} profile updated successfully")
@@ -498,9 +1044,15 @@ class DatabaseManager:
     def reset_database(self):
         """EMERGENCY: Reset database completely - USE WITH CAUTION"""
         try:
+            # Pooled connections would keep the old file open
+            self.pool.dispose()
+            self.query_cache.clear()
             if os.path.exists(self.db_path):
                 os.remove(self.db_path)
                 print("🗑️ Old database removed")
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(self.db_path + suffix):
+                    os.remove(self.db_path + suffix)
             self.init_database()
             print("🆕 Fresh database created")
         except Exception as e:
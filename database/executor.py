@@ -0,0 +1,120 @@
+# database/executor.py - Runs DatabaseManager queries off the Kivy UI thread
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+
+def kivy_dispatch(callback, delay=0):
+    """Run callback() on the Kivy main loop after delay seconds"""
+    from kivy.clock import Clock
+    Clock.schedule_once(lambda dt: callback(), delay)
+
+
+class QueryHandle:
+    """One submitted query; cancel() drops its result if it was not delivered yet"""
+    __slots__ = ("future", "owner", "cancelled", "delivered")
+
+    def __init__(self, future, owner):
+        self.future = future
+        self.owner = owner
+        self.cancelled = False
+        self.delivered = False
+
+    @property
+    def pending(self):
+        return not (self.cancelled or self.delivered)
+
+    def cancel(self):
+        """Skip the query if it has not started and never deliver its result"""
+        self.cancelled = True
+        self.future.cancel()
+
+
+class QueryExecutor:
+    """Worker threads for DatabaseManager calls, with results handed back to the UI
+
+    submit() returns immediately; the query runs on a worker (borrowing a
+    pooled connection) and on_result / on_error are dispatched to the main
+    loop, never to the worker. Handles are grouped by owner (a screen), so
+    cancel(owner) on navigation drops everything that screen still waits for.
+    """
+
+    # A query still running after this many seconds gets its on_slow callback
+    SLOW_AFTER = 0.15
+
+    def __init__(self, db_manager, max_workers=2, dispatch=kivy_dispatch):
+        self.db_manager = db_manager
+        self._dispatch = dispatch
+        self._workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-query")
+        self._lock = threading.Lock()
+        self._by_owner = {}
+        self.submitted = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def submit(self, query, *args, on_result=None, on_error=None, on_slow=None, owner=None, **kwargs):
+        """Run query(*args, **kwargs) on a worker; query is a callable or a DatabaseManager method name"""
+        if isinstance(query, str):
+            query = getattr(self.db_manager, query)
+        handle = QueryHandle(self._workers.submit(query, *args, **kwargs), owner)
+        with self._lock:
+            self.submitted += 1
+            if owner is not None:
+                self._by_owner.setdefault(owner, set()).add(handle)
+        handle.future.add_done_callback(
+            lambda future: self._dispatch(lambda: self._deliver(handle, on_result, on_error)))
+        if on_slow is not None:
+            self._dispatch(lambda: handle.pending and on_slow(), self.SLOW_AFTER)
+        return handle
+
+    def _deliver(self, handle, on_result, on_error):
+        """Main-loop side of a finished query"""
+        self._forget(handle)
+        if handle.cancelled:
+            with self._lock:
+                self.dropped += 1
+            return
+        handle.delivered = True
+        with self._lock:
+            self.delivered += 1
+        try:
+            result = handle.future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            print(f"Error running background query: {e}")
+            if on_error is not None:
+                on_error(e)
+            return
+        if on_result is not None:
+            on_result(result)
+
+    def _forget(self, handle):
+        if handle.owner is None:
+            return
+        with self._lock:
+            handles = self._by_owner.get(handle.owner)
+            if handles is not None:
+                handles.discard(handle)
+                if not handles:
+                    del self._by_owner[handle.owner]
+
+    def cancel(self, owner):
+        """Cancel every pending query of owner; returns how many were cancelled"""
+        with self._lock:
+            handles = self._by_owner.pop(owner, set())
+        for handle in handles:
+            handle.cancel()
+        return len(handles)
+
+    def pending(self, owner):
+        """Number of queries owner is still waiting for"""
+        with self._lock:
+            return len(self._by_owner.get(owner, ()))
+
+    def shutdown(self, wait=True):
+        """Stop accepting queries; queued ones that have not started are dropped"""
+        with self._lock:
+            owners = list(self._by_owner)
+        for owner in owners:
+            self.cancel(owner)
+        self._workers.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,209 @@
+# database/indexes.py - Secondary indexes for hot queries and query-plan checks
+import re
+
+from database.pagination import encode_cursor
+
+# (index name, CREATE statement) - the current index set. Every statement is
+# idempotent; migrations that change the set re-apply it with create_indexes.
+INDEXES = [
+    # get_user_products: WHERE seller_phone = ? ORDER BY created_at DESC
+    ("idx_products_seller_created",
+     "CREATE INDEX IF NOT EXISTS idx_products_seller_created "
+     "ON products(seller_phone, created_at)"),
+    # get_user_products_changed: WHERE seller_phone = ? AND updated_at >= ?
+    ("idx_products_seller_updated",
+     "CREATE INDEX IF NOT EXISTS idx_products_seller_updated "
+     "ON products(seller_phone, updated_at)"),
+    # get_all_products / get_available_products / get_products_page:
+    # partial index over active listings only, in (created_at, id) seek order
+    ("idx_products_active_feed",
+     "CREATE INDEX IF NOT EXISTS idx_products_active_feed "
+     "ON products(created_at, id) WHERE status = 'active'"),
+    # get_products_page filtered by category
+    ("idx_products_active_category",
+     "CREATE INDEX IF NOT EXISTS idx_products_active_category "
+     "ON products(category, created_at, id) WHERE status = 'active'"),
+    # get_user_orders / get_orders_page for buyers and sellers; the rowid
+    # (orders.id) that ends every index entry completes the (created_at, id) seek
+    ("idx_orders_buyer_created",
+     "CREATE INDEX IF NOT EXISTS idx_orders_buyer_created "
+     "ON orders(buyer_phone, created_at)"),
+    ("idx_orders_seller_created",
+     "CREATE INDEX IF NOT EXISTS idx_orders_seller_created "
+     "ON orders(seller_phone, created_at)"),
+    # get_orders_page filtered by status
+    ("idx_orders_buyer_status_created",
+     "CREATE INDEX IF NOT EXISTS idx_orders_buyer_status_created "
+     "ON orders(buyer_phone, status, created_at)"),
+    ("idx_orders_seller_status_created",
+     "CREATE INDEX IF NOT EXISTS idx_orders_seller_status_created "
+     "ON orders(seller_phone, status, created_at)"),
+    # orders -> product lookups (e.g. seller dashboards, stock reports)
+    ("idx_orders_product",
+     "CREATE INDEX IF NOT EXISTS idx_orders_product ON orders(product_id)"),
+    # cart -> product lookups; buyer lookups use UNIQUE(buyer_phone, product_id)
+    ("idx_cart_product",
+     "CREATE INDEX IF NOT EXISTS idx_cart_product ON cart(product_id)"),
+    # get_govt_schemes: WHERE is_active = 1 ORDER BY name
+    ("idx_govt_schemes_active_name",
+     "CREATE INDEX IF NOT EXISTS idx_govt_schemes_active_name "
+     "ON govt_schemes(name) WHERE is_active = 1"),
+    # price trends per commodity over time
+    ("idx_price_history_product_time",
+     "CREATE INDEX IF NOT EXISTS idx_price_history_product_time "
+     "ON price_history(product_name, recorded_at)"),
+    # get_notifications_page: a user's feed, newest first, all or unread only
+    ("idx_notifications_user_created",
+     "CREATE INDEX IF NOT EXISTS idx_notifications_user_created "
+     "ON notifications(user_phone, created_at, id)"),
+    ("idx_notifications_user_unread_created",
+     "CREATE INDEX IF NOT EXISTS idx_notifications_user_unread_created "
+     "ON notifications(user_phone, is_read, created_at)"),
+    ("idx_addresses_user",
+     "CREATE INDEX IF NOT EXISTS idx_addresses_user ON addresses(user_phone)"),
+]
+
+
+def create_indexes(cursor):
+    """Create any missing secondary index"""
+    for _, statement in INDEXES:
+        cursor.execute(statement)
+
+
+# Public read methods and the probe arguments used to trace their SQL.
+QUERY_PLAN_PROBES = [
+    ("authenticate_user", ("9999999999", "probe")),
+    ("get_user_products", ("9999999999",)),
+    ("get_user_products_changed", ("9999999999", "2099-01-01 00:00:00")),
+    ("get_user_product_ids", ("9999999999",)),
+    ("get_all_products", ()),
+    ("get_available_products", (20,)),
+    ("get_products_page", ()),
+    ("get_products_page", (20, encode_cursor("2099-01-01 00:00:00", 1))),
+    ("get_products_page", (20, None, "Vegetables")),
+    ("get_products_page", (20, None, None, "9999999999", True)),
+    ("get_cart_items", ("9999999999",)),
+    ("get_cart_summary", ("9999999999",)),
+    ("get_govt_schemes", ()),
+    ("get_user_orders", ("9999999999", "seller")),
+    ("get_user_orders", ("9999999999", "buyer")),
+    ("get_orders_page", ("9999999999", "seller")),
+    ("get_orders_page", ("9999999999", "buyer", 20, encode_cursor("2099-01-01 00:00:00", 1))),
+    ("get_orders_page", ("9999999999", "seller", 20, None, "pending")),
+    ("get_orders_page", ("9999999999", "buyer", 20, None, "delivered", "2026-01-01", "2026-02-01")),
+    ("get_user_stats", ("9999999999", "seller")),
+    ("search_products", ("probe",)),
+    ("get_price_series", ("probe", "hour")),
+    ("get_price_series", ("probe", "day")),
+    ("get_price_trends", ()),
+    ("search_products_page", ("tom",)),
+    ("search_products_page", ("tom", 20, encode_cursor(20), True)),
+    ("get_notifications_page", ("9999999999",)),
+    ("get_notifications_page", ("9999999999", 20, encode_cursor("2099-01-01 00:00:00", 1))),
+    ("get_notifications_page", ("9999999999", 20, None, True)),
+    ("get_unread_count", ("9999999999",)),
+]
+
+# (method, plan step) pairs that are the cheapest plan rather than a missing
+# index, and are therefore only reported, never treated as a failure.
+KNOWN_SCANS = {
+    # The cart on a device holds the lines of the one or two buyers who sign
+    # in there, so once ANALYZE has seen that, buyer_phone narrows nothing and
+    # reading the table in rowid (= ORDER BY c.id) order beats the unique
+    # (buyer_phone, product_id) index. With many buyers SQLite seeks instead.
+    ("get_cart_items", "SCAN c"),
+    ("get_cart_summary", "SCAN c"),
+}
+
+# Tables ANALYZE measured at fewer rows than this fit in a page or two; SQLite
+# reads them whole because that beats any index, and seeks once they grow.
+SMALL_TABLE_ROWS = 100
+
+# FTS5 reads its own shadow tables (e.g. SELECT k, v FROM products_fts_config)
+# while answering a MATCH; those statements are not the method's SQL.
+FTS_SHADOW_TABLE = re.compile(r"_fts_(?:config|content|data|docsize|idx)\b", re.IGNORECASE)
+
+# "FROM products p", "JOIN users AS u", ... -> (table, alias)
+TABLE_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?"
+                         r"(?!(?:CROSS|GROUP|INNER|JOIN|LEFT|LIMIT|NATURAL|ON|ORDER|USING|WHERE)\b)(\w+))?",
+                         re.IGNORECASE)
+
+
+def is_full_scan(detail, materialized=()):
+    """True for an EXPLAIN QUERY PLAN row that reads a whole table
+
+    materialized names the subqueries the same plan MATERIALIZEs; scanning
+    one of those reads rows the plan already produced.
+    """
+    detail = detail.upper()
+    if "VIRTUAL TABLE INDEX" in detail:
+        # FTS5 MATCH lookups are answered from the full-text index
+        return False
+    if detail.startswith("SCAN (SUBQUERY") or detail[5:] in materialized:
+        # Reads rows an inner query already produced, not a table
+        return False
+    return detail.startswith("SCAN ") and "USING" not in detail
+
+
+def scanned_table(sql, detail):
+    """Table a "SCAN <alias>" plan step of sql reads"""
+    name = detail.split()[1]
+    for table, alias in TABLE_ALIAS.findall(sql):
+        if name in (table, alias):
+            return table
+    return name
+
+
+def small_tables(conn, rows=SMALL_TABLE_ROWS):
+    """Tables ANALYZE measured at fewer than rows rows; none before the first ANALYZE"""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+        return set()
+    sizes = {}
+    for table, stat in conn.execute("SELECT tbl, stat FROM sqlite_stat1"):
+        # Partial indexes count only their own rows, so take the largest figure
+        sizes[table] = max(sizes.get(table, 0), int(stat.split()[0]))
+    return {table for table, size in sizes.items() if size < rows}
+
+
+def explain_query_plans(db_manager, probes=None):
+    """Run each probe while tracing its SQL and EXPLAIN every SELECT
+
+    Returns {method_name: [(sql, [plan detail, ...]), ...]}.
+    """
+    probes = QUERY_PLAN_PROBES if probes is None else probes
+    report = {}
+    with db_manager.connection() as conn:
+        for method_name, args in probes:
+            # A cached result would run no SQL to trace
+            db_manager.query_cache.clear()
+            statements = []
+            # Calls below reuse this thread's checked-out connection
+            conn.set_trace_callback(statements.append)
+            try:
+                getattr(db_manager, method_name)(*args)
+            finally:
+                conn.set_trace_callback(None)
+
+            for sql in statements:
+                if not sql.lstrip().upper().startswith(("SELECT", "WITH")) or FTS_SHADOW_TABLE.search(sql):
+                    continue
+                plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+                report.setdefault(method_name, []).append((sql, [row[3] for row in plan]))
+    return report
+
+
+def find_full_scans(report, ignore=KNOWN_SCANS, small=()):
+    """[(method, sql, detail)] for every plan step that is a full table scan
+
+    ignore holds (method, plan step) pairs that are expected and skipped;
+    scans of the tables in small (see small_tables) are skipped too.
+    """
+    scans = []
+    for method_name, statements in report.items():
+        for sql, details in statements:
+            materialized = {detail[12:].upper() for detail in details if detail.startswith("MATERIALIZE ")}
+            for detail in details:
+                if (is_full_scan(detail, materialized) and (method_name, detail) not in ignore
+                        and scanned_table(sql, detail) not in small):
+                    scans.append((method_name, sql, detail))
+    return scans
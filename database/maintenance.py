@@ -0,0 +1,54 @@
+# database/maintenance.py - Housekeeping kept off the startup critical path
+import time
+
+# Rebuild the file once this fraction of its pages is on the freelist
+VACUUM_FREE_RATIO = 0.25
+# ... but never for files this small, where it would not give back anything useful
+VACUUM_MIN_FREE_PAGES = 256
+
+
+def quick_check(conn):
+    """Problems reported by PRAGMA quick_check; [] when the file is healthy"""
+    rows = [row[0] for row in conn.execute("PRAGMA quick_check").fetchall()]
+    return [] if rows == ["ok"] else rows
+
+
+def optimize(conn):
+    """Refresh planner statistics for tables whose ANALYZE data is stale"""
+    conn.execute("PRAGMA optimize")
+
+
+def free_pages(conn):
+    """(pages on the freelist, total pages)"""
+    return (conn.execute("PRAGMA freelist_count").fetchone()[0],
+            conn.execute("PRAGMA page_count").fetchone()[0])
+
+
+def vacuum_if_fragmented(conn, free_ratio=VACUUM_FREE_RATIO, min_free_pages=VACUUM_MIN_FREE_PAGES):
+    """VACUUM when enough of the file is free pages; returns the pages given back"""
+    free, total = free_pages(conn)
+    if free < min_free_pages or free < total * free_ratio:
+        return 0
+    conn.execute("VACUUM")
+    return free - free_pages(conn)[0]
+
+
+def run_maintenance(conn):
+    """Integrity check, statistics refresh and conditional VACUUM
+
+    Returns {"problems": [...], "pages_freed": n, "timings_ms": {step: ms}}.
+    """
+    report = {"problems": [], "pages_freed": 0, "timings_ms": {}}
+
+    def timed(name, step):
+        started = time.perf_counter()
+        result = step(conn)
+        report["timings_ms"][name] = (time.perf_counter() - started) * 1000
+        return result
+
+    report["problems"] = timed("quick_check", quick_check)
+    timed("optimize", optimize)
+    # A damaged file is left alone for the user to export or reset
+    if not report["problems"]:
+        report["pages_freed"] = timed("vacuum", vacuum_if_fragmented)
+    return report
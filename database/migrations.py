@@ -0,0 +1,343 @@
+# database/migrations.py - Versioned schema migrations keyed on PRAGMA user_version
+import time
+from datetime import datetime, timedelta, timezone
+
+from database.credentials import default_hasher, is_hashed
+from database.indexes import create_indexes
+from database.notifications import create_unread_counters
+from database.search import create_search_index
+from database.stats import create_user_stats
+from database.timeseries import create_rollup_tables, fold_into_rollups, normalize_sample, rebuild_rollups
+
+
+def _column_names(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [column[1] for column in cursor.fetchall()]
+
+
+def migration_001_initial_schema(c):
+    """Core tables (also adopts databases created before versioning)"""
+    c.execute("""CREATE TABLE IF NOT EXISTS users(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        phone TEXT UNIQUE NOT NULL,
+        email TEXT,
+        password TEXT NOT NULL,
+        role TEXT NOT NULL CHECK(role IN ('seller', 'buyer')),
+        location TEXT DEFAULT '',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""")
+
+    # Databases from before the location field was introduced
+    if 'location' not in _column_names(c, "users"):
+        c.execute("ALTER TABLE users ADD COLUMN location TEXT DEFAULT ''")
+
+    c.execute("""CREATE TABLE IF NOT EXISTS products(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        seller_phone TEXT NOT NULL,
+        name TEXT NOT NULL,
+        category TEXT NOT NULL,
+        variety TEXT,
+        unit TEXT NOT NULL,
+        price REAL NOT NULL CHECK(price > 0),
+        stock_qty REAL NOT NULL CHECK(stock_qty >= 0),
+        description TEXT,
+        image_path TEXT,
+        status TEXT DEFAULT 'active',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(seller_phone) REFERENCES users(phone)
+    )""")
+
+    c.execute("""CREATE TABLE IF NOT EXISTS orders(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_number TEXT UNIQUE NOT NULL,
+        buyer_phone TEXT NOT NULL,
+        seller_phone TEXT NOT NULL,
+        product_id INTEGER NOT NULL,
+        quantity REAL NOT NULL CHECK(quantity > 0),
+        unit_price REAL NOT NULL CHECK(unit_price > 0),
+        total_amount REAL NOT NULL CHECK(total_amount > 0),
+        status TEXT DEFAULT 'pending',
+        delivery_address TEXT,
+        payment_method TEXT,
+        notes TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        delivered_at TEXT,
+        FOREIGN KEY(buyer_phone) REFERENCES users(phone),
+        FOREIGN KEY(seller_phone) REFERENCES users(phone),
+        FOREIGN KEY(product_id) REFERENCES products(id)
+    )""")
+
+    c.execute("""CREATE TABLE IF NOT EXISTS cart(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        buyer_phone TEXT NOT NULL,
+        product_id INTEGER NOT NULL,
+        quantity REAL NOT NULL CHECK(quantity > 0),
+        added_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(buyer_phone) REFERENCES users(phone),
+        FOREIGN KEY(product_id) REFERENCES products(id),
+        UNIQUE(buyer_phone, product_id)
+    )""")
+
+    c.execute("""CREATE TABLE IF NOT EXISTS govt_schemes(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT NOT NULL,
+        benefits TEXT,
+        eligibility TEXT,
+        how_to_apply TEXT,
+        department TEXT,
+        website_url TEXT,
+        contact_info TEXT,
+        is_active INTEGER DEFAULT 1,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""")
+
+    c.execute("""CREATE TABLE IF NOT EXISTS price_history(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_name TEXT NOT NULL,
+        market_price REAL NOT NULL,
+        source TEXT DEFAULT 'market_api',
+        location TEXT DEFAULT 'Hamirpur',
+        recorded_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""")
+
+    c.execute("""CREATE TABLE IF NOT EXISTS addresses(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_phone TEXT NOT NULL,
+        label TEXT NOT NULL,
+        address_line1 TEXT NOT NULL,
+        address_line2 TEXT,
+        city TEXT NOT NULL,
+        state TEXT NOT NULL,
+        pincode TEXT NOT NULL,
+        is_default INTEGER DEFAULT 0,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(user_phone) REFERENCES users(phone)
+    )""")
+
+    c.execute("""CREATE TABLE IF NOT EXISTS notifications(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_phone TEXT NOT NULL,
+        title TEXT NOT NULL,
+        message TEXT NOT NULL,
+        notification_type TEXT DEFAULT 'general',
+        is_read INTEGER DEFAULT 0,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(user_phone) REFERENCES users(phone)
+    )""")
+
+
+def migration_002_secondary_indexes(c):
+    """Indexes for the hot queries in DatabaseManager"""
+    create_indexes(c)
+
+
+SAMPLE_SCHEMES = [
+    ("PM-KISAN", "Pradhan Mantri Kisan Samman Nidhi", "₹6000 per year in 3 installments",
+     "Small and marginal farmers", "Apply through CSC centers",
+     "Ministry of Agriculture", "https://pmkisan.gov.in", "1800-115-526"),
+    ("Soil Health Card", "Free soil testing", "Free soil testing",
+     "All farmers", "Contact agriculture department",
+     "Department of Agriculture", "https://soilhealth.dac.gov.in", "1800-180-1551"),
+    ("KCC", "Kisan Credit Card", "Credit up to ₹3 lakh",
+     "All farmers", "Apply through banks",
+     "NABARD", "https://nabard.org", "1800-103-0982"),
+]
+
+
+def migration_003_seed_govt_schemes(c):
+    """Seed the sample government schemes once (older builds re-inserted them every launch)"""
+    for scheme in SAMPLE_SCHEMES:
+        c.execute("""INSERT INTO govt_schemes
+                   (name, description, benefits, eligibility, how_to_apply, department, website_url, contact_info)
+                   SELECT ?, ?, ?, ?, ?, ?, ?, ?
+                   WHERE NOT EXISTS (SELECT 1 FROM govt_schemes WHERE name = ?)""",
+                  scheme + (scheme[0],))
+
+
+def migration_004_keyset_pagination_indexes(c):
+    """(created_at, id) seek indexes for paginated marketplace listings"""
+    c.execute("DROP INDEX IF EXISTS idx_products_active_created")
+    create_indexes(c)
+
+
+def migration_005_product_search(c):
+    """FTS5 index over product name, category, variety, description and seller name"""
+    create_search_index(c)
+
+
+def migration_006_product_change_tracking(c):
+    """Keep products.updated_at current on every update, for incremental screen refreshes"""
+    # Only fires when the writer did not set updated_at itself; recursive
+    # triggers are off, so the inner UPDATE does not fire it again.
+    c.execute("""CREATE TRIGGER IF NOT EXISTS products_touch_updated_at
+                 AFTER UPDATE ON products
+                 WHEN NEW.updated_at IS OLD.updated_at
+                 BEGIN
+                     UPDATE products SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+                 END""")
+    create_indexes(c)
+
+
+def migration_007_price_rollups(c):
+    """Hourly and daily OHLC rollups of price_history, with daily moving averages"""
+    create_rollup_tables(c)
+    rebuild_rollups(c)
+
+
+# (commodity, today's price, % change since yesterday) - the figures the
+# market prices screen used to hard-code, so fresh installs show a market
+SAMPLE_MARKET_PRICES = [
+    ("Tomatoes", 25.50, 2.5), ("Onions", 32.00, -1.2), ("Wheat", 22.80, 0.8),
+    ("Rice", 48.90, 1.5), ("Potatoes", 18.75, -0.5), ("Apples", 85.00, 3.2),
+    ("Bananas", 38.50, 1.8), ("Sugarcane", 295.00, 0.3), ("Cotton", 4250.00, -2.1),
+    ("Soybean", 42.30, 1.1),
+]
+
+
+def migration_008_seed_market_prices(c):
+    """Seed yesterday's and today's sample prices when no price history exists yet"""
+    if c.execute("SELECT 1 FROM price_history LIMIT 1").fetchone():
+        return
+    today = datetime.now(timezone.utc)
+    yesterday = today - timedelta(days=1)
+    samples = []
+    for name, price, change in SAMPLE_MARKET_PRICES:
+        samples.append(normalize_sample((name, round(price / (1 + change / 100), 2), None, yesterday, "sample")))
+        samples.append(normalize_sample((name, price, None, today, "sample")))
+    c.executemany("""INSERT INTO price_history (product_name, market_price, location, recorded_at, source)
+                     VALUES (?, ?, ?, ?, ?)""", samples)
+    fold_into_rollups(c, samples)
+
+
+def migration_009_hash_plaintext_passwords(c):
+    """Replace passwords stored in plaintext by older builds with salted hashes
+
+    Uses the minimum cost; authenticate_user() raises it to the device's
+    calibrated cost on the next login.
+    """
+    legacy = [(phone, password) for phone, password in c.execute("SELECT phone, password FROM users")
+              if not is_hashed(password)]
+    if not legacy:
+        return
+    hashes = default_hasher.hash_many([password for _, password in legacy])
+    c.executemany("UPDATE users SET password = ? WHERE phone = ?",
+                  [(hashed, phone) for hashed, (phone, _) in zip(hashes, legacy)])
+
+
+def migration_010_notification_store(c):
+    """Feed and unread indexes plus trigger-maintained unread counts for notifications"""
+    c.execute("DROP INDEX IF EXISTS idx_notifications_user_unread")
+    create_indexes(c)
+    create_unread_counters(c)
+
+
+def migration_011_cart_price_at_add(c):
+    """Remember each cart line's price when it was added, so price changes can be flagged"""
+    if "price_at_add" not in _column_names(c, "cart"):
+        c.execute("ALTER TABLE cart ADD COLUMN price_at_add REAL")
+    # Lines added before this step have no record of the old price; take today's
+    c.execute("""UPDATE cart SET price_at_add = (SELECT price FROM products WHERE id = cart.product_id)
+                 WHERE price_at_add IS NULL""")
+
+
+def migration_012_order_pages_and_user_stats(c):
+    """Status-filtered order indexes and trigger-maintained per-user counters"""
+    create_indexes(c)
+    create_user_stats(c)
+
+
+# Numbered, append-only. Never edit a step that has shipped - add a new one.
+MIGRATIONS = [
+    (1, "initial schema", migration_001_initial_schema),
+    (2, "secondary indexes", migration_002_secondary_indexes),
+    (3, "seed government schemes", migration_003_seed_govt_schemes),
+    (4, "keyset pagination indexes", migration_004_keyset_pagination_indexes),
+    (5, "full-text product search", migration_005_product_search),
+    (6, "product change tracking", migration_006_product_change_tracking),
+    (7, "price rollups", migration_007_price_rollups),
+    (8, "seed market prices", migration_008_seed_market_prices),
+    (9, "hash plaintext passwords", migration_009_hash_plaintext_passwords),
+    (10, "notification store", migration_010_notification_store),
+    (11, "cart price at add", migration_011_cart_price_at_add),
+    (12, "order pages and user stats", migration_012_order_pages_and_user_stats),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Data-only steps that may run after startup: they are idempotent and the
+# login path does not depend on them (it still accepts plaintext passwords).
+DEFERRABLE_MIGRATIONS = {3, 8, 9}
+
+# Steps deferred by run_migrations, recorded in the same transaction as the
+# version bump so they survive the app being closed before they run.
+DEFERRED_TABLE = """CREATE TABLE IF NOT EXISTS deferred_migrations(
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+)"""
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(conn, migrations=None, defer=()):
+    """Apply pending migrations; returns [(version, name, elapsed_ms)]
+
+    Fast path: one PRAGMA user_version read when the schema is current.
+    Each step runs in its own BEGIN IMMEDIATE transaction together with the
+    user_version bump, so a failed step leaves the database at the previous
+    version instead of half-migrated. Steps whose version is in defer are
+    only queued for run_deferred_migrations().
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    latest = migrations[-1][0]
+    if get_schema_version(conn) >= latest:
+        return []
+
+    timings = []
+    for version, name, step in migrations:
+        started = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock: another process may have migrated
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            if version in defer:
+                conn.execute(DEFERRED_TABLE)
+                conn.execute("INSERT OR IGNORE INTO deferred_migrations (version, name) VALUES (?, ?)",
+                             (version, name))
+            else:
+                step(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        timings.append((version, name, (time.perf_counter() - started) * 1000))
+    return timings
+
+
+def run_deferred_migrations(conn, migrations=None):
+    """Run the steps run_migrations() deferred, oldest first; returns [(version, name, elapsed_ms)]"""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'deferred_migrations'").fetchone():
+        return []
+    steps = {version: step for version, _, step in (MIGRATIONS if migrations is None else migrations)}
+    timings = []
+    for version, name in conn.execute("SELECT version, name FROM deferred_migrations ORDER BY version").fetchall():
+        started = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another connection may have run it since the SELECT above
+            if conn.execute("DELETE FROM deferred_migrations WHERE version = ?", (version,)).rowcount:
+                steps[version](conn.cursor())
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        timings.append((version, name, (time.perf_counter() - started) * 1000))
+    return timings
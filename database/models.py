@@ -0,0 +1,132 @@
+# database/models.py - Lightweight __slots__ records built straight from query rows
+#
+# Queries project exactly the columns listed in FIELDS, in that order, and set
+# cursor.row_factory = SomeRecord.row_factory. A slotted record has no per-row
+# __dict__, so it is smaller than a dict or sqlite3.Row and still gives
+# consumers names (product.price) instead of positions (product[6]).
+
+
+def _compile_row_factory(cls):
+    """Build a row_factory that assigns every slot in one unpacking statement;
+    a setattr() loop per row costs about as much as the query itself"""
+    targets = ", ".join(f"record.{field}" for field in cls.FIELDS)
+    source = (f"def row_factory(cursor, row):\n"
+              f"    record = new(cls)\n"
+              f"    {targets}, = row\n"
+              f"    return record\n")
+    namespace = {"new": object.__new__, "cls": cls}
+    exec(source, namespace)
+    return staticmethod(namespace["row_factory"])
+
+
+class Record:
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.row_factory = _compile_row_factory(cls)
+
+    def __init__(self, *values, **named):
+        for field, value in zip(self.FIELDS, values):
+            setattr(self, field, value)
+        for field in self.FIELDS[len(values):]:
+            setattr(self, field, named.get(field))
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({values})"
+
+
+class Product(Record):
+    """A seller's own product (ProductListScreen, PriceMonitor)"""
+    FIELDS = ("id", "seller_phone", "name", "category", "variety", "unit", "price",
+              "stock_qty", "description", "status", "created_at", "updated_at")
+    __slots__ = FIELDS
+
+
+class ProductListing(Record):
+    """Marketplace row: product fields plus the seller's contact details"""
+    FIELDS = ("id", "seller_phone", "name", "category", "variety", "unit", "price",
+              "stock_qty", "description", "created_at",
+              "seller_name", "seller_location", "seller_email")
+    __slots__ = FIELDS
+
+
+class SearchHit(ProductListing):
+    """Full-text search result: a listing plus highlight markup and bm25 score"""
+    FIELDS = ProductListing.FIELDS + ("name_highlight", "description_snippet", "score")
+    __slots__ = ("name_highlight", "description_snippet", "score")
+
+
+class CartItem(Record):
+    FIELDS = ("id", "product_id", "quantity", "added_at",
+              "product_name", "price", "unit", "seller_name")
+    __slots__ = FIELDS
+
+
+class Order(Record):
+    """An order as seen by one side; counterparty_name is the buyer for
+    sellers and the seller for buyers"""
+    FIELDS = ("id", "order_number", "product_id", "quantity", "unit_price", "total_amount",
+              "status", "created_at", "delivered_at", "product_name", "counterparty_name")
+    __slots__ = FIELDS
+
+
+class Scheme(Record):
+    FIELDS = ("id", "name", "description", "benefits", "eligibility", "how_to_apply",
+              "department", "website_url", "contact_info")
+    __slots__ = FIELDS
+
+
+class PriceBar(Record):
+    """One hourly or daily OHLC bucket of a commodity's market price"""
+    FIELDS = ("bucket", "open", "high", "low", "close", "samples", "average", "sma_short", "sma_long")
+    __slots__ = FIELDS
+
+
+class PriceTrend(Record):
+    """Latest daily close of a commodity and the close of the day before"""
+    FIELDS = ("product_name", "bucket", "close", "previous_close", "sma_short")
+    __slots__ = FIELDS
+
+    @property
+    def change_percent(self):
+        if not self.previous_close:
+            return 0.0
+        return (self.close - self.previous_close) / self.previous_close * 100
+
+
+class Notification(Record):
+    FIELDS = ("id", "user_phone", "title", "message", "notification_type", "is_read", "created_at")
+    __slots__ = FIELDS
+
+
+class CartLine(Record):
+    """A cart line priced at today's price, with stock and price-change flags
+    (built by database/cart.py from its per-seller JSON arrays)"""
+    FIELDS = ("id", "product_id", "quantity", "product_name", "unit", "price", "price_at_add",
+              "available", "line_total", "price_changed", "short_of_stock")
+    __slots__ = FIELDS
+
+
+class BulkPreviewRow(Record):
+    """A product as a bulk edit would leave it (built by database/bulk.py)"""
+    FIELDS = ("id", "name", "category", "unit", "price", "stock_qty", "status",
+              "new_price", "new_stock_qty", "new_status")
+    __slots__ = FIELDS
+
+    @property
+    def changed(self):
+        return (self.new_price != self.price or self.new_stock_qty != self.stock_qty
+                or self.new_status != self.status)
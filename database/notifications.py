@@ -0,0 +1,35 @@
+# database/notifications.py - Per-user unread counters kept current by triggers
+# Unread badge counts live in their own table so reading one is a primary-key
+# lookup, however many notifications a user has piled up.
+UNREAD_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS notification_counts(
+        user_phone TEXT PRIMARY KEY,
+        unread INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID""",
+    """CREATE TRIGGER IF NOT EXISTS notifications_count_insert
+       AFTER INSERT ON notifications WHEN NEW.is_read = 0
+       BEGIN
+           INSERT INTO notification_counts (user_phone, unread) VALUES (NEW.user_phone, 1)
+           ON CONFLICT(user_phone) DO UPDATE SET unread = unread + 1;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS notifications_count_update
+       AFTER UPDATE OF is_read ON notifications WHEN NEW.is_read != OLD.is_read
+       BEGIN
+           UPDATE notification_counts SET unread = unread + (CASE WHEN NEW.is_read = 0 THEN 1 ELSE -1 END)
+           WHERE user_phone = NEW.user_phone;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS notifications_count_delete
+       AFTER DELETE ON notifications WHEN OLD.is_read = 0
+       BEGIN
+           UPDATE notification_counts SET unread = unread - 1 WHERE user_phone = OLD.user_phone;
+       END""",
+]
+
+
+def create_unread_counters(cursor):
+    """Counter table and triggers, seeded from the notifications already stored"""
+    for statement in UNREAD_SCHEMA:
+        cursor.execute(statement)
+    cursor.execute("""INSERT OR REPLACE INTO notification_counts (user_phone, unread)
+                      SELECT user_phone, COUNT(*) FROM notifications WHERE is_read = 0
+                      GROUP BY user_phone""")
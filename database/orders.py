@@ -0,0 +1,78 @@
+# database/orders.py - Checkout: turn a buyer's cart into per-seller orders in one transaction
+import secrets
+from datetime import datetime
+
+
+class CheckoutError(Exception):
+    """The cart cannot be checked out as it stands (empty, or not enough stock)
+
+    shortages lists (product_id, product_name, requested, available) for every
+    cart line that could not be filled.
+    """
+
+    def __init__(self, message, shortages=()):
+        super().__init__(message)
+        self.shortages = list(shortages)
+
+
+def new_order_reference(now=None):
+    """Checkout reference shared by every order of one checkout, e.g. AGM-261018-9F2C41AB"""
+    now = now or datetime.now()
+    return f"AGM-{now:%y%m%d}-{secrets.token_hex(4).upper()}"
+
+
+def checkout_cart(conn, buyer_phone, delivery_address=None, payment_method=None, notes=None):
+    """Place orders for everything in the buyer's cart; returns {seller_phone: [order_number, ...]}
+
+    Runs as a single BEGIN IMMEDIATE transaction: the write lock is taken up
+    front, so the stock read below cannot go stale before the decrement and
+    two checkouts never deadlock upgrading read locks. Orders are split per
+    seller and numbered <reference>-<seller #>-<line #>. Either every line is
+    ordered, stock decremented and the cart emptied, or nothing changes.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        lines = conn.execute("""SELECT c.product_id, c.quantity, p.seller_phone, p.price, p.name,
+                                       p.stock_qty, p.status
+                                FROM cart c
+                                JOIN products p ON c.product_id = p.id
+                                WHERE c.buyer_phone = ?
+                                ORDER BY p.seller_phone, c.id""", (buyer_phone,)).fetchall()
+        if not lines:
+            raise CheckoutError("Your cart is empty")
+
+        shortages = [(product_id, name, quantity, stock_qty if status == 'active' else 0)
+                     for product_id, quantity, _, _, name, stock_qty, status in lines
+                     if status != 'active' or stock_qty < quantity]
+        if shortages:
+            raise CheckoutError("Not enough stock for: " + ", ".join(s[1] for s in shortages), shortages)
+
+        reference = new_order_reference()
+        orders, placed = [], {}
+        for product_id, quantity, seller_phone, price, _, _, _ in lines:
+            seller_orders = placed.setdefault(seller_phone, [])
+            order_number = f"{reference}-{len(placed)}-{len(seller_orders) + 1}"
+            seller_orders.append(order_number)
+            orders.append((order_number, buyer_phone, seller_phone, product_id, quantity, price,
+                           round(price * quantity, 2), delivery_address, payment_method, notes))
+
+        for product_id, quantity, _, _, name, stock_qty, _ in lines:
+            # Oversell guard: never trust the row read above on its own
+            updated = conn.execute("""UPDATE products
+                                      SET stock_qty = stock_qty - ?, updated_at = CURRENT_TIMESTAMP
+                                      WHERE id = ? AND status = 'active' AND stock_qty >= ?""",
+                                   (quantity, product_id, quantity)).rowcount
+            if updated != 1:
+                raise CheckoutError(f"Not enough stock for: {name}",
+                                    [(product_id, name, quantity, stock_qty)])
+
+        conn.executemany("""INSERT INTO orders (order_number, buyer_phone, seller_phone, product_id,
+                                                quantity, unit_price, total_amount,
+                                                delivery_address, payment_method, notes)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", orders)
+        conn.execute("DELETE FROM cart WHERE buyer_phone = ?", (buyer_phone,))
+        conn.commit()
+        return placed
+    except Exception:
+        conn.rollback()
+        raise
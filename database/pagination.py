@@ -0,0 +1,21 @@
+# database/pagination.py - Opaque continuation tokens for keyset pagination
+import base64
+import json
+
+
+def encode_cursor(*key):
+    """Pack the sort key of the last row on a page into an opaque token"""
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, size=2):
+    """Unpack a token from encode_cursor; raises ValueError if it was tampered with"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid page cursor")
+    if not isinstance(key, list) or len(key) != size:
+        raise ValueError("Invalid page cursor")
+    return key
@@ -0,0 +1,238 @@
+# database/pool.py - Long-lived SQLite connection pool for DatabaseManager
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolClosedError(Exception):
+    """Raised when a connection is requested from a pool that was shut down"""
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection became free within the wait timeout"""
+
+
+class PooledConnection:
+    """Proxy around a sqlite3 connection whose close() hands it back to the pool
+
+    Existing callers keep the get_connection() / conn.close() pattern; every
+    other attribute (cursor, execute, commit, ...) goes to the real connection.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._depth = 0
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self._raw.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        """Return the connection to the pool instead of closing it"""
+        self._pool.release(self)
+
+
+class _Waiter:
+    """A thread queued for a connection; release() hands one over directly"""
+    __slots__ = ("event", "conn")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+
+
+class ConnectionPool:
+    """Bounded pool of reusable SQLite connections
+
+    The thread that creates the pool (the Kivy UI thread) keeps one pinned
+    connection for its whole lifetime. Any other thread, e.g. the PriceMonitor
+    worker, borrows an idle connection and returns it when done. Checkouts are
+    re-entrant per thread, so nested DatabaseManager calls share a connection.
+    Threads that have to wait are served first come, first served.
+    """
+
+    def __init__(self, connect, max_size=5, timeout=10.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._idle = []               # LIFO, so the most recently used connections stay warm
+        self._waiters = deque()       # FIFO of _Waiter
+        self._local = threading.local()
+        self._all = set()
+        self._owner_thread = threading.get_ident()
+        self._pinned = None
+        self._closed = False
+
+        # Metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._created = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    # ------------------------------------------------------------------ checkout
+    def acquire(self, timeout=None):
+        """Check out a connection for the calling thread"""
+        if self._closed:
+            raise PoolClosedError("Connection pool has been shut down")
+
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            held._depth += 1
+            return held
+
+        if threading.get_ident() == self._owner_thread:
+            conn = self._acquire_pinned()
+        else:
+            conn = self._acquire_shared(self.timeout if timeout is None else timeout)
+
+        conn._depth = 1
+        self._local.conn = conn
+        with self._lock:
+            self._checkouts += 1
+        return conn
+
+    def _acquire_pinned(self):
+        with self._lock:
+            if self._pinned is None:
+                self._pinned = self._create_locked()
+            return self._pinned
+
+    def _acquire_shared(self, timeout):
+        with self._lock:
+            # An idle connection while others queue would let this thread barge ahead
+            if self._idle and not self._waiters:
+                return self._idle.pop()
+            if len(self._all) < self.max_size:
+                return self._create_locked()
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+
+        started = time.perf_counter()
+        waiter.event.wait(timeout)
+        waited = time.perf_counter() - started
+        with self._lock:
+            # Re-check under the lock: release() may have handed over at the deadline
+            if waiter.conn is None:
+                self._waiters.remove(waiter)
+                self._timeouts += 1
+                raise PoolTimeoutError(
+                    f"No database connection available after {timeout:.1f}s "
+                    f"(pool size {self.max_size})"
+                )
+            self._waits += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+        return waiter.conn
+
+    def _create_locked(self):
+        conn = PooledConnection(self, self._connect())
+        self._all.add(conn)
+        self._created += 1
+        return conn
+
+    def release(self, conn):
+        """Give a connection back; the outermost release makes it reusable
+
+        Releasing a connection that is not checked out (a second close()) does
+        nothing, so it can never be queued as idle twice.
+        """
+        if conn._depth <= 0:
+            return
+        conn._depth -= 1
+        if conn._depth > 0:
+            return
+        if getattr(self._local, "conn", None) is conn:
+            self._local.conn = None
+
+        # Never hand a connection with a half-finished transaction to someone else
+        try:
+            if conn._raw.in_transaction:
+                conn._raw.rollback()
+        except Exception as e:
+            print(f"Error resetting pooled connection: {e}")
+
+        if self._closed:
+            self._discard(conn)
+        elif conn is not self._pinned:
+            with self._lock:
+                if self._waiters:
+                    waiter = self._waiters.popleft()
+                    waiter.conn = conn
+                    waiter.event.set()
+                else:
+                    self._idle.append(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager: with pool.connection() as conn: ..."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------ lifecycle
+    def _discard(self, conn):
+        with self._lock:
+            self._all.discard(conn)
+            if conn is self._pinned:
+                self._pinned = None
+        try:
+            conn._raw.close()
+        except Exception:
+            pass
+
+    def dispose(self):
+        """Close every idle connection; the pool stays usable afterwards"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+        pinned = self._pinned
+        if pinned is not None and pinned._depth == 0:
+            self._discard(pinned)
+
+    def close(self):
+        """Shut the pool down; connections still checked out close on release"""
+        self._closed = True
+        self.dispose()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def stats(self):
+        """Snapshot of pool size and wait-time metrics"""
+        with self._lock:
+            waits = self._waits
+            return {
+                "max_size": self.max_size,
+                "open": len(self._all),
+                "idle": len(self._idle),
+                "in_use": len(self._all) - len(self._idle) - (
+                    1 if self._pinned is not None and self._pinned._depth == 0 else 0),
+                "created": self._created,
+                "checkouts": self._checkouts,
+                "waits": waits,
+                "timeouts": self._timeouts,
+                "total_wait_ms": self._total_wait * 1000,
+                "avg_wait_ms": (self._total_wait / waits * 1000) if waits else 0.0,
+                "max_wait_ms": self._max_wait * 1000,
+            }
@@ -0,0 +1,132 @@
+# database/pragmas.py - SQLite PRAGMA profiles and WAL checkpoint scheduling
+import os
+import threading
+
+# Every profile runs in WAL mode so buyers writing to the cart never block
+# marketplace reads or the background price thread.
+PRAGMA_PROFILES = {
+    # Phones: small page cache, modest mmap, let SQLite auto-checkpoint and
+    # only step in when the WAL file grows past the thresholds below.
+    "mobile-battery": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -4000,            # ~4 MB
+            "mmap_size": 32 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+            "wal_autocheckpoint": 1000,     # pages
+        },
+        "checkpoint": {
+            "interval": 60.0,               # seconds between WAL size checks
+            "passive_bytes": 4 * 1024 * 1024,
+            "truncate_bytes": 16 * 1024 * 1024,
+        },
+    },
+    # Server-side batch work: big cache and mmap, automatic checkpoints off so
+    # writers never pay for them inline - the scheduler does it in background.
+    "server-throughput": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -65536,           # ~64 MB
+            "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 10000,
+            "wal_autocheckpoint": 0,
+        },
+        "checkpoint": {
+            "interval": 5.0,
+            "passive_bytes": 32 * 1024 * 1024,
+            "truncate_bytes": 128 * 1024 * 1024,
+        },
+    },
+}
+
+DEFAULT_PROFILE = "mobile-battery"
+
+
+def resolve_profile(profile):
+    """Turn a profile name (or a custom profile dict) into a profile dict"""
+    if profile is None:
+        profile = DEFAULT_PROFILE
+    if isinstance(profile, dict):
+        return profile
+    try:
+        return PRAGMA_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown PRAGMA profile '{profile}'. Choose one of: {', '.join(PRAGMA_PROFILES)}"
+        )
+
+
+def apply_pragmas(conn, profile):
+    """Apply a profile's PRAGMAs to a freshly opened connection"""
+    for name, value in profile.get("pragmas", {}).items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+class CheckpointScheduler:
+    """Background thread that keeps the WAL file from growing without bound
+
+    Every `interval` seconds it looks at the -wal file size. Past
+    `passive_bytes` it runs a PASSIVE checkpoint (never blocks readers or
+    writers); past `truncate_bytes` it runs TRUNCATE to give the disk back.
+    """
+
+    def __init__(self, db_manager, interval=60.0, passive_bytes=4 * 1024 * 1024,
+                 truncate_bytes=16 * 1024 * 1024):
+        self.db_manager = db_manager
+        self.interval = interval
+        self.passive_bytes = passive_bytes
+        self.truncate_bytes = truncate_bytes
+        self._stop = threading.Event()
+        self._thread = None
+        self.checkpoints = {"PASSIVE": 0, "TRUNCATE": 0}
+
+    @property
+    def wal_path(self):
+        return self.db_manager.db_path + "-wal"
+
+    def wal_size(self):
+        try:
+            return os.path.getsize(self.wal_path)
+        except OSError:
+            return 0
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="wal-checkpoint", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval + 1)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"WAL checkpoint error: {e}")
+
+    def run_once(self):
+        """Checkpoint if the WAL crossed a threshold; returns the mode used or None"""
+        size = self.wal_size()
+        if size >= self.truncate_bytes:
+            mode = "TRUNCATE"
+        elif size >= self.passive_bytes:
+            mode = "PASSIVE"
+        else:
+            return None
+        return self.checkpoint(mode)
+
+    def checkpoint(self, mode="PASSIVE"):
+        with self.db_manager.connection() as conn:
+            conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        self.checkpoints[mode] = self.checkpoints.get(mode, 0) + 1
+        return mode
@@ -0,0 +1,65 @@
+# database/search.py - FTS5 product search helpers
+import re
+
+# bm25() column weights, in products_fts column order:
+# name, category, variety, description, seller_name
+BM25_WEIGHTS = (10.0, 4.0, 2.0, 1.0, 2.0)
+
+# Kivy label markup used by highlight()/snippet()
+HIGHLIGHT_OPEN = "[b]"
+HIGHLIGHT_CLOSE = "[/b]"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text):
+    """Turn free text typed by a buyer into a safe FTS5 prefix query
+
+    "red tom" -> '"red"* "tom"*' (every word must match, as a prefix).
+    Returns None when the text has no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    # Quoting keeps FTS5 operators (AND, NEAR, -, :) typed by users literal
+    return " ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+
+
+FTS_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, category, variety, description, seller_name,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )""",
+    # products_fts.rowid is always products.id
+    """CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, category, variety, description, seller_name)
+        VALUES (new.id, new.name, new.category, COALESCE(new.variety, ''), COALESCE(new.description, ''),
+                COALESCE((SELECT name FROM users WHERE phone = new.seller_phone), ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_update
+        AFTER UPDATE OF name, category, variety, description, seller_phone ON products BEGIN
+        DELETE FROM products_fts WHERE rowid = old.id;
+        INSERT INTO products_fts(rowid, name, category, variety, description, seller_name)
+        VALUES (new.id, new.name, new.category, COALESCE(new.variety, ''), COALESCE(new.description, ''),
+                COALESCE((SELECT name FROM users WHERE phone = new.seller_phone), ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+        DELETE FROM products_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_seller_rename AFTER UPDATE OF name ON users BEGIN
+        UPDATE products_fts SET seller_name = new.name
+        WHERE rowid IN (SELECT id FROM products WHERE seller_phone = new.phone);
+    END""",
+]
+
+
+def create_search_index(cursor):
+    """Create products_fts with its sync triggers and index existing products"""
+    for statement in FTS_SCHEMA:
+        cursor.execute(statement)
+    cursor.execute("DELETE FROM products_fts")
+    cursor.execute("""INSERT INTO products_fts(rowid, name, category, variety, description, seller_name)
+                      SELECT p.id, p.name, p.category, COALESCE(p.variety, ''), COALESCE(p.description, ''),
+                             COALESCE(u.name, '')
+                      FROM products p LEFT JOIN users u ON u.phone = p.seller_phone""")
@@ -0,0 +1,102 @@
+# database/stats.py - Per-user product and order counters kept current by triggers
+# Profile statistics read a handful of rows keyed by phone, however many
+# products and orders a user has. Rows are (phone, stat, count, amount):
+#   products         - products listed by a seller
+#   sold:<status>    - a seller's orders in that status and their total amount
+#   bought:<status>  - a buyer's orders in that status and their total amount
+# Orders without a status are counted as pending.
+STATS_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS user_stats(
+        phone TEXT NOT NULL,
+        stat TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        amount REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY(phone, stat)
+    ) WITHOUT ROWID""",
+    """CREATE TRIGGER IF NOT EXISTS user_stats_product_insert
+       AFTER INSERT ON products
+       BEGIN
+           INSERT INTO user_stats (phone, stat, count) VALUES (NEW.seller_phone, 'products', 1)
+           ON CONFLICT(phone, stat) DO UPDATE SET count = count + 1;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS user_stats_product_delete
+       AFTER DELETE ON products
+       BEGIN
+           UPDATE user_stats SET count = count - 1 WHERE phone = OLD.seller_phone AND stat = 'products';
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS user_stats_order_insert
+       AFTER INSERT ON orders
+       BEGIN
+           INSERT INTO user_stats (phone, stat, count, amount)
+           VALUES (NEW.seller_phone, 'sold:' || COALESCE(NEW.status, 'pending'), 1, NEW.total_amount),
+                  (NEW.buyer_phone, 'bought:' || COALESCE(NEW.status, 'pending'), 1, NEW.total_amount)
+           ON CONFLICT(phone, stat) DO UPDATE SET count = count + 1, amount = amount + excluded.amount;
+       END""",
+    # A status change moves the order from one counter to another
+    """CREATE TRIGGER IF NOT EXISTS user_stats_order_update
+       AFTER UPDATE OF status, total_amount ON orders
+       WHEN NEW.status IS NOT OLD.status OR NEW.total_amount != OLD.total_amount
+       BEGIN
+           UPDATE user_stats SET count = count - 1, amount = amount - OLD.total_amount
+           WHERE (phone, stat) IN (VALUES (OLD.seller_phone, 'sold:' || COALESCE(OLD.status, 'pending')),
+                                          (OLD.buyer_phone, 'bought:' || COALESCE(OLD.status, 'pending')));
+           INSERT INTO user_stats (phone, stat, count, amount)
+           VALUES (NEW.seller_phone, 'sold:' || COALESCE(NEW.status, 'pending'), 1, NEW.total_amount),
+                  (NEW.buyer_phone, 'bought:' || COALESCE(NEW.status, 'pending'), 1, NEW.total_amount)
+           ON CONFLICT(phone, stat) DO UPDATE SET count = count + 1, amount = amount + excluded.amount;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS user_stats_order_delete
+       AFTER DELETE ON orders
+       BEGIN
+           UPDATE user_stats SET count = count - 1, amount = amount - OLD.total_amount
+           WHERE (phone, stat) IN (VALUES (OLD.seller_phone, 'sold:' || COALESCE(OLD.status, 'pending')),
+                                          (OLD.buyer_phone, 'bought:' || COALESCE(OLD.status, 'pending')));
+       END""",
+]
+
+# Orders in these statuses never turn into sales
+NON_REVENUE_STATUSES = {"cancelled", "rejected", "refunded"}
+
+
+class UserStats:
+    """A user's counters as read from user_stats
+
+    orders_by_status is {status: count} for the user's own side (sold for
+    sellers, bought for buyers); gmv is the lifetime value of those orders,
+    leaving out NON_REVENUE_STATUSES.
+    """
+
+    def __init__(self, role, rows=()):
+        prefix = "sold:" if role == "seller" else "bought:"
+        self.role = role
+        self.products = 0
+        self.orders_by_status = {}
+        self.gmv = 0.0
+        for stat, count, amount in rows:
+            if stat == "products":
+                self.products = count
+            elif stat.startswith(prefix) and count:
+                status = stat[len(prefix):]
+                self.orders_by_status[status] = count
+                if status not in NON_REVENUE_STATUSES:
+                    self.gmv += amount
+        self.gmv = round(self.gmv, 2)
+
+    @property
+    def orders(self):
+        return sum(self.orders_by_status.values())
+
+
+def create_user_stats(cursor):
+    """Counter table and triggers, seeded from the products and orders already stored"""
+    for statement in STATS_SCHEMA:
+        cursor.execute(statement)
+    cursor.execute("DELETE FROM user_stats")
+    cursor.execute("""INSERT INTO user_stats (phone, stat, count)
+                      SELECT seller_phone, 'products', COUNT(*) FROM products GROUP BY seller_phone""")
+    cursor.execute("""INSERT INTO user_stats (phone, stat, count, amount)
+                      SELECT seller_phone, 'sold:' || COALESCE(status, 'pending'), COUNT(*), SUM(total_amount)
+                      FROM orders GROUP BY 1, 2""")
+    cursor.execute("""INSERT INTO user_stats (phone, stat, count, amount)
+                      SELECT buyer_phone, 'bought:' || COALESCE(status, 'pending'), COUNT(*), SUM(total_amount)
+                      FROM orders GROUP BY 1, 2""")
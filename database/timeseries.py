@@ -0,0 +1,206 @@
+# database/timeseries.py - Market price time series: batched ingestion and OHLC rollups
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_LOCATION = "Hamirpur"
+# Daily moving-average windows, in trading days (days that have samples)
+SMA_SHORT = 7
+SMA_LONG = 30
+
+RESOLUTIONS = {
+    # resolution: (rollup table, timestamp prefix length, bucket suffix)
+    "hour": ("price_hourly", 13, ":00:00"),   # '2026-10-18 14:00:00'
+    "day": ("price_daily", 10, ""),           # '2026-10-18'
+}
+
+# Rollups keep OHLC plus the timestamps of the open and close samples, so
+# late or out-of-order samples can be merged without re-reading raw rows.
+ROLLUP_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS price_hourly(
+        product_name TEXT NOT NULL,
+        location TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        open REAL NOT NULL,
+        high REAL NOT NULL,
+        low REAL NOT NULL,
+        close REAL NOT NULL,
+        samples INTEGER NOT NULL,
+        total REAL NOT NULL,
+        first_at TEXT NOT NULL,
+        last_at TEXT NOT NULL,
+        PRIMARY KEY(product_name, location, bucket)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS price_daily(
+        product_name TEXT NOT NULL,
+        location TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        open REAL NOT NULL,
+        high REAL NOT NULL,
+        low REAL NOT NULL,
+        close REAL NOT NULL,
+        samples INTEGER NOT NULL,
+        total REAL NOT NULL,
+        first_at TEXT NOT NULL,
+        last_at TEXT NOT NULL,
+        sma_short REAL,
+        sma_long REAL,
+        PRIMARY KEY(product_name, location, bucket)
+    ) WITHOUT ROWID""",
+    # Trends list every commodity at one location
+    """CREATE INDEX IF NOT EXISTS idx_price_daily_location
+       ON price_daily(location, product_name, bucket)""",
+]
+
+UPSERT_ROLLUP = """INSERT INTO {table}
+    (product_name, location, bucket, open, high, low, close, samples, total, first_at, last_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(product_name, location, bucket) DO UPDATE SET
+        open = CASE WHEN excluded.first_at < first_at THEN excluded.open ELSE open END,
+        close = CASE WHEN excluded.last_at >= last_at THEN excluded.close ELSE close END,
+        high = MAX(high, excluded.high),
+        low = MIN(low, excluded.low),
+        samples = samples + excluded.samples,
+        total = total + excluded.total,
+        first_at = MIN(first_at, excluded.first_at),
+        last_at = MAX(last_at, excluded.last_at)"""
+
+# Moving averages over the last N daily closes, recomputed only for the days a
+# batch touched and the days whose window reaches back into them.
+UPDATE_SMA = f"""UPDATE price_daily SET
+    sma_short = (SELECT AVG(close) FROM (
+        SELECT close FROM price_daily d
+        WHERE d.product_name = price_daily.product_name AND d.location = price_daily.location
+          AND d.bucket <= price_daily.bucket
+        ORDER BY d.bucket DESC LIMIT {SMA_SHORT})),
+    sma_long = (SELECT AVG(close) FROM (
+        SELECT close FROM price_daily d
+        WHERE d.product_name = price_daily.product_name AND d.location = price_daily.location
+          AND d.bucket <= price_daily.bucket
+        ORDER BY d.bucket DESC LIMIT {SMA_LONG}))
+    WHERE product_name = ? AND location = ? AND bucket >= ?"""
+
+# Latest daily close per commodity at :location with the close before it.
+# The recursive CTE hops from one product_name to the next on
+# idx_price_daily_location, so every commodity costs a few index seeks
+# however many days of history it has.
+LATEST_CLOSES = """WITH RECURSIVE commodities(product_name) AS (
+        SELECT MIN(product_name) FROM price_daily WHERE location = :location
+        UNION ALL
+        SELECT (SELECT MIN(product_name) FROM price_daily
+                WHERE location = :location AND product_name > commodities.product_name)
+        FROM commodities WHERE product_name IS NOT NULL)
+    SELECT d.product_name, d.bucket, d.close,
+           (SELECT p.close FROM price_daily p
+            WHERE p.product_name = d.product_name AND p.location = d.location AND p.bucket < d.bucket
+            ORDER BY p.bucket DESC LIMIT 1) as previous_close,
+           d.sma_short
+    FROM commodities
+    JOIN price_daily d ON d.product_name = commodities.product_name AND d.location = :location
+     AND d.bucket = (SELECT MAX(bucket) FROM price_daily m
+                     WHERE m.product_name = commodities.product_name AND m.location = :location)
+    ORDER BY d.product_name"""
+
+
+def create_rollup_tables(cursor):
+    for statement in ROLLUP_SCHEMA:
+        cursor.execute(statement)
+
+
+def parse_timestamp(value):
+    """datetime from a datetime or an ISO date / date-time string"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def format_timestamp(value=None):
+    """SQLite CURRENT_TIMESTAMP-style text (UTC); now when value is None"""
+    value = datetime.now(timezone.utc) if value is None else parse_timestamp(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def bucket_of(timestamp, resolution):
+    """Rollup bucket key of a formatted timestamp"""
+    _, length, suffix = RESOLUTIONS[resolution]
+    return timestamp[:length] + suffix
+
+
+def normalize_sample(sample):
+    """(product_name, price[, location[, recorded_at[, source]]]) -> full 5-tuple"""
+    product_name, price, *rest = sample
+    location = rest[0] if len(rest) > 0 and rest[0] else DEFAULT_LOCATION
+    recorded_at = format_timestamp(rest[1] if len(rest) > 1 else None)
+    source = rest[2] if len(rest) > 2 and rest[2] else "market_api"
+    return product_name, float(price), location, recorded_at, source
+
+
+def aggregate(samples, resolution):
+    """Fold samples into one OHLC row per (product, location, bucket)"""
+    buckets = {}
+    for product_name, price, location, recorded_at, _ in samples:
+        bucket = bucket_of(recorded_at, resolution)
+        key = (product_name, location, bucket)
+        row = buckets.get(key)
+        if row is None:
+            buckets[key] = [price, price, price, price, 1, price, recorded_at, recorded_at]
+            continue
+        if recorded_at < row[6]:
+            row[0], row[6] = price, recorded_at
+        if recorded_at >= row[7]:
+            row[3], row[7] = price, recorded_at
+        row[1] = max(row[1], price)
+        row[2] = min(row[2], price)
+        row[4] += 1
+        row[5] += price
+    return [key + tuple(row) for key, row in buckets.items()]
+
+
+def ingest_prices(conn, samples):
+    """Store raw samples and fold them into the hourly and daily rollups
+
+    One transaction and one executemany per table, however many samples.
+    Returns the number of samples stored.
+    """
+    samples = [normalize_sample(sample) for sample in samples]
+    if not samples:
+        return 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany("""INSERT INTO price_history (product_name, market_price, location, recorded_at, source)
+                            VALUES (?, ?, ?, ?, ?)""", samples)
+        fold_into_rollups(conn, samples)
+        conn.commit()
+        return len(samples)
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def fold_into_rollups(cursor, samples):
+    """Merge normalized samples into the rollups and refresh the affected moving averages"""
+    for resolution, (table, _, _) in RESOLUTIONS.items():
+        cursor.executemany(UPSERT_ROLLUP.format(table=table), aggregate(samples, resolution))
+
+    earliest_day = {}
+    for product_name, _, location, recorded_at, _ in samples:
+        key = (product_name, location)
+        day = bucket_of(recorded_at, "day")
+        if key not in earliest_day or day < earliest_day[key]:
+            earliest_day[key] = day
+    cursor.executemany(UPDATE_SMA, [key + (day,) for key, day in earliest_day.items()])
+
+
+def rebuild_rollups(cursor):
+    """Fold every raw price_history row into the (empty) rollup tables"""
+    rows = cursor.execute("""SELECT product_name, market_price, COALESCE(location, ?),
+                                    COALESCE(recorded_at, CURRENT_TIMESTAMP), source
+                             FROM price_history""", (DEFAULT_LOCATION,)).fetchall()
+    fold_into_rollups(cursor, [normalize_sample(row) for row in rows])
+
+
+def range_bounds(start, end, resolution):
+    """First and last bucket keys of a [start, end] range (default: the last 30 days)"""
+    end = datetime.now(timezone.utc) if end is None else parse_timestamp(end)
+    start = end - timedelta(days=30) if start is None else parse_timestamp(start)
+    return bucket_of(format_timestamp(start), resolution), bucket_of(format_timestamp(end), resolution)
@@ -0,0 +1,45 @@
+# fixtures.py - Throwaway databases shared by the test scripts
+import atexit
+import os
+import shutil
+import tempfile
+
+from database.credentials import PasswordHasher
+from database.db_manager import DatabaseManager
+
+# No test measures hashing, so seeded users hash at a low cost
+TEST_HASH_COST = 1000
+# Password of every user make_db() seeds
+SEED_PASSWORD = "secret1"
+
+_temp_dirs = []
+
+
+def temp_db_path(name):
+    """Path for a database file in a fresh temporary directory, removed at exit"""
+    tmp_dir = tempfile.mkdtemp(prefix="agrimart-test-")
+    _temp_dirs.append(tmp_dir)
+    return os.path.join(tmp_dir, name)
+
+
+def make_db(name="test.db", users=(), products=(), **kwargs):
+    """Initialised DatabaseManager on a temporary file, seeded with users and products
+
+    users are (name, phone, role, location[, email]) tuples and products are
+    add_product() argument tuples. kwargs go to DatabaseManager; passwords
+    hash at TEST_HASH_COST unless a password_hasher is given.
+    """
+    kwargs.setdefault("password_hasher", PasswordHasher(cost=TEST_HASH_COST))
+    db = DatabaseManager(temp_db_path(name), **kwargs)
+    db.init_database()
+    for user_name, phone, role, location, *email in users:
+        db.create_user(user_name, phone, email[0] if email else "", SEED_PASSWORD, role, location)
+    for product in products:
+        db.add_product(*product)
+    return db
+
+
+@atexit.register
+def _remove_temp_dirs():
+    for tmp_dir in _temp_dirs:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
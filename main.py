@@ -1,17 +1,23 @@
 # main.py - AgriConnect Mobile App Configuration 
-from kivymd.app import MDApp
-from kivy.core.window import Window
-from kivy.storage.jsonstore import JsonStore
-import os
+from utils.startup_profiler import startup_profiler, trace_path
 
-# FORCE MOBILE PHONE DIMENSIONS
-Window.size = (360, 640)  # Standard mobile phone dimensions (9:16 ratio)
-Window.minimum_width = 300
-Window.minimum_height = 500
+with startup_profiler.phase("imports"):
+    from kivymd.app import MDApp
+    from kivy.core.window import Window
+    from kivy.storage.jsonstore import JsonStore
+    import os
 
-# Import your modules
-from database.db_manager import DatabaseManager
-from screens.screen_manager import create_screen_manager
+    # FORCE MOBILE PHONE DIMENSIONS
+    Window.size = (360, 640)  # Standard mobile phone dimensions (9:16 ratio)
+    Window.minimum_width = 300
+    Window.minimum_height = 500
+
+    # Import your modules
+    from database.cart import CartService
+    from database.db_manager import DatabaseManager
+    from database.executor import QueryExecutor
+    from screens.registry import ScreenRegistry
+    from screens.screen_manager import create_screen_manager
 
 class AgriConnectApp(MDApp):
     def __init__(self, **kwargs):
@@ -21,16 +27,47 @@ class AgriConnectApp(MDApp):
         self.theme_cls.theme_style = "Light"
         
         # Database setup
-        self.db_manager = DatabaseManager()
-        self.db_manager.init_database()
+        # Only schema steps run here; seeding and housekeeping wait for the first frame
+        with startup_profiler.phase("db_init"):
+            self.db_manager = DatabaseManager()
+            self.db_manager.init_database(defer=True)
+        # Screens load their data through this so queries never block the UI thread
+        self.db_executor = QueryExecutor(self.db_manager)
+        # Buyer carts live in memory and are written back in batches
+        self.cart = CartService(self.db_manager)
         
         # Storage for session management  
         self.store = JsonStore('data/user_session.json')
 
     def build(self):
+        # Importing the login screen's module parses its KV rules
+        registry = ScreenRegistry()
+        with startup_profiler.phase("kv_parse"):
+            registry.screen_class("login")
         # Create and return screen manager
-        sm = create_screen_manager(self)
+        with startup_profiler.phase("screen_build"):
+            sm = create_screen_manager(self, registry)
+        self.first_frame_started = startup_profiler.begin()
+        Window.bind(on_flip=self.on_first_frame)
         return sm
+
+    def on_first_frame(self, *args):
+        """First frame presented: start deferred DB work and close the startup trace"""
+        Window.unbind(on_flip=self.on_first_frame)
+        self.db_manager.start_deferred_init()
+        if startup_profiler.enabled:
+            startup_profiler.end("first_frame", self.first_frame_started)
+            startup_profiler.mark("interactive")
+            startup_profiler.finish()
+            startup_profiler.dump(trace_path)
+            for name, ms, limit in startup_profiler.over_budget():
+                print(f"⚠️ Startup phase {name} took {ms:.0f} ms (budget {limit} ms)")
+
+    def on_stop(self):
+        """Save pending cart changes, stop background queries, then release pooled connections"""
+        self.cart.close()
+        self.db_executor.shutdown()
+        self.db_manager.close()
     
     def load_dashboard_data(self, role):
         """Load data for dashboard based on user role"""
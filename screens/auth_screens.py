@@ -667,32 +667,35 @@ class LoginScreen(Screen):
             show_message("Password is required")
             return
         
-        # Authenticate user
-        try:
-            result = self.app.db_manager.authenticate_user(phone, password)
+        # Authenticate user - password hashing is deliberately slow, so off the UI thread
+        self.app.db_executor.submit("authenticate_user", phone, password, owner=self,
+                                    on_result=lambda result: self.on_login_result(phone, result),
+                                    on_error=self.on_login_error,
+                                    on_slow=lambda: show_message("🔐 Signing in..."))
+
+    def on_login_result(self, phone, result):
+        if result:
+            name, role, location = result
+            self.app.store.put("session", phone=phone, name=name, role=role, location=location or "")
             
-            if result:
-                name, role, location = result
-                self.app.store.put("session", phone=phone, name=name, role=role, location=location or "")
-                
-                next_screen = "seller_dashboard" if role == "seller" else "buyer_dashboard"
-                self.manager.current = next_screen
-                
-                self.app.load_dashboard_data(role)
-                
-                emoji = "🌾" if role == "seller" else "🛒"
-                show_message(f"Welcome back, {name}! {emoji}")
-                
-                # Clear form
-                self.ids.phone.text = ""
-                self.ids.password.text = ""
-                self.ids.show_password_check.active = False
-            else:
-                show_message("❌ Invalid phone number or password")
-                
-        except Exception as e:
-            show_message("❌ Login failed. Please try again.")
-            print(f"Login error: {e}")
+            next_screen = "seller_dashboard" if role == "seller" else "buyer_dashboard"
+            self.manager.current = next_screen
+            
+            self.app.load_dashboard_data(role)
+            
+            emoji = "🌾" if role == "seller" else "🛒"
+            show_message(f"Welcome back, {name}! {emoji}")
+            
+            # Clear form
+            self.ids.phone.text = ""
+            self.ids.password.text = ""
+            self.ids.show_password_check.active = False
+        else:
+            show_message("❌ Invalid phone number or password")
+
+    def on_login_error(self, error):
+        show_message("❌ Login failed. Please try again.")
+        print(f"Login error: {error}")
 
 class RegisterScreen(Screen):
     role = StringProperty("")
@@ -747,30 +750,33 @@ class RegisterScreen(Screen):
             show_message("⚠️ Please select your role (Farmer or Buyer)")
             return
         
-        try:
-            # Create user account
-            success = self.app.db_manager.create_user(name, phone, email, password, self.role, location)
+        # Create user account - hashing the password takes a noticeable moment
+        role = self.role
+        self.app.db_executor.submit("create_user", name, phone, email, password, role, location, owner=self,
+                                    on_result=lambda success: self.on_register_result(success, name, phone, role, location),
+                                    on_error=self.on_register_error)
+
+    def on_register_result(self, success, name, phone, role, location):
+        if success:
+            self.app.store.put("session", phone=phone, name=name, role=role, location=location)
             
-            if success:
-                self.app.store.put("session", phone=phone, name=name, role=self.role, location=location)
-                
-                next_screen = "seller_dashboard" if self.role == "seller" else "buyer_dashboard"
-                self.manager.current = next_screen
-                
-                self.app.load_dashboard_data(self.role)
-                
-                emoji = "🌾" if self.role == "seller" else "🛒"
-                show_message(f"🎉 Welcome to AgriConnect, {name}! {emoji}")
-                
-                # Clear form
-                for field in [self.ids.r_name, self.ids.r_phone, self.ids.r_email, self.ids.r_location, self.ids.r_pass]:
-                    field.text = ""
-                self.role = ""
-                self.seller_selected = False
-                self.buyer_selected = False
-            else:
-                show_message("❌ Phone number already registered. Please use a different number.")
-                
-        except Exception as e:
-            show_message("❌ Registration failed. Please try again.")
-            print(f"Registration error: {e}")
+            next_screen = "seller_dashboard" if role == "seller" else "buyer_dashboard"
+            self.manager.current = next_screen
+            
+            self.app.load_dashboard_data(role)
+            
+            emoji = "🌾" if role == "seller" else "🛒"
+            show_message(f"🎉 Welcome to AgriConnect, {name}! {emoji}")
+            
+            # Clear form
+            for field in [self.ids.r_name, self.ids.r_phone, self.ids.r_email, self.ids.r_location, self.ids.r_pass]:
+                field.text = ""
+            self.role = ""
+            self.seller_selected = False
+            self.buyer_selected = False
+        else:
+            show_message("❌ Phone number already registered. Please use a different number.")
+
+    def on_register_error(self, error):
+        show_message("❌ Registration failed. Please try again.")
+        print(f"Registration error: {error}")
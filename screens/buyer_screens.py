@@ -1,9 +1,26 @@
 # screens/buyer_screens.py - Buyer Screens (FIXED)
 from kivy.uix.screenmanager import Screen
+from kivy.clock import Clock
 from kivy.lang import Builder
+from kivy.properties import ObjectProperty, StringProperty
+from kivymd.uix.list import TwoLineListItem
 from kivymd.uix.snackbar import Snackbar
 
+from database.orders import CheckoutError
+
+def show_snackbar(message):
+    """Helper function for KivyMD 1.2.0 compatibility"""
+    try:
+        snackbar = Snackbar()
+        snackbar.text = message
+        snackbar.duration = 3
+        snackbar.open()
+    except Exception as e:
+        print(f"Message: {message}")
+
 Builder.load_string("""
+<SearchResultItem>:
+    on_release: root.screen.open_search_result()
 <BuyerDashboard>:
     MDBoxLayout:
         orientation: "vertical"
@@ -31,10 +48,27 @@ Builder.load_string("""
                         theme_text_color: "Primary"
 
                 MDTextField:
+                    id: search_field
                     hint_text: "Search products..."
                     icon_right: "magnify"
                     size_hint_y: None
                     height: "60dp"
+                    on_text: root.on_search_text(self.text)
+                    on_text_validate: root.open_search_result()
+
+                RecycleView:
+                    id: search_results
+                    viewclass: "SearchResultItem"
+                    size_hint_y: None
+                    height: "240dp" if self.data else 0
+                    opacity: 1 if self.data else 0
+                    on_scroll_y: root.on_results_scroll(self.scroll_y)
+                    RecycleBoxLayout:
+                        orientation: "vertical"
+                        default_size: None, dp(72)
+                        default_size_hint: 1, None
+                        size_hint_y: None
+                        height: self.minimum_height
 
                 MDLabel:
                     text: "Quick Actions"
@@ -66,7 +100,7 @@ Builder.load_string("""
         MDTopAppBar:
             title: "🛒 Shopping Cart"
             left_action_items: [["arrow-left", lambda x: root.go_back()]]
-            right_action_items: [["delete", lambda x: root.clear_cart()]]
+            right_action_items: [["credit-card-outline", lambda x: root.go_to_checkout()], ["delete", lambda x: root.clear_cart()]]
         MDScrollView:
             MDBoxLayout:
                 orientation: "vertical"
@@ -82,19 +116,133 @@ Builder.load_string("""
         MDTopAppBar:
             title: "💳 Checkout"
             left_action_items: [["arrow-left", lambda x: root.go_to_cart()]]
-        MDLabel:
-            text: "Checkout process coming soon!"
-            halign: "center"
-            font_style: "Subtitle1"
+        MDBoxLayout:
+            orientation: "vertical"
+            spacing: "15dp"
+            padding: "20dp"
+            MDLabel:
+                id: summary_label
+                text: ""
+                halign: "center"
+                font_style: "Subtitle1"
+            MDTextField:
+                id: address_field
+                hint_text: "Delivery address"
+                multiline: True
+                size_hint_y: None
+                height: "80dp"
+            MDTextField:
+                id: payment_field
+                hint_text: "Payment method"
+                text: "Cash on delivery"
+                size_hint_y: None
+                height: "60dp"
+            MDRaisedButton:
+                id: place_order_button
+                text: "Place Order"
+                size_hint_x: 1
+                on_release: root.place_order()
 """)
 
+class SearchResultItem(TwoLineListItem):
+    """Recycled search suggestion row with highlighted matches"""
+    screen = ObjectProperty(None, allownone=True)
+    product_id = ObjectProperty(None, allownone=True)
+
 class BuyerDashboard(Screen):
+    # Wait for a pause in typing before querying, so each keystroke is not a search
+    SEARCH_DEBOUNCE = 0.3
+    SEARCH_PAGE_SIZE = 20
+
     def __init__(self, app=None, **kwargs):
         super().__init__(**kwargs)
         self.app = app
+        self._search_event = None
+        self.search_text = ""
+        self.search_cursor = None
+        # True while a search page is being fetched, so scrolling asks only once
+        self.loading_results = False
     
     def load_products(self):
         pass
+
+    def on_leave(self):
+        """Drop pending and running searches for this screen"""
+        if self._search_event is not None:
+            self._search_event.cancel()
+            self._search_event = None
+        self.app.db_executor.cancel(self)
+        self.loading_results = False
+
+    def on_search_text(self, text):
+        """Search-as-you-type: restart the debounce timer on every keystroke"""
+        if self._search_event is not None:
+            self._search_event.cancel()
+        # Results still on their way are for text the user has moved past
+        self.app.db_executor.cancel(self)
+        self.loading_results = False
+        self._search_event = Clock.schedule_once(lambda dt: self.run_search(text), self.SEARCH_DEBOUNCE)
+
+    def run_search(self, text):
+        """Show the first page of ranked matches under the search field"""
+        self._search_event = None
+        self.search_text = text.strip()
+        self.search_cursor = None
+        # A search for older text must not land under the new one
+        self.app.db_executor.cancel(self)
+        self.loading_results = False
+        results = self.ids.search_results
+        if not self.search_text:
+            results.data = []
+            return
+        self.loading_results = True
+        self.app.db_executor.submit("search_products_page", self.search_text, self.SEARCH_PAGE_SIZE, owner=self,
+                                    on_result=self.show_search_results,
+                                    on_error=self.on_search_error)
+
+    def show_search_results(self, page):
+        rows, self.search_cursor = page
+        self.loading_results = False
+        results = self.ids.search_results
+        results.data = [self.search_row(row) for row in rows]
+        results.scroll_y = 1
+
+    def on_results_scroll(self, scroll_y):
+        """Append the next page of matches near the bottom of the list"""
+        if scroll_y > 0.1 or not self.search_cursor or self.loading_results:
+            return
+        self.loading_results = True
+        self.app.db_executor.submit("search_products_page", self.search_text, self.SEARCH_PAGE_SIZE,
+                                    self.search_cursor, owner=self,
+                                    on_result=self.show_more_results,
+                                    on_error=self.on_search_error)
+
+    def show_more_results(self, page):
+        rows, self.search_cursor = page
+        self.loading_results = False
+        self.ids.search_results.data.extend(self.search_row(row) for row in rows)
+
+    def on_search_error(self, error):
+        self.loading_results = False
+        show_snackbar("Search failed, please try again")
+
+    def search_row(self, row):
+        """Data dict for one SearchResultItem"""
+        return {
+            "screen": self,
+            "product_id": row.id,
+            "text": f"{row.name_highlight}  •  ₹{row.price:.2f}/{row.unit}",
+            "secondary_text": row.description_snippet or f"by {row.seller_name}",
+        }
+
+    def open_search_result(self):
+        """Show the full search results in the marketplace"""
+        query = self.ids.search_field.text.strip()
+        if not query:
+            return
+        marketplace = self.app.root.get_screen("marketplace")
+        marketplace.search_query = query
+        self.app.root.current = "marketplace"
     
     def go_to_cart(self):
         self.app.root.current = "cart"
@@ -106,6 +254,7 @@ class BuyerDashboard(Screen):
         self.app.logout()
     
     def browse_products(self):
+        self.app.root.get_screen("marketplace").search_query = ""
         self.app.root.current = "marketplace"
     
     def go_to_orders(self):
@@ -118,85 +267,181 @@ class BuyerDashboard(Screen):
         self.app.root.current = "schemes"
 
 class CartScreen(Screen):
+    # Re-price the cart once a burst of +/- taps has settled, not on every tap
+    SUMMARY_DEBOUNCE = 0.5
+
     def __init__(self, app=None, **kwargs):
         super().__init__(**kwargs)
         self.app = app
+        self._summary_event = None
     
     def on_enter(self):
         self.load_cart_items()
+
+    def on_leave(self):
+        if self._summary_event is not None:
+            self._summary_event.cancel()
+            self._summary_event = None
+        self.app.db_executor.cancel(self)
+        # Write the quantity taps made on this screen back to the cart table;
+        # no owner, so leaving never drops it
+        self.app.db_executor.submit(self.app.cart.flush)
     
     def load_cart_items(self):
-        container = self.ids.cart_container
-        container.clear_widgets()
+        self.ids.cart_container.clear_widgets()
         
         if not self.app.store.exists("session"):
             show_snackbar("Please login first")
             return
         
         buyer_phone = self.app.store.get("session")["phone"]
-        items = self.app.db_manager.get_cart_items(buyer_phone)
-        
-        if not items:
-            from kivymd.uix.label import MDLabel
-            no_items_label = MDLabel(
-                text="Your cart is empty. Add products to see them here.",
-                halign="center",
+        self._summary_event = None
+        self.app.db_executor.cancel(self)
+        # Totals, subtotals and stock/price flags all come from one SQL aggregate
+        self.app.db_executor.submit(self.app.cart.summary, buyer_phone, owner=self,
+                                    on_result=self.show_cart_summary,
+                                    on_error=lambda error: self.show_message("Could not load your cart"),
+                                    on_slow=lambda: self.show_message("Loading cart..."))
+
+    def show_message(self, text):
+        """Replace the cart list with a single centred line"""
+        from kivymd.uix.label import MDLabel
+        container = self.ids.cart_container
+        container.clear_widgets()
+        container.add_widget(MDLabel(
+            text=text,
+            halign="center",
+            font_style="Subtitle1",
+            theme_text_color="Secondary",
+            size_hint_y=None,
+            height="40dp"
+        ))
+
+    def show_cart_summary(self, summary):
+        """Cart lines grouped by seller, with subtotals, flags and the grand total"""
+        if summary is None:
+            self.show_message("Could not load your cart")
+            return
+        if not summary.lines:
+            self.show_message("Your cart is empty. Add products to see them here.")
+            return
+
+        from kivymd.uix.label import MDLabel
+        container = self.ids.cart_container
+        container.clear_widgets()
+        for seller_phone, seller_name, subtotal, lines in summary.sellers:
+            container.add_widget(MDLabel(
+                text=f"🧑‍🌾 {seller_name} - ₹{subtotal:.2f}",
                 font_style="Subtitle1",
-                theme_text_color="Secondary",
+                theme_text_color="Primary",
                 size_hint_y=None,
-                height="40dp"
-            )
-            container.add_widget(no_items_label)
+                height="32dp"
+            ))
+            for line in lines:
+                container.add_widget(self.line_card(line.product_id, line.product_name, line.quantity,
+                                                    line.unit, line.line_total, self.line_warning(line)))
+
+        warnings = []
+        if summary.price_changes:
+            warnings.append(f"{len(summary.price_changes)} prices changed since you added them")
+        if summary.shortages:
+            warnings.append(f"{len(summary.shortages)} items are short of stock")
+        container.add_widget(MDLabel(
+            text=f"Total: ₹{summary.total:.2f}" + "".join(f"\n⚠️ {warning}" for warning in warnings),
+            font_style="H6",
+            halign="right",
+            size_hint_y=None,
+            height="80dp" if warnings else "40dp"
+        ))
+
+    def line_warning(self, line):
+        if line.short_of_stock:
+            return f"Only {line.available:g} {line.unit} left" if line.available > 0 else "Out of stock"
+        if line.price_changed:
+            arrow = "↑" if line.price > line.price_at_add else "↓"
+            return f"Price {arrow} ₹{line.price_at_add:.2f} → ₹{line.price:.2f}"
+        return ""
+
+    def show_cart_items(self, items):
+        """Lines straight from the in-memory cart while a re-priced summary is pending"""
+        if not items:
+            self.show_message("Your cart is empty. Add products to see them here.")
             return
-        
+
+        container = self.ids.cart_container
+        container.clear_widgets()
+        for item in items:
+            container.add_widget(self.line_card(item.product_id, item.product_name, item.quantity,
+                                                item.unit, item.price * item.quantity, ""))
+
+    def line_card(self, product_id, name, quantity, unit, amount, warning):
         from kivymd.uix.card import MDCard
         from kivymd.uix.boxlayout import MDBoxLayout
+        from kivymd.uix.button import MDIconButton
         from kivymd.uix.label import MDLabel
+
+        card = MDCard(
+            size_hint_y=None,
+            height="100dp",
+            elevation=5,
+            radius=[10],
+            padding="10dp"
+        )
         
-        for item in items:
-            cart_id, buyer_phone, product_id, quantity, added_at, product_name, price, unit, seller_name = item
-            
-            card = MDCard(
-                size_hint_y=None,
-                height="100dp",
-                elevation=5,
-                radius=[10],
-                padding="10dp"
-            )
-            
-            layout = MDBoxLayout(orientation="horizontal", spacing="10dp")
-            
-            name_label = MDLabel(
-                text=f"{product_name}",
-                font_style="H6",
-                theme_text_color="Primary",
-                size_hint_x=0.5
-            )
-            
-            qty_label = MDLabel(
-                text=f"Qty: {quantity} {unit}",
-                font_style="Body1",
-                theme_text_color="Secondary",
-                size_hint_x=0.3
-            )
-            
-            price_label = MDLabel(
-                text=f"₹{price * quantity:.2f}",
-                font_style="Body1",
-                theme_text_color="Primary",
-                size_hint_x=0.2,
-                halign="right"
-            )
-            
-            layout.add_widget(name_label)
-            layout.add_widget(qty_label)
-            layout.add_widget(price_label)
-            
-            card.add_widget(layout)
-            container.add_widget(card)
+        layout = MDBoxLayout(orientation="horizontal", spacing="10dp")
+        
+        name_label = MDLabel(
+            text=f"{name}\n[size=12sp][color=#E65100]{warning}[/color][/size]" if warning else name,
+            markup=True,
+            font_style="H6",
+            theme_text_color="Primary",
+            size_hint_x=0.4
+        )
+        
+        minus_button = MDIconButton(icon="minus", size_hint_x=0.1)
+        minus_button.bind(on_release=lambda x: self.change_quantity(product_id, -1))
+        qty_label = MDLabel(
+            text=f"{quantity:g} {unit}",
+            font_style="Body1",
+            theme_text_color="Secondary",
+            halign="center",
+            size_hint_x=0.2
+        )
+        plus_button = MDIconButton(icon="plus", size_hint_x=0.1)
+        plus_button.bind(on_release=lambda x: self.change_quantity(product_id, 1))
+        
+        price_label = MDLabel(
+            text=f"₹{amount:.2f}",
+            font_style="Body1",
+            theme_text_color="Primary",
+            size_hint_x=0.2,
+            halign="right"
+        )
+        
+        layout.add_widget(name_label)
+        layout.add_widget(minus_button)
+        layout.add_widget(qty_label)
+        layout.add_widget(plus_button)
+        layout.add_widget(price_label)
+        
+        card.add_widget(layout)
+        return card
     
+    def change_quantity(self, product_id, delta):
+        """+/- taps change the in-memory cart at once; the summary is re-read when they stop"""
+        buyer_phone = self.app.store.get("session")["phone"]
+        quantity = self.app.cart.quantity_of(buyer_phone, product_id)
+        self.app.cart.set_quantity(buyer_phone, product_id, quantity + delta)
+        self.show_cart_items(self.app.cart.items(buyer_phone))
+        if self._summary_event is not None:
+            self._summary_event.cancel()
+        self._summary_event = Clock.schedule_once(lambda dt: self.load_cart_items(), self.SUMMARY_DEBOUNCE)
+
     def go_back(self):
         self.app.go_back_to_dashboard()
+
+    def go_to_checkout(self):
+        self.app.root.current = "checkout"
     
     def clear_cart(self):
         if not self.app.store.exists("session"):
@@ -204,7 +449,11 @@ class CartScreen(Screen):
             return
         
         buyer_phone = self.app.store.get("session")["phone"]
-        success = self.app.db_manager.clear_cart(buyer_phone)
+        self.app.db_executor.submit(self.app.cart.clear, buyer_phone, owner=self,
+                                    on_result=self.on_cart_cleared,
+                                    on_error=lambda error: self.on_cart_cleared(False))
+
+    def on_cart_cleared(self, success):
         if success:
             show_snackbar("Cart cleared")
             self.load_cart_items()
@@ -215,6 +464,102 @@ class CheckoutScreen(Screen):
     def __init__(self, app=None, **kwargs):
         super().__init__(**kwargs)
         self.app = app
-    
+        # True while a checkout runs on a query worker
+        self.placing_order = False
+
+    def on_enter(self):
+        self.load_summary()
+
+    def on_leave(self):
+        # A checkout in flight cannot be undone, so its outcome must still arrive
+        if not self.placing_order:
+            self.app.db_executor.cancel(self)
+
+    def load_summary(self):
+        """Show the cart total and how many sellers it will be split between"""
+        if not self.app.store.exists("session"):
+            show_snackbar("Please login first")
+            return
+
+        buyer_phone = self.app.store.get("session")["phone"]
+        self.ids.place_order_button.disabled = True
+        if not self.placing_order:
+            self.app.db_executor.cancel(self)
+        self.app.db_executor.submit(self.app.cart.summary, buyer_phone, owner=self,
+                                    on_result=self.show_summary,
+                                    on_error=lambda error: self.show_summary(None))
+
+    def show_summary(self, summary):
+        if summary is None:
+            self.ids.summary_label.text = "Could not load your cart"
+            return
+        if not summary.lines:
+            self.ids.summary_label.text = "Your cart is empty"
+            return
+
+        text = f"{len(summary.lines)} items from {len(summary.sellers)} sellers\nTotal: ₹{summary.total:.2f}"
+        if summary.price_changes:
+            text += "\n⚠️ Prices changed for: " + ", ".join(line.product_name for line in summary.price_changes)
+        if summary.shortages:
+            text += "\n❌ Not enough stock for: " + ", ".join(line.product_name for line in summary.shortages)
+        self.ids.summary_label.text = text
+        self.ids.place_order_button.disabled = not summary.can_checkout or self.placing_order
+
+    def place_order(self):
+        """Turn the cart into orders, one set per seller, off the UI thread"""
+        if self.placing_order:
+            return
+        if not self.app.store.exists("session"):
+            show_snackbar("Please login first")
+            return
+
+        buyer_phone = self.app.store.get("session")["phone"]
+        address = self.ids.address_field.text.strip()
+        if not address:
+            show_snackbar("Please enter a delivery address")
+            return
+
+        self.placing_order = True
+        self.ids.place_order_button.disabled = True
+        self.app.db_executor.submit(self.submit_order, buyer_phone, address, self.ids.payment_field.text.strip(),
+                                    owner=self,
+                                    on_result=self.on_order_placed,
+                                    on_error=self.on_order_error,
+                                    on_slow=self.show_placing)
+
+    def submit_order(self, buyer_phone, address, payment_method):
+        """Save pending cart taps, then check out; runs on a query worker"""
+        # Checkout reads the cart table, so pending taps must be saved first
+        if not self.app.cart.flush(buyer_phone):
+            raise CheckoutError("Could not save your cart, please try again")
+        placed = self.app.db_manager.create_order(buyer_phone, address, payment_method)
+        self.app.cart.forget(buyer_phone)
+        return placed
+
+    def show_placing(self):
+        """Shown only when checkout waits long enough to notice, e.g. on the write lock"""
+        self.ids.place_order_button.text = "Placing order..."
+
+    def finish_placing(self):
+        self.placing_order = False
+        self.ids.place_order_button.text = "Place Order"
+
+    def on_order_placed(self, placed):
+        self.finish_placing()
+        count = sum(len(numbers) for numbers in placed.values())
+        show_snackbar(f"✅ {count} orders placed with {len(placed)} sellers!")
+        self.ids.address_field.text = ""
+        if self.app.root.current == self.name:
+            self.app.root.current = "orders"
+
+    def on_order_error(self, error):
+        self.finish_placing()
+        if isinstance(error, CheckoutError):
+            show_snackbar(f"❌ {error}")
+        else:
+            print(f"Error placing order: {error}")
+            show_snackbar("❌ Could not place order, please try again")
+        self.load_summary()
+
     def go_to_cart(self):
         self.app.root.current = "cart"
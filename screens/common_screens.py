@@ -1,6 +1,11 @@
 # screens/common_screens.py - Common Screens (FIXED)
+from datetime import datetime, timedelta, timezone
+
 from kivy.uix.screenmanager import Screen
+from kivy.clock import Clock
 from kivy.lang import Builder
+from kivy.properties import ColorProperty, StringProperty
+from kivymd.uix.card import MDCard
 from kivymd.uix.list import ThreeLineListItem
 
 Builder.load_string("""
@@ -217,6 +222,23 @@ Builder.load_string("""
                                     font_style: "Caption"
                                     theme_text_color: "Secondary"
 
+                            MDBoxLayout:
+                                orientation: "vertical"
+                                size_hint_x: 0.5
+                                MDLabel:
+                                    id: gmv_value
+                                    text: "₹0"
+                                    halign: "center"
+                                    font_style: "H5"
+                                    bold: True
+                                    theme_text_color: "Primary"
+                                MDLabel:
+                                    id: gmv_caption
+                                    text: "Total Value"
+                                    halign: "center"
+                                    font_style: "Caption"
+                                    theme_text_color: "Secondary"
+
                 MDRaisedButton:
                     id: edit_button
                     text: "✏️ Edit Profile"
@@ -225,6 +247,33 @@ Builder.load_string("""
                     on_release: root.edit_profile()
                     pos_hint: {"center_x": 0.5}
 
+<MarketPriceRow>:
+    size_hint_y: None
+    height: "70dp"
+    elevation: 2
+    radius: [8]
+    padding: "12dp"
+    MDBoxLayout:
+        orientation: "horizontal"
+        spacing: "10dp"
+        MDLabel:
+            text: root.name
+            font_style: "Subtitle1"
+            bold: True
+            size_hint_x: 0.4
+        MDLabel:
+            text: root.price_text
+            font_style: "Subtitle1"
+            halign: "right"
+            size_hint_x: 0.3
+        MDLabel:
+            text: root.change_text
+            font_style: "Caption"
+            halign: "right"
+            theme_text_color: "Custom"
+            text_color: root.change_color
+            size_hint_x: 0.3
+
 <MarketPricesScreen>:
     MDBoxLayout:
         orientation: "vertical"
@@ -232,32 +281,43 @@ Builder.load_string("""
             title: "💰 Live Market Prices"
             left_action_items: [["arrow-left", lambda x: root.go_back()]]
             right_action_items: [["refresh", lambda x: root.refresh_prices()]]
-        MDScrollView:
-            MDBoxLayout:
-                orientation: "vertical"
-                spacing: "10dp"
-                padding: "15dp"
-                size_hint_y: None
-                height: self.minimum_height
-
-                MDCard:
-                    size_hint_y: None
-                    height: "80dp"
-                    elevation: 3
-                    padding: "15dp"
-                    radius: [10]
-                    MDLabel:
-                        text: "📊 Current Market Prices\\n\\nReal-time agricultural commodity prices"
-                        halign: "center"
-                        font_style: "H6"
-                        theme_text_color: "Primary"
+        MDBoxLayout:
+            orientation: "vertical"
+            spacing: "10dp"
+            padding: "15dp"
 
-                MDBoxLayout:
-                    orientation: "vertical"
-                    spacing: "8dp"
-                    size_hint_y: None
-                    height: "600dp"
-                    id: prices_container
+            MDCard:
+                size_hint_y: None
+                height: "80dp"
+                elevation: 3
+                padding: "15dp"
+                radius: [10]
+                MDLabel:
+                    text: "📊 Current Market Prices\\n\\nReal-time agricultural commodity prices"
+                    halign: "center"
+                    font_style: "H6"
+                    theme_text_color: "Primary"
+
+            MDFloatLayout:
+                RecycleView:
+                    id: prices_rv
+                    viewclass: "MarketPriceRow"
+                    pos_hint: {"x": 0, "y": 0}
+                    RecycleBoxLayout:
+                        orientation: "vertical"
+                        spacing: dp(8)
+                        default_size: None, dp(70)
+                        default_size_hint: 1, None
+                        size_hint_y: None
+                        height: self.minimum_height
+                MDLabel:
+                    id: status_label
+                    text: ""
+                    halign: "center"
+                    font_style: "Subtitle1"
+                    theme_text_color: "Secondary"
+                    pos_hint: {"center_x": 0.5, "center_y": 0.5}
+                    opacity: 1 if self.text else 0
 
 <OrdersScreen>:
     MDBoxLayout:
@@ -265,7 +325,22 @@ Builder.load_string("""
         MDTopAppBar:
             title: "📋 Orders"
             left_action_items: [["arrow-left", lambda x: root.go_back()]]
+        MDBoxLayout:
+            orientation: "horizontal"
+            size_hint_y: None
+            height: "48dp"
+            padding: "10dp", 0
+            spacing: "10dp"
+            MDFlatButton:
+                id: status_filter_button
+                text: "Status: All"
+                on_release: root.cycle_status_filter()
+            MDFlatButton:
+                id: period_filter_button
+                text: "All time"
+                on_release: root.cycle_period_filter()
         MDScrollView:
+            on_scroll_y: root.on_orders_scroll(self.scroll_y)
             MDBoxLayout:
                 orientation: "vertical"
                 spacing: "10dp"
@@ -294,9 +369,9 @@ class SchemesScreen(Screen):
             
             for scheme in schemes:
                 item = ThreeLineListItem(
-                    text=f"🏛️ {scheme[1]}",
-                    secondary_text=scheme[2][:80] + "..." if len(scheme[2]) > 80 else scheme[2],
-                    tertiary_text=f"Benefits: {scheme[3]} | Contact: {scheme[8]}",
+                    text=f"🏛️ {scheme.name}",
+                    secondary_text=scheme.description[:80] + "..." if len(scheme.description) > 80 else scheme.description,
+                    tertiary_text=f"Benefits: {scheme.benefits} | Contact: {scheme.contact_info}",
                 )
                 schemes_list.add_widget(item)
         except Exception as e:
@@ -311,6 +386,9 @@ class ProfileScreen(Screen):
     def on_enter(self):
         self.load_profile()
 
+    def on_leave(self):
+        self.app.db_executor.cancel(self)
+
     def load_profile(self):
         """Load and display user profile information"""
         if not self.app.store.exists("session"):
@@ -321,39 +399,56 @@ class ProfileScreen(Screen):
         phone = session["phone"]
         role = session["role"]
 
-        # Get user details from database
-        try:
-            # Get user info
-            conn = self.app.db_manager.get_connection()
-            c = conn.cursor()
-            c.execute("SELECT name, email, location FROM users WHERE phone = ?", (phone,))
-            user_data = c.fetchone()
-            conn.close()
-
-            if user_data:
-                name, email, location = user_data
-                if self.edit_mode:
-                    # In edit mode, populate text fields
-                    self.ids.profile_name_input.text = name or ""
-                    self.ids.profile_email_input.text = email or ""
-                    self.ids.profile_location_input.text = location or ""
-                else:
-                    # In view mode, show labels
-                    self.ids.profile_name.text = name or "Unknown"
-                    self.ids.profile_role.text = f"🌾 {role.title()}" if role == "seller" else f"🛒 {role.title()}"
-                    self.ids.profile_phone.text = phone
-                    self.ids.profile_name_value.text = name or "Unknown"
-                    self.ids.profile_email.text = self.mask_email(email) if email else "Not provided"
-                    self.ids.profile_location.text = location or "Not specified"
+        self.app.db_executor.cancel(self)
+        self.app.db_executor.submit(self.fetch_profile, phone, role, owner=self,
+                                    on_result=lambda profile: self.show_profile(phone, role, *profile),
+                                    on_error=self.show_load_error,
+                                    on_slow=self.show_loading)
+
+    def fetch_profile(self, phone, role):
+        """User details plus the counters kept in user_stats; runs on a query worker"""
+        db_manager = self.app.db_manager
+        with db_manager.connection() as conn:
+            user_data = conn.execute("SELECT name, email, location FROM users WHERE phone = ?",
+                                     (phone,)).fetchone()
+        return user_data, db_manager.get_user_stats(phone, role)
+
+    def show_loading(self):
+        if not self.edit_mode:
+            self.ids.profile_name.text = "Loading profile..."
+
+    def show_load_error(self, error):
+        print(f"Error loading profile: {error}")
+        self.ids.profile_name.text = "Error loading profile"
+        self.ids.products_count.text = "0"
+        self.ids.orders_count.text = "0"
+        self.ids.gmv_value.text = "₹0"
+
+    def show_profile(self, phone, role, user_data, stats):
+        """Render what fetch_profile returned"""
+        if user_data:
+            name, email, location = user_data
+            if self.edit_mode:
+                # In edit mode, populate text fields
+                self.ids.profile_name_input.text = name or ""
+                self.ids.profile_email_input.text = email or ""
+                self.ids.profile_location_input.text = location or ""
             else:
-                self.ids.profile_name.text = "User not found"
-
-            # Load statistics
-            self.load_statistics(phone, role)
+                # In view mode, show labels
+                self.ids.profile_name.text = name or "Unknown"
+                self.ids.profile_role.text = f"🌾 {role.title()}" if role == "seller" else f"🛒 {role.title()}"
+                self.ids.profile_phone.text = phone
+                self.ids.profile_name_value.text = name or "Unknown"
+                self.ids.profile_email.text = self.mask_email(email) if email else "Not provided"
+                self.ids.profile_location.text = location or "Not specified"
+        else:
+            self.ids.profile_name.text = "User not found"
 
-        except Exception as e:
-            print(f"Error loading profile: {e}")
-            self.ids.profile_name.text = "Error loading profile"
+        # Statistics - buyers have no product listings
+        self.ids.products_count.text = str(stats.products) if role == "seller" else "N/A"
+        self.ids.orders_count.text = str(stats.orders)
+        self.ids.gmv_value.text = f"₹{stats.gmv:,.0f}"
+        self.ids.gmv_caption.text = "Total Sales" if role == "seller" else "Total Spent"
 
     def mask_email(self, email):
         """Mask email to show only first few characters"""
@@ -364,34 +459,6 @@ class ProfileScreen(Screen):
             return f"{username}@{domain}"
         return f"{username[:3]}***@{domain}"
 
-    def load_statistics(self, phone, role):
-        """Load user statistics"""
-        print(f"DEBUG: Loading statistics for {role} - phone: {phone}")
-        try:
-            if role == "seller":
-                # Count products
-                products = self.app.db_manager.get_user_products(phone)
-                print(f"DEBUG: Found {len(products)} products for seller")
-                self.ids.products_count.text = str(len(products))
-
-                # Count orders (seller orders)
-                orders = self.app.db_manager.get_user_orders(phone, role)
-                print(f"DEBUG: Found {len(orders)} orders for seller")
-                self.ids.orders_count.text = str(len(orders))
-            else:
-                # For buyers, show different stats
-                self.ids.products_count.text = "N/A"
-                orders = self.app.db_manager.get_user_orders(phone, role)
-                print(f"DEBUG: Found {len(orders)} orders for buyer")
-                self.ids.orders_count.text = str(len(orders))
-
-        except Exception as e:
-            print(f"ERROR: Error loading statistics: {e}")
-            import traceback
-            traceback.print_exc()
-            self.ids.products_count.text = "0"
-            self.ids.orders_count.text = "0"
-
     def edit_profile(self):
         """Toggle edit mode for profile"""
         if not self.edit_mode:
@@ -452,113 +519,128 @@ class ProfileScreen(Screen):
     def go_back(self):
         self.app.go_back_to_dashboard()
 
+class MarketPriceRow(MDCard):
+    """Recycled commodity row - every field comes from a prices_rv.data entry"""
+    name = StringProperty("")
+    price_text = StringProperty("")
+    change_text = StringProperty("")
+    change_color = ColorProperty((0, 0.8, 0, 1))
+
 class MarketPricesScreen(Screen):
+    UP_COLOR = (0, 0.8, 0, 1)
+    DOWN_COLOR = (0.8, 0, 0, 1)
+
     def __init__(self, app=None, **kwargs):
         super().__init__(**kwargs)
         self.app = app
+        # Snapshot version currently in prices_rv; -1 means nothing rendered yet
+        self.rendered_version = -1
 
     def go_back(self):
         self.app.go_back_to_dashboard()
 
     def on_enter(self):
-        self.refresh_prices()
+        self.show_prices()
+
+    def show_prices(self):
+        """Render the cached price snapshot, refreshing it in the background if stale"""
+        snapshot = self.app.db_manager.price_snapshot
+        if snapshot.version != self.rendered_version and snapshot.snapshot is not None:
+            self.render(snapshot.snapshot, snapshot.version)
+        if snapshot.stale:
+            if snapshot.snapshot is None:
+                self.ids.status_label.text = "Loading market prices..."
+            snapshot.refresh_async(self.on_snapshot_ready, self.on_snapshot_error)
 
     def refresh_prices(self):
-        """Load and display current market prices"""
-        try:
-            # Clear existing prices
-            prices_container = self.ids.prices_container
-            prices_container.clear_widgets()
-
-            # Sample market data - in real app, this would come from API
-            market_data = {
-                "Tomatoes": {"price": 25.50, "change": "+2.5%", "trend": "up"},
-                "Onions": {"price": 32.00, "change": "-1.2%", "trend": "down"},
-                "Wheat": {"price": 22.80, "change": "+0.8%", "trend": "up"},
-                "Rice": {"price": 48.90, "change": "+1.5%", "trend": "up"},
-                "Potatoes": {"price": 18.75, "change": "-0.5%", "trend": "down"},
-                "Apples": {"price": 85.00, "change": "+3.2%", "trend": "up"},
-                "Bananas": {"price": 38.50, "change": "+1.8%", "trend": "up"},
-                "Sugarcane": {"price": 295.00, "change": "+0.3%", "trend": "up"},
-                "Cotton": {"price": 4250.00, "change": "-2.1%", "trend": "down"},
-                "Soybean": {"price": 42.30, "change": "+1.1%", "trend": "up"}
-            }
-
-            for commodity, data in market_data.items():
-                # Create price card programmatically
-                from kivymd.uix.card import MDCard
-                from kivymd.uix.boxlayout import MDBoxLayout
-                from kivymd.uix.label import MDLabel
-
-                card = MDCard(
-                    size_hint_y=None,
-                    height="70dp",
-                    elevation=2,
-                    radius=[8],
-                    padding="12dp"
-                )
-
-                box = MDBoxLayout(
-                    orientation="horizontal",
-                    spacing="10dp"
-                )
-
-                # Commodity name
-                name_label = MDLabel(
-                    text=commodity,
-                    font_style="Subtitle1",
-                    bold=True,
-                    size_hint_x=0.4
-                )
-
-                # Price
-                price_label = MDLabel(
-                    text=f"₹{data['price']:.2f}/kg",
-                    font_style="Subtitle1",
-                    halign="right",
-                    size_hint_x=0.3
-                )
-
-                # Change percentage
-                change_label = MDLabel(
-                    text=data['change'],
-                    font_style="Caption",
-                    halign="right",
-                    theme_text_color="Custom",
-                    text_color=(0, 0.8, 0, 1) if data['trend'] == "up" else (0.8, 0, 0, 1),
-                    size_hint_x=0.3
-                )
-
-                box.add_widget(name_label)
-                box.add_widget(price_label)
-                box.add_widget(change_label)
-                card.add_widget(box)
-
-                prices_container.add_widget(card)
+        """Toolbar refresh: rebuild the snapshot even if nothing was recorded in-app"""
+        self.app.db_manager.price_snapshot.invalidate()
+        self.show_prices()
+
+    def on_snapshot_ready(self, trends, version):
+        """Called on the refresh thread - hand the rows to the UI thread"""
+        Clock.schedule_once(lambda dt: self.render(trends, version))
+
+    def on_snapshot_error(self, error):
+        """Called on the refresh thread when the rebuild failed"""
+        Clock.schedule_once(lambda dt: self.show_load_error())
+
+    def show_load_error(self):
+        """Keep prices already shown; otherwise replace the loading message"""
+        if self.ids.prices_rv.data:
+            from kivymd.uix.snackbar import Snackbar
+            Snackbar(text="Could not refresh market prices").open()
+        else:
+            self.ids.status_label.text = "Could not load market prices.\n\nTap refresh to try again."
 
-        except Exception as e:
-            print(f"Error loading market prices: {e}")
-            # Fallback message
-            from kivymd.uix.label import MDLabel
-            error_label = MDLabel(
-                text="Unable to load market prices. Please try again.",
-                halign="center",
-                font_style="Subtitle1"
-            )
-            self.ids.prices_container.add_widget(error_label)
+    def render(self, trends, version):
+        """Replace the recycled rows with one per commodity"""
+        if version == self.rendered_version:
+            # Nothing newer than what is shown, but a loading message must not linger
+            self.ids.status_label.text = "" if self.ids.prices_rv.data else "No market prices recorded yet."
+            return
+        self.rendered_version = version
+        self.ids.prices_rv.data = [self.price_row(trend) for trend in trends or []]
+        self.ids.status_label.text = "" if trends else "No market prices recorded yet."
+
+    def price_row(self, trend):
+        """Data dict for one MarketPriceRow"""
+        change = trend.change_percent
+        return {
+            "name": trend.product_name,
+            "price_text": f"₹{trend.close:.2f}/kg",
+            "change_text": f"{change:+.1f}%",
+            "change_color": self.UP_COLOR if change >= 0 else self.DOWN_COLOR,
+        }
 
 class OrdersScreen(Screen):
+    PAGE_SIZE = 20
+    # Fetch the next page once the list is scrolled this close to the bottom
+    LOAD_MORE_THRESHOLD = 0.1
+    STATUS_FILTERS = [None, "pending", "confirmed", "shipped", "delivered", "cancelled"]
+    # (button text, days back from today; None for no lower bound)
+    PERIODS = [("All time", None), ("Last 7 days", 7), ("Last 30 days", 30), ("Last 90 days", 90)]
+
     def __init__(self, app=None, **kwargs):
         super().__init__(**kwargs)
         self.app = app
+        self.status_index = 0
+        self.period_index = 0
+        self.next_cursor = None
+        self.loading_page = False
 
     def on_enter(self):
         self.load_orders()
 
+    def on_leave(self):
+        self.app.db_executor.cancel(self)
+        self.loading_page = False
+
+    def cycle_status_filter(self):
+        self.status_index = (self.status_index + 1) % len(self.STATUS_FILTERS)
+        status = self.STATUS_FILTERS[self.status_index]
+        self.ids.status_filter_button.text = f"Status: {status.title() if status else 'All'}"
+        self.load_orders()
+
+    def cycle_period_filter(self):
+        self.period_index = (self.period_index + 1) % len(self.PERIODS)
+        self.ids.period_filter_button.text = self.PERIODS[self.period_index][0]
+        self.load_orders()
+
+    def fetch_page(self, cursor=None):
+        """One page of orders under the current filters; runs on a query worker"""
+        session = self.app.store.get("session")
+        days = self.PERIODS[self.period_index][1]
+        since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+        return self.app.db_manager.get_orders_page(session["phone"], session["role"], self.PAGE_SIZE, cursor,
+                                                   self.STATUS_FILTERS[self.status_index], since)
+
     def load_orders(self):
-        """Load and display user orders"""
+        """Load and display the first page of the user's orders"""
         container = self.ids.orders_container
         container.clear_widgets()
+        self.next_cursor = None
+        self.loading_page = False
 
         if not self.app.store.exists("session"):
             from kivymd.uix.label import MDLabel
@@ -571,38 +653,81 @@ class OrdersScreen(Screen):
             container.add_widget(no_session_label)
             return
 
-        session = self.app.store.get("session")
-        phone = session["phone"]
-        role = session["role"]
+        role = self.app.store.get("session")["role"]
+        self.app.db_executor.cancel(self)
+        self.app.db_executor.submit(self.fetch_page, owner=self,
+                                    on_result=lambda page: self.show_orders(page, role),
+                                    on_error=self.show_load_error,
+                                    on_slow=self.show_loading)
 
-        try:
-            orders = self.app.db_manager.get_user_orders(phone, role)
+    def on_orders_scroll(self, scroll_y):
+        if scroll_y <= self.LOAD_MORE_THRESHOLD:
+            self.load_next_page()
 
-            if not orders:
-                from kivymd.uix.label import MDLabel
-                no_orders_label = MDLabel(
-                    text="No orders found.\\n\\nYour order history will appear here once you place orders.",
-                    halign="center",
-                    font_style="Subtitle1",
-                    theme_text_color="Secondary"
-                )
-                container.add_widget(no_orders_label)
-                return
+    def load_next_page(self):
+        """Append the next page of orders after the last one shown"""
+        if not self.next_cursor or self.loading_page:
+            return
+
+        self.loading_page = True
+        role = self.app.store.get("session")["role"]
+        self.app.db_executor.submit(self.fetch_page, self.next_cursor, owner=self,
+                                    on_result=lambda page: self.show_next_page(page, role),
+                                    on_error=self.on_next_page_error)
+
+    def show_next_page(self, page, role):
+        orders, self.next_cursor = page
+        self.loading_page = False
+        self.add_order_cards(orders, role)
+
+    def on_next_page_error(self, error):
+        self.loading_page = False
+        print(f"Error loading more orders: {error}")
+
+    def show_loading(self):
+        from kivymd.uix.label import MDLabel
+        container = self.ids.orders_container
+        container.clear_widgets()
+        container.add_widget(MDLabel(
+            text="Loading orders...",
+            halign="center",
+            font_style="Subtitle1",
+            theme_text_color="Secondary"
+        ))
+
+    def show_orders(self, page, role):
+        """Render the first page fetched by load_orders"""
+        orders, self.next_cursor = page
+        container = self.ids.orders_container
+        container.clear_widgets()
+
+        if not orders:
+            from kivymd.uix.label import MDLabel
+            filtered = self.status_index or self.period_index
+            no_orders_label = MDLabel(
+                text="No orders match these filters." if filtered else
+                     "No orders found.\n\nYour order history will appear here once you place orders.",
+                halign="center",
+                font_style="Subtitle1",
+                theme_text_color="Secondary"
+            )
+            container.add_widget(no_orders_label)
+            return
+
+        self.add_order_cards(orders, role)
 
+    def add_order_cards(self, orders, role):
+        """Append one card per order to the list"""
+        container = self.ids.orders_container
+        try:
             from kivymd.uix.card import MDCard
             from kivymd.uix.boxlayout import MDBoxLayout
             from kivymd.uix.label import MDLabel
 
             for order in orders:
-                # Unpack order data based on role
-                if role == "seller":
-                    order_id, order_number, buyer_phone, seller_phone, product_id, quantity, unit_price, total_amount, status, delivery_address, payment_method, notes, created_at, delivered_at, product_name, buyer_name = order
-                    other_party = buyer_name
-                    other_party_label = "Buyer"
-                else:
-                    order_id, order_number, buyer_phone, seller_phone, product_id, quantity, unit_price, total_amount, status, delivery_address, payment_method, notes, created_at, delivered_at, product_name, seller_name = order
-                    other_party = seller_name
-                    other_party_label = "Seller"
+                # counterparty_name is the buyer for sellers and the seller for buyers
+                other_party = order.counterparty_name
+                other_party_label = "Buyer" if role == "seller" else "Seller"
 
                 card = MDCard(
                     size_hint_y=None,
@@ -617,17 +742,17 @@ class OrdersScreen(Screen):
                 # Order number and status
                 header_layout = MDBoxLayout(orientation="horizontal", size_hint_y=None, height="30dp")
                 order_label = MDLabel(
-                    text=f"Order #{order_number}",
+                    text=f"Order #{order.order_number}",
                     font_style="H6",
                     theme_text_color="Primary",
                     size_hint_x=0.6
                 )
 
                 status_label = MDLabel(
-                    text=status.title(),
+                    text=order.status.title(),
                     font_style="Body2",
                     theme_text_color="Custom",
-                    text_color=self.get_status_color(status),
+                    text_color=self.get_status_color(order.status),
                     halign="right",
                     size_hint_x=0.4
                 )
@@ -638,14 +763,14 @@ class OrdersScreen(Screen):
                 # Product and quantity
                 product_layout = MDBoxLayout(orientation="horizontal", size_hint_y=None, height="30dp")
                 product_name_label = MDLabel(
-                    text=f"{product_name}",
+                    text=f"{order.product_name}",
                     font_style="Subtitle1",
                     theme_text_color="Secondary",
                     size_hint_x=0.6
                 )
 
                 quantity_label = MDLabel(
-                    text=f"Qty: {quantity}",
+                    text=f"Qty: {order.quantity}",
                     font_style="Body2",
                     theme_text_color="Secondary",
                     halign="right",
@@ -658,14 +783,14 @@ class OrdersScreen(Screen):
                 # Amount and date
                 details_layout = MDBoxLayout(orientation="horizontal", size_hint_y=None, height="30dp")
                 amount_label = MDLabel(
-                    text=f"₹{total_amount:.2f}",
+                    text=f"₹{order.total_amount:.2f}",
                     font_style="H6",
                     theme_text_color="Primary",
                     size_hint_x=0.5
                 )
 
                 date_label = MDLabel(
-                    text=created_at.split(' ')[0],  # Show only date
+                    text=order.created_at.split(' ')[0],  # Show only date
                     font_style="Body2",
                     theme_text_color="Secondary",
                     halign="right",
@@ -693,15 +818,20 @@ class OrdersScreen(Screen):
                 container.add_widget(card)
 
         except Exception as e:
-            print(f"Error loading orders: {e}")
-            from kivymd.uix.label import MDLabel
-            error_label = MDLabel(
-                text="Error loading orders. Please try again.",
-                halign="center",
-                font_style="Subtitle1",
-                theme_text_color="Error"
-            )
-            container.add_widget(error_label)
+            self.show_load_error(e)
+
+    def show_load_error(self, error):
+        print(f"Error loading orders: {error}")
+        from kivymd.uix.label import MDLabel
+        container = self.ids.orders_container
+        container.clear_widgets()
+        error_label = MDLabel(
+            text="Error loading orders. Please try again.",
+            halign="center",
+            font_style="Subtitle1",
+            theme_text_color="Error"
+        )
+        container.add_widget(error_label)
 
     def get_status_color(self, status):
         """Get color for order status"""
@@ -2,6 +2,7 @@
 from kivy.uix.screenmanager import Screen
 from kivy.lang import Builder
 from kivy.metrics import dp
+from kivy.properties import ObjectProperty, StringProperty
 from kivymd.uix.snackbar import Snackbar
 from kivymd.uix.button import MDRaisedButton
 from kivymd.uix.label import MDLabel
@@ -19,206 +20,244 @@ def show_snackbar(message):
         print(f"Message: {message}")
 
 Builder.load_string("""
+<MarketplaceProductCard>:
+    size_hint_y: None
+    height: "180dp"
+    elevation: 5
+    radius: [10]
+    padding: "15dp"
+
+    MDBoxLayout:
+        orientation: "vertical"
+        spacing: "5dp"
+
+        MDBoxLayout:
+            orientation: "horizontal"
+            size_hint_y: None
+            height: "30dp"
+            MDLabel:
+                text: root.name
+                font_style: "H6"
+                theme_text_color: "Primary"
+                size_hint_x: 0.7
+            MDLabel:
+                text: root.category
+                font_style: "Caption"
+                theme_text_color: "Secondary"
+                halign: "right"
+                size_hint_x: 0.3
+
+        MDLabel:
+            text: root.variety_text
+            font_style: "Body2"
+            theme_text_color: "Secondary"
+            size_hint_y: None
+            height: "20dp" if root.variety_text else 0
+            opacity: 1 if root.variety_text else 0
+
+        MDBoxLayout:
+            orientation: "horizontal"
+            size_hint_y: None
+            height: "30dp"
+            MDLabel:
+                text: root.price_text
+                font_style: "H6"
+                theme_text_color: "Primary"
+                size_hint_x: 0.5
+            MDLabel:
+                text: root.quantity_text
+                font_style: "Body2"
+                theme_text_color: "Secondary"
+                halign: "right"
+                size_hint_x: 0.5
+
+        MDLabel:
+            text: root.description_text
+            font_style: "Body2"
+            theme_text_color: "Secondary"
+            size_hint_y: None
+            height: "30dp" if root.description_text else 0
+            opacity: 1 if root.description_text else 0
+
+        MDBoxLayout:
+            orientation: "horizontal"
+            size_hint_y: None
+            height: "40dp"
+            spacing: "10dp"
+            MDRaisedButton:
+                text: "Add to Cart"
+                size_hint_x: 0.6
+                on_release: root.screen.add_to_cart(root.product)
+            MDRaisedButton:
+                text: "Contact Seller"
+                size_hint_x: 0.4
+                md_bg_color: [0.2, 0.7, 0.2, 1]  # Green
+                on_release: root.screen.contact_seller(root.product)
+
 <MarketplaceScreen>:
     MDBoxLayout:
         orientation: "vertical"
 
         MDTopAppBar:
+            id: toolbar
             title: "🛒 Marketplace"
             left_action_items: [["arrow-left", lambda x: root.go_back()]]
             right_action_items: [["cart", lambda x: root.go_to_cart()]]
 
-        MDScrollView:
-            MDBoxLayout:
-                orientation: "vertical"
-                spacing: "10dp"
-                padding: "15dp"
-                size_hint_y: None
-                height: self.minimum_height
-                id: products_container
+        MDFloatLayout:
+            # Only the rows on screen (plus a small buffer) are ever instantiated;
+            # scrolling rebinds those cards to new entries of products_rv.data
+            RecycleView:
+                id: products_rv
+                viewclass: "MarketplaceProductCard"
+                on_scroll_y: root.on_products_scroll(self.scroll_y)
+                RecycleBoxLayout:
+                    orientation: "vertical"
+                    spacing: "10dp"
+                    padding: "15dp"
+                    default_size: None, dp(180)
+                    default_size_hint: 1, None
+                    size_hint_y: None
+                    height: self.minimum_height
+
+            MDLabel:
+                id: empty_label
+                text: ""
+                halign: "center"
+                font_style: "Subtitle1"
+                theme_text_color: "Secondary"
+                opacity: 1 if self.text else 0
 """)
 
+class MarketplaceProductCard(MDCard):
+    """Recycled product row - every field comes from a products_rv.data entry"""
+    screen = ObjectProperty(None, allownone=True)
+    product = ObjectProperty(None, allownone=True)
+    name = StringProperty("")
+    category = StringProperty("")
+    variety_text = StringProperty("")
+    price_text = StringProperty("")
+    quantity_text = StringProperty("")
+    description_text = StringProperty("")
+
 class MarketplaceScreen(Screen):
+    PAGE_SIZE = 20
+    # Fetch the next page once the user is within this fraction of the bottom
+    LOAD_MORE_THRESHOLD = 0.1
+
     def __init__(self, app=None, **kwargs):
         super().__init__(**kwargs)
         self.app = app
+        self.next_cursor = None
+        self.loading_page = False
+        # Set by the buyer dashboard search; empty means browse everything
+        self.search_query = ""
 
     def on_enter(self):
         """Load products when entering the screen"""
         self.load_products()
 
+    def on_leave(self):
+        """Drop results of queries still running for this screen and save cart taps"""
+        self.app.db_executor.cancel(self)
+        self.loading_page = False
+        self.app.db_executor.submit(self.app.cart.flush)
+
     def load_products(self):
-        """Load all available products from all sellers"""
-        container = self.ids.products_container
-        container.clear_widgets()
+        """Load the first page of available products from all sellers"""
+        products_rv = self.ids.products_rv
+        products_rv.data = []
+        self.ids.empty_label.text = ""
+        self.next_cursor = None
 
         if not self.app.store.exists("session"):
             show_snackbar("Please login first")
             return
 
-        try:
-            # Get all active products
-            products = self.app.db_manager.get_all_products()
-
-            if not products:
-                # No products available
-                no_products_card = MDCard(
-                    size_hint_y=None,
-                    height="200dp",
-                    elevation=5,
-                    radius=[10],
-                    padding="20dp"
-                )
-
-                no_products_layout = MDBoxLayout(
-                    orientation="vertical",
-                    spacing="10dp"
-                )
-
-                no_products_label = MDLabel(
-                    text="No products available at the moment.\\n\\nCheck back later!",
-                    halign="center",
-                    font_style="Subtitle1",
-                    theme_text_color="Secondary"
-                )
-
-                no_products_layout.add_widget(no_products_label)
-                no_products_card.add_widget(no_products_layout)
-                container.add_widget(no_products_card)
-                return
-
-            # Display products
-            for product in products:
-                product_card = self.create_product_card(product)
-                container.add_widget(product_card)
-
-        except Exception as e:
-            show_snackbar("Error loading products")
-            print(f"Error loading products: {e}")
-
-    def create_product_card(self, product):
-        """Create a card for each product"""
-        # Unpack product data
-        product_id, seller_phone, name, category, variety, unit, price, quantity, description, image_path, status, created_at, updated_at = product
-
-        card = MDCard(
-            size_hint_y=None,
-            height="180dp",
-            elevation=5,
-            radius=[10],
-            padding="15dp"
-        )
-
-        layout = MDBoxLayout(
-            orientation="vertical",
-            spacing="5dp"
-        )
-
-        # Product name and category
-        title_layout = MDBoxLayout(
-            orientation="horizontal",
-            size_hint_y=None,
-            height="30dp"
-        )
-
-        product_name = MDLabel(
-            text=f"{name}",
-            font_style="H6",
-            theme_text_color="Primary",
-            size_hint_x=0.7
-        )
-
-        category_label = MDLabel(
-            text=f"{category}",
-            font_style="Caption",
-            theme_text_color="Secondary",
-            halign="right",
-            size_hint_x=0.3
-        )
-
-        title_layout.add_widget(product_name)
-        title_layout.add_widget(category_label)
-
-        # Variety if available
-        variety_text = f" ({variety})" if variety else ""
-        variety_label = MDLabel(
-            text=f"Variety:{variety_text}",
-            font_style="Body2",
-            theme_text_color="Secondary",
-            size_hint_y=None,
-            height="20dp"
-        )
+        self.ids.toolbar.title = f"🔍 {self.search_query}" if self.search_query else "🛒 Marketplace"
+
+        # First page only - the rest is fetched as the user scrolls
+        self.app.db_executor.cancel(self)
+        self.loading_page = True
+        self.app.db_executor.submit(self.fetch_page, None, owner=self,
+                                    on_result=self.show_first_page,
+                                    on_error=self.on_load_error,
+                                    on_slow=self.show_loading)
+
+    def show_loading(self):
+        """Shown only when the first page takes long enough to notice"""
+        if not self.ids.products_rv.data:
+            self.ids.empty_label.text = "Loading products..."
+
+    def show_first_page(self, page):
+        products, self.next_cursor = page
+        self.loading_page = False
+        self.ids.empty_label.text = ""
+        self.ids.products_rv.scroll_y = 1
+
+        if not products:
+            if self.search_query:
+                self.ids.empty_label.text = f"No products match '{self.search_query}'."
+            else:
+                self.ids.empty_label.text = "No products available at the moment.\n\nCheck back later!"
+            return
 
-        # Price and quantity
-        price_layout = MDBoxLayout(
-            orientation="horizontal",
-            size_hint_y=None,
-            height="30dp"
-        )
+        # Display products
+        self.add_product_rows(products)
 
-        price_label = MDLabel(
-            text=f"₹{price:.2f} per {unit}",
-            font_style="H6",
-            theme_text_color="Primary",
-            size_hint_x=0.5
-        )
+    def on_load_error(self, error):
+        self.loading_page = False
+        self.ids.empty_label.text = ""
+        show_snackbar("Error loading products")
 
-        quantity_label = MDLabel(
-            text=f"Available: {quantity} {unit}",
-            font_style="Body2",
-            theme_text_color="Secondary",
-            halign="right",
-            size_hint_x=0.5
-        )
+    def fetch_page(self, cursor):
+        """Next page of search results or of the full catalogue"""
+        if self.search_query:
+            return self.app.db_manager.search_products_page(self.search_query, self.PAGE_SIZE, cursor)
+        return self.app.db_manager.get_products_page(self.PAGE_SIZE, cursor)
 
-        price_layout.add_widget(price_label)
-        price_layout.add_widget(quantity_label)
+    def add_product_rows(self, products):
+        """Append products to the recycled list as plain data rows"""
+        self.ids.products_rv.data.extend(self.product_row(product) for product in products)
 
-        # Description (truncated)
+    def product_row(self, product):
+        """Data dict for one MarketplaceProductCard"""
+        description = product.description
         desc_text = description[:50] + "..." if description and len(description) > 50 else description or ""
-        description_label = MDLabel(
-            text=desc_text,
-            font_style="Body2",
-            theme_text_color="Secondary",
-            size_hint_y=None,
-            height="30dp"
-        )
-
-        # Add to cart button
-        button_layout = MDBoxLayout(
-            orientation="horizontal",
-            size_hint_y=None,
-            height="40dp",
-            spacing="10dp"
-        )
-
-        add_to_cart_btn = MDRaisedButton(
-            text="Add to Cart",
-            size_hint_x=0.6,
-            on_release=lambda x, p=product: self.add_to_cart(p)
-        )
-
-        contact_btn = MDRaisedButton(
-            text="Contact Seller",
-            size_hint_x=0.4,
-            md_bg_color=[0.2, 0.7, 0.2, 1],  # Green
-            on_release=lambda x, p=product: self.contact_seller(p)
-        )
+        return {
+            "screen": self,
+            "product": product,
+            "name": f"{product.name}",
+            "category": f"{product.category}",
+            "variety_text": f"Variety: ({product.variety})" if product.variety else "",
+            "price_text": f"₹{product.price:.2f} per {product.unit}",
+            "quantity_text": f"Available: {product.stock_qty} {product.unit}",
+            "description_text": desc_text,
+        }
+
+    def on_products_scroll(self, scroll_y):
+        """Fetch the next page when the list is scrolled near the bottom"""
+        if scroll_y <= self.LOAD_MORE_THRESHOLD:
+            self.load_next_page()
+
+    def load_next_page(self):
+        """Append the next page of products after the last one shown"""
+        if not self.next_cursor or self.loading_page:
+            return
 
-        button_layout.add_widget(add_to_cart_btn)
-        button_layout.add_widget(contact_btn)
+        self.loading_page = True
+        self.app.db_executor.submit(self.fetch_page, self.next_cursor, owner=self,
+                                    on_result=self.show_next_page,
+                                    on_error=self.on_next_page_error)
 
-        # Add all elements to layout
-        layout.add_widget(title_layout)
-        if variety:
-            layout.add_widget(variety_label)
-        layout.add_widget(price_layout)
-        if desc_text:
-            layout.add_widget(description_label)
-        layout.add_widget(button_layout)
+    def show_next_page(self, page):
+        products, self.next_cursor = page
+        self.loading_page = False
+        self.add_product_rows(products)
 
-        card.add_widget(layout)
-        return card
+    def on_next_page_error(self, error):
+        self.loading_page = False
+        show_snackbar("Error loading more products")
 
     def add_to_cart(self, product):
         """Add product to cart"""
@@ -227,20 +266,22 @@ class MarketplaceScreen(Screen):
             return
 
         buyer_phone = self.app.store.get("session")["phone"]
-        product_id = product[0]
-        product_name = product[2]
 
-        # Add to cart with quantity 1 (can be modified later)
-        success = self.app.db_manager.add_to_cart(buyer_phone, product_id, 1)
+        # Add to cart with quantity 1 (can be modified later); saved in the background
+        if self.app.cart.is_loaded(buyer_phone):
+            self.show_added(product, self.app.cart.add(buyer_phone, product, 1))
+            return
+        # The first add reads the saved cart, so it runs on a query worker
+        self.app.db_executor.submit(self.app.cart.add, buyer_phone, product, 1,
+                                    on_result=lambda quantity: self.show_added(product, quantity),
+                                    on_error=lambda error: show_snackbar("Could not add to cart"))
 
-        if success:
-            show_snackbar(f"✅ Added {product_name} to cart!")
-        else:
-            show_snackbar("❌ Failed to add to cart")
+    def show_added(self, product, quantity):
+        show_snackbar(f"✅ Added {product.name} to cart! ({quantity:g} {product.unit})")
 
     def contact_seller(self, product):
         """Contact seller functionality"""
-        seller_phone = product[1]
+        seller_phone = product.seller_phone
         seller_info = self.get_seller_info(seller_phone)
 
         # Instead of snackbar, show a popup with detailed contact information
@@ -320,48 +361,9 @@ class MarketplaceScreen(Screen):
         )
         dialog.open()
 
-    def get_seller_name(self, seller_phone):
-        """Get seller name from phone number"""
-        try:
-            conn = self.app.db_manager.get_connection()
-            c = conn.cursor()
-            c.execute("SELECT name FROM users WHERE phone = ?", (seller_phone,))
-            result = c.fetchone()
-            conn.close()
-            return result[0] if result else "Seller"
-        except Exception as e:
-            print(f"Error getting seller name: {e}")
-            return "Seller"
-
     def get_seller_info(self, seller_phone):
-        """Get detailed seller information"""
-        try:
-            conn = self.app.db_manager.get_connection()
-            c = conn.cursor()
-            c.execute("SELECT name, email, location FROM users WHERE phone = ?", (seller_phone,))
-            result = c.fetchone()
-            conn.close()
-
-            if result:
-                name, email, location = result
-                return {
-                    'name': name or "Unknown Seller",
-                    'email': email,
-                    'location': location
-                }
-            else:
-                return {
-                    'name': "Unknown Seller",
-                    'email': None,
-                    'location': None
-                }
-        except Exception as e:
-            print(f"Error getting seller info: {e}")
-            return {
-                'name': "Unknown Seller",
-                'email': None,
-                'location': None
-            }
+        """Get detailed seller information (cached by the DatabaseManager)"""
+        return self.app.db_manager.get_seller_profile(seller_phone)
 
     def go_back(self):
         """Go back to buyer dashboard"""
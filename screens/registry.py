@@ -0,0 +1,72 @@
+# screens/registry.py - Screens declared by name and import path, imported on first use
+import importlib
+import time
+
+# name: "module:ClassName". Importing a module also parses its KV rules,
+# so nothing here is imported until a screen from that module is needed.
+SCREENS = {
+    "login": "screens.auth_screens:LoginScreen",
+    "register": "screens.auth_screens:RegisterScreen",
+    "seller_dashboard": "screens.seller_screens:SellerDashboard",
+    "buyer_dashboard": "screens.buyer_screens:BuyerDashboard",
+    "marketplace": "screens.marketplace_screens:MarketplaceScreen",
+    "product_list": "screens.seller_screens:ProductListScreen",
+    "add_product": "screens.seller_screens:AddProductScreen",
+    "bulk_update": "screens.seller_screens:BulkUpdateScreen",
+    "cart": "screens.buyer_screens:CartScreen",
+    "checkout": "screens.buyer_screens:CheckoutScreen",
+    "schemes": "screens.common_screens:SchemesScreen",
+    "profile": "screens.common_screens:ProfileScreen",
+    "market_prices": "screens.common_screens:MarketPricesScreen",
+    "orders": "screens.common_screens:OrdersScreen",
+    "address": "screens.address_screens:AddressScreen",
+    "payment_method": "screens.address_screens:PaymentMethodScreen",
+}
+
+# Where users usually go next from a screen, most likely first; these are
+# built during idle frames so the navigation itself does not stall.
+LIKELY_NEXT = {
+    "login": ["buyer_dashboard", "seller_dashboard", "register"],
+    "register": ["buyer_dashboard", "seller_dashboard"],
+    "buyer_dashboard": ["marketplace", "cart", "orders", "profile"],
+    "seller_dashboard": ["product_list", "add_product", "orders", "market_prices"],
+    "marketplace": ["cart"],
+    "cart": ["checkout"],
+    "checkout": ["orders"],
+    "product_list": ["add_product", "bulk_update"],
+}
+
+
+class ScreenRegistry:
+    """Resolves screen names to classes, importing each module once on demand"""
+
+    def __init__(self, screens=None, likely_next=None):
+        self.screens = dict(SCREENS if screens is None else screens)
+        self.likely_next = dict(LIKELY_NEXT if likely_next is None else likely_next)
+        self._classes = {}
+        # name -> seconds spent importing (and KV-parsing) on first use
+        self.load_times = {}
+
+    def __contains__(self, name):
+        return name in self.screens
+
+    def names(self):
+        return list(self.screens)
+
+    def is_loaded(self, name):
+        return name in self._classes
+
+    def screen_class(self, name):
+        """Class registered under name; imports its module the first time"""
+        cls = self._classes.get(name)
+        if cls is None:
+            module_name, class_name = self.screens[name].split(":")
+            started = time.perf_counter()
+            cls = getattr(importlib.import_module(module_name), class_name)
+            self.load_times[name] = time.perf_counter() - started
+            self._classes[name] = cls
+        return cls
+
+    def preload_candidates(self, current, loaded=()):
+        """Screens likely to follow current that have not been built yet"""
+        return [name for name in self.likely_next.get(current, []) if name in self.screens and name not in loaded]
@@ -1,33 +1,63 @@
 # screens/screen_manager.py - Screen Manager and Navigation
+from kivy.clock import Clock
 from kivy.uix.screenmanager import ScreenManager, NoTransition
 
-from screens.auth_screens import LoginScreen, RegisterScreen
-from screens.seller_screens import SellerDashboard, ProductListScreen, AddProductScreen, BulkUpdateScreen
-from screens.buyer_screens import BuyerDashboard, CartScreen, CheckoutScreen
-from screens.marketplace_screens import MarketplaceScreen
-from screens.common_screens import SchemesScreen, ProfileScreen, MarketPricesScreen, OrdersScreen
-from screens.address_screens import AddressScreen, PaymentMethodScreen
-
-def create_screen_manager(app):
-    """Create and configure screen manager with all screens"""
-    sm = ScreenManager(transition=NoTransition())
-
-    # Add all screens
-    sm.add_widget(LoginScreen(name="login", app=app))
-    sm.add_widget(RegisterScreen(name="register", app=app))
-    sm.add_widget(SellerDashboard(name="seller_dashboard", app=app))
-    sm.add_widget(BuyerDashboard(name="buyer_dashboard", app=app))
-    sm.add_widget(MarketplaceScreen(name="marketplace", app=app))
-    sm.add_widget(ProductListScreen(name="product_list", app=app))
-    sm.add_widget(AddProductScreen(name="add_product", app=app))
-    sm.add_widget(BulkUpdateScreen(name="bulk_update", app=app))
-    sm.add_widget(CartScreen(name="cart", app=app))
-    sm.add_widget(CheckoutScreen(name="checkout", app=app))
-    sm.add_widget(SchemesScreen(name="schemes", app=app))
-    sm.add_widget(ProfileScreen(name="profile", app=app))
-    sm.add_widget(MarketPricesScreen(name="market_prices", app=app))
-    sm.add_widget(OrdersScreen(name="orders", app=app))
-    sm.add_widget(AddressScreen(name="address", app=app))
-    sm.add_widget(PaymentMethodScreen(name="payment_method", app=app))
-
-    return sm
\ No newline at end of file
+from screens.registry import ScreenRegistry
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds each registered screen on first navigation
+
+    Existing `root.current = "name"` and `get_screen("name")` calls work
+    unchanged. After each navigation the screens the user is likely to open
+    next are built one per frame, once the app has been idle PRELOAD_DELAY.
+    """
+
+    PRELOAD_DELAY = 1.0
+
+    def __init__(self, app=None, registry=None, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.registry = registry or ScreenRegistry()
+        self._preload_queue = []
+        self._preload_event = None
+        self.bind(current=self.schedule_preload)
+
+    def get_screen(self, name):
+        if name in self.registry and name not in self.screen_names:
+            self.load_screen(name)
+        return super().get_screen(name)
+
+    def load_screen(self, name):
+        """Import, build and add the screen registered as name"""
+        screen = self.registry.screen_class(name)(name=name, app=self.app)
+        self.add_widget(screen)
+        return screen
+
+    def schedule_preload(self, *args):
+        if self._preload_event is not None:
+            self._preload_event.cancel()
+        self._preload_queue = self.registry.preload_candidates(self.current, self.screen_names)
+        if self._preload_queue:
+            self._preload_event = Clock.schedule_once(self._preload_next, self.PRELOAD_DELAY)
+
+    def _preload_next(self, dt):
+        """Build one queued screen, then yield the frame before the next"""
+        self._preload_event = None
+        while self._preload_queue:
+            name = self._preload_queue.pop(0)
+            if name not in self.screen_names:
+                try:
+                    self.load_screen(name)
+                except Exception as e:
+                    print(f"Error preloading screen {name}: {e}")
+                break
+        if self._preload_queue:
+            self._preload_event = Clock.schedule_once(self._preload_next, 0)
+
+
+def create_screen_manager(app, registry=None):
+    """Create the screen manager; only the login screen is built up front"""
+    sm = LazyScreenManager(app=app, registry=registry, transition=NoTransition())
+    sm.current = "login"
+    return sm
@@ -1,10 +1,16 @@
 # screens/seller_screens.py - KivyMD 1.2.0 Compatible
+import bisect
+
 from kivy.uix.screenmanager import Screen
 from kivy.lang import Builder
 from kivy.metrics import dp
+from kivy.properties import BooleanProperty, NumericProperty, ObjectProperty, StringProperty
+from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.snackbar import Snackbar
 from kivymd.uix.menu import MDDropdownMenu
 
+from database.bulk import BulkChange, BulkUpdateError
+
 def show_snackbar(message):
     """Helper function for KivyMD 1.2.0 compatibility"""
     try:
@@ -181,16 +187,128 @@ Builder.load_string("""
                     height: "50dp"
                     on_release: root.add_product()
 
+<BulkEditRow>:
+    orientation: "horizontal"
+    spacing: "6dp"
+    padding: "8dp", 0
+    md_bg_color: (1, 0.93, 0.93, 1) if root.invalid else (0.93, 1, 0.93, 1) if root.changed else (1, 1, 1, 1)
+    MDBoxLayout:
+        orientation: "vertical"
+        size_hint_x: 0.4
+        MDLabel:
+            text: root.name_text
+            shorten: True
+            font_style: "Subtitle2"
+        MDLabel:
+            text: root.was_text
+            shorten: True
+            font_style: "Caption"
+            theme_text_color: "Error" if root.invalid else "Secondary"
+    MDTextField:
+        text: root.price_text
+        hint_text: "₹ / " + root.unit
+        input_filter: "float"
+        multiline: False
+        size_hint_x: 0.2
+        on_focus: if not self.focus: root.commit("price", self.text)
+    MDTextField:
+        text: root.stock_text
+        hint_text: "Stock"
+        input_filter: "float"
+        multiline: False
+        size_hint_x: 0.2
+        on_focus: if not self.focus: root.commit("stock_qty", self.text)
+    MDFlatButton:
+        text: root.status.title()
+        size_hint_x: 0.2
+        on_release: root.commit("status", "inactive" if root.status == "active" else "active")
+
 <BulkUpdateScreen>:
     MDBoxLayout:
         orientation: "vertical"
         MDTopAppBar:
             title: "📊 Bulk Update"
             left_action_items: [["arrow-left", lambda x: root.go_back()]]
-        MDLabel:
-            text: "Bulk update functionality coming soon!\\n\\nUpdate multiple products at once."
-            halign: "center"
-            font_style: "Subtitle1"
+            right_action_items: [["refresh", lambda x: root.load_products()]]
+        MDBoxLayout:
+            orientation: "horizontal"
+            size_hint_y: None
+            height: "64dp"
+            padding: "10dp", 0
+            spacing: "10dp"
+            MDTextField:
+                id: name_filter
+                hint_text: "Name contains"
+                multiline: False
+                on_text_validate: root.load_products()
+            MDFlatButton:
+                id: category_filter_button
+                text: "Category: All"
+                on_release: root.cycle_category_filter()
+            MDFlatButton:
+                id: stock_filter_button
+                text: "All stock"
+                on_release: root.cycle_stock_filter()
+        MDBoxLayout:
+            orientation: "horizontal"
+            size_hint_y: None
+            height: "64dp"
+            padding: "10dp", 0
+            spacing: "10dp"
+            MDTextField:
+                id: price_change
+                hint_text: "Price: +10%, -5, =40"
+                multiline: False
+            MDTextField:
+                id: stock_change
+                hint_text: "Stock: +50, -20, =0"
+                multiline: False
+            MDFlatButton:
+                id: status_change_button
+                text: "Status: keep"
+                on_release: root.cycle_status_change()
+        MDBoxLayout:
+            orientation: "horizontal"
+            size_hint_y: None
+            height: "56dp"
+            padding: "10dp", 0
+            spacing: "10dp"
+            MDRaisedButton:
+                text: "👁️ Preview"
+                on_release: root.preview_change()
+            MDRaisedButton:
+                id: apply_button
+                text: "✅ Apply"
+                disabled: True
+                on_release: root.apply_changes()
+            MDLabel:
+                id: summary_label
+                text: ""
+                font_style: "Caption"
+                theme_text_color: "Secondary"
+
+        MDFloatLayout:
+            # Thousands of SKUs, but only the rows on screen exist as widgets;
+            # every edit is written back to bulk_rv.data, never kept in a row
+            RecycleView:
+                id: bulk_rv
+                viewclass: "BulkEditRow"
+                pos_hint: {"x": 0, "y": 0}
+                RecycleBoxLayout:
+                    orientation: "vertical"
+                    spacing: dp(2)
+                    default_size: None, dp(60)
+                    default_size_hint: 1, None
+                    size_hint_y: None
+                    height: self.minimum_height
+            MDLabel:
+                id: empty_label
+                text: ""
+                halign: "center"
+                font_style: "Subtitle1"
+                theme_text_color: "Secondary"
+                pos_hint: {"center_x": 0.5, "center_y": 0.5}
+                opacity: 1 if self.text else 0
 """)
 
 class SellerDashboard(Screen):
@@ -226,49 +344,93 @@ class ProductListScreen(Screen):
     def __init__(self, app=None, **kwargs):
         super().__init__(**kwargs)
         self.app = app
+        # Keyed model of what is on screen: product id -> (Product, card)
+        self.products = {}
+        # (created_at, id) of every shown product, ascending, to place new cards
+        self.product_order = []
+        # Highest updated_at seen; the next refresh only asks for newer rows
+        self.watermark = None
+        self.model_phone = None
+        self.empty_label = None
 
     def on_enter(self):
         self.load_products()
 
     def load_products(self):
-        """Load and display user's products"""
-        print("DEBUG: load_products called")
+        """Refresh the list, patching only the cards whose products changed"""
         if not self.app.store.exists("session"):
             show_snackbar("Please login first")
-            print("DEBUG: No session found")
             return
 
         phone = self.app.store.get("session")["phone"]
-        role = self.app.store.get("session")["role"]
-        print(f"DEBUG: Loading products for {role} - phone: {phone}")
-
-        products = self.app.db_manager.get_user_products(phone)
-        print(f"DEBUG: Found {len(products)} products")
-
-        # Clear existing products
+        if phone != self.model_phone:
+            self.reset_model(phone)
+
+        db_manager = self.app.db_manager
+        changed = db_manager.get_user_products_changed(phone, self.watermark)
+        removed = set()
+        if self.products:
+            current_ids = db_manager.get_user_product_ids(phone)
+            if current_ids is not None:
+                removed = set(self.products) - current_ids
+        self.apply_changes(changed, removed)
+
+    def reset_model(self, phone):
+        """Forget every card, e.g. when a different seller logs in"""
         self.ids.products_container.clear_widgets()
-
-        if not products:
-            # Show empty state
+        self.products = {}
+        self.product_order = []
+        self.watermark = None
+        self.model_phone = phone
+        self.empty_label = None
+
+    def apply_changes(self, changed, removed):
+        """Remove, patch or insert cards for the given products"""
+        container = self.ids.products_container
+        for product_id in removed:
+            product, card = self.products.pop(product_id)
+            self.product_order.remove((product.created_at, product.id))
+            container.remove_widget(card)
+
+        for product in changed:
+            if product.updated_at and (self.watermark is None or product.updated_at > self.watermark):
+                self.watermark = product.updated_at
+            shown = self.products.get(product.id)
+            if shown is not None and shown[0] == product:
+                continue  # Re-read from the watermark second, nothing changed
+            card = self.build_product_card(product)
+            if shown is not None:
+                index = container.children.index(shown[1])
+                container.remove_widget(shown[1])
+            else:
+                # Newest first: children[0] is the bottom card, so the index is
+                # the number of older products already shown
+                key = (product.created_at, product.id)
+                index = bisect.bisect_left(self.product_order, key)
+                self.product_order.insert(index, key)
+            container.add_widget(card, index=index)
+            self.products[product.id] = (product, card)
+
+        self.show_empty_state(not self.products)
+
+    def show_empty_state(self, empty):
+        """Toggle the "no products" message"""
+        container = self.ids.products_container
+        if empty and self.empty_label is None:
             from kivymd.uix.label import MDLabel
-            empty_label = MDLabel(
-                text="No products found.\\n\\nAdd products to see them here.",
+            self.empty_label = MDLabel(
+                text="No products found.\n\nAdd products to see them here.",
                 halign="center",
                 font_style="Subtitle1",
                 theme_text_color="Secondary"
             )
-            self.ids.products_container.add_widget(empty_label)
-            print("DEBUG: Showing empty state")
-            return
+            container.add_widget(self.empty_label)
+        elif not empty and self.empty_label is not None:
+            container.remove_widget(self.empty_label)
+            self.empty_label = None
 
-        # Display products
-        for i, product in enumerate(products):
-            print(f"DEBUG: Adding product {i+1}: {product[2]}")
-            self.add_product_card(product)
-        print("DEBUG: Finished loading products")
-
-    def add_product_card(self, product):
-        """Add a product card to the container"""
+    def build_product_card(self, product):
+        """Card widget for one product"""
         from kivymd.uix.card import MDCard
         from kivymd.uix.boxlayout import MDBoxLayout
         from kivymd.uix.label import MDLabel
@@ -297,14 +459,14 @@ class ProductListScreen(Screen):
         )
 
         name_label = MDLabel(
-            text=f"{product[2]}",  # name
+            text=f"{product.name}",
             font_style="H6",
             bold=True,
             size_hint_x=0.7
         )
 
         category_label = MDLabel(
-            text=f"{product[3]}",  # category
+            text=f"{product.category}",
             font_style="Caption",
             halign="right",
             theme_text_color="Secondary",
@@ -324,7 +486,7 @@ class ProductListScreen(Screen):
 
         # Price
         price_label = MDLabel(
-            text=f"₹{product[6]:.2f}/{product[5]}",  # price/unit
+            text=f"₹{product.price:.2f}/{product.unit}",
             font_style="Subtitle1",
             theme_text_color="Primary",
             size_hint_x=0.3
@@ -332,14 +494,14 @@ class ProductListScreen(Screen):
 
         # Stock
         stock_label = MDLabel(
-            text=f"Stock: {product[7]} {product[5]}",  # stock_qty unit
+            text=f"Stock: {product.stock_qty} {product.unit}",
             font_style="Body2",
             size_hint_x=0.4
         )
 
         # Status
         status_label = MDLabel(
-            text=f"Status: {product[10] or 'Active'}",  # status
+            text=f"Status: {product.status or 'Active'}",
             font_style="Body2",
             halign="right",
             size_hint_x=0.3
@@ -350,9 +512,9 @@ class ProductListScreen(Screen):
         details_layout.add_widget(status_label)
 
         # Description (if exists)
-        if product[8]:  # description
+        if product.description:
             desc_label = MDLabel(
-                text=product[8][:100] + "..." if len(product[8]) > 100 else product[8],
+                text=product.description[:100] + "..." if len(product.description) > 100 else product.description,
                 font_style="Body2",
                 theme_text_color="Secondary",
                 size_hint_y=None,
@@ -390,7 +552,7 @@ class ProductListScreen(Screen):
         main_layout.add_widget(buttons_layout)
 
         card.add_widget(main_layout)
-        self.ids.products_container.add_widget(card)
+        return card
 
     def edit_product(self, product):
         """Navigate to edit product screen (placeholder)"""
@@ -405,7 +567,7 @@ class ProductListScreen(Screen):
             try:
                 # Note: Need to add delete_product method to db_manager
                 # For now, just show message
-                show_snackbar(f"Delete functionality for {product[2]} coming soon!")
+                show_snackbar(f"Delete functionality for {product.name} coming soon!")
                 dialog.dismiss()
             except Exception as e:
                 show_snackbar("Error deleting product")
@@ -415,7 +577,7 @@ class ProductListScreen(Screen):
 
         dialog = MDDialog(
             title="Delete Product",
-            text=f"Are you sure you want to delete '{product[2]}'?",
+            text=f"Are you sure you want to delete '{product.name}'?",
             buttons=[
                 MDFlatButton(text="Cancel", on_release=cancel_callback),
                 MDFlatButton(text="Delete", on_release=delete_callback)
@@ -549,10 +711,244 @@ class AddProductScreen(Screen):
         except Exception as e:
             show_snackbar("Error adding product")
 
+class BulkEditRow(MDBoxLayout):
+    """Recycled grid row - every field comes from a bulk_rv.data entry, edits go back to the screen"""
+    screen = ObjectProperty(None, allownone=True)
+    product_id = NumericProperty(0)
+    name_text = StringProperty("")
+    was_text = StringProperty("")
+    unit = StringProperty("")
+    price = NumericProperty(0)
+    price_text = StringProperty("")
+    stock_qty = NumericProperty(0)
+    stock_text = StringProperty("")
+    status = StringProperty("active")
+    changed = BooleanProperty(False)
+    invalid = BooleanProperty(False)
+
+    def commit(self, field, text):
+        if self.screen is not None:
+            self.screen.edit_row(self.product_id, field, text)
+
 class BulkUpdateScreen(Screen):
+    CATEGORIES = [None, "Vegetables", "Fruits", "Grains", "Pulses", "Spices", "Dairy", "Other"]
+    # (button text, max_stock filter)
+    STOCK_FILTERS = [("All stock", None), ("Out of stock", 0), ("Stock ≤ 10", 10)]
+    STATUS_CHANGES = [None, "active", "inactive"]
+
     def __init__(self, app=None, **kwargs):
         super().__init__(**kwargs)
         self.app = app
-    
+        self.category_index = 0
+        self.stock_index = 0
+        self.status_index = 0
+        # What the grid shows: the BulkPreview, and the change and filters behind it
+        self.preview = None
+        self.change = None
+        self.preview_filters = None
+        # Product id -> index in bulk_rv.data
+        self.row_index = {}
+        # True once a grid cell was edited by hand after the last preview
+        self.hand_edited = False
+
+    def on_enter(self):
+        self.load_products()
+
+    def on_leave(self):
+        """Drop results of queries still running for this screen"""
+        self.app.db_executor.cancel(self)
+
     def go_back(self):
         self.app.go_back_to_dashboard()
+
+    def cycle_category_filter(self):
+        self.category_index = (self.category_index + 1) % len(self.CATEGORIES)
+        category = self.CATEGORIES[self.category_index]
+        self.ids.category_filter_button.text = f"Category: {category or 'All'}"
+        self.load_products()
+
+    def cycle_stock_filter(self):
+        self.stock_index = (self.stock_index + 1) % len(self.STOCK_FILTERS)
+        self.ids.stock_filter_button.text = self.STOCK_FILTERS[self.stock_index][0]
+        self.load_products()
+
+    def cycle_status_change(self):
+        self.status_index = (self.status_index + 1) % len(self.STATUS_CHANGES)
+        status = self.STATUS_CHANGES[self.status_index]
+        self.ids.status_change_button.text = f"Status: {status or 'keep'}"
+
+    def filters(self):
+        """preview_bulk_update() filter arguments from the filter bar"""
+        name_contains = self.ids.name_filter.text.strip() or None
+        return (None, self.CATEGORIES[self.category_index], None, name_contains,
+                self.STOCK_FILTERS[self.stock_index][1])
+
+    @staticmethod
+    def parse_change(text):
+        """("percent" | "delta" | "set" | None, value) from input like +10%, -5 or =40"""
+        text = text.replace(" ", "")
+        if not text:
+            return None, None
+        if text.endswith("%"):
+            return "percent", float(text[:-1])
+        if text[0] in "+-":
+            return "delta", float(text)
+        return "set", float(text.lstrip("="))
+
+    def read_change(self):
+        """BulkChange from the change bar; raises ValueError on unreadable input"""
+        price_kind, price_value = self.parse_change(self.ids.price_change.text)
+        stock_kind, stock_value = self.parse_change(self.ids.stock_change.text)
+        if stock_kind == "percent":
+            raise BulkUpdateError("Stock changes are amounts, not percentages")
+        return BulkChange(price_percent=price_value if price_kind == "percent" else None,
+                          price_delta=price_value if price_kind == "delta" else None,
+                          price=price_value if price_kind == "set" else None,
+                          stock_delta=stock_value if stock_kind == "delta" else None,
+                          stock_qty=stock_value if stock_kind == "set" else None,
+                          status=self.STATUS_CHANGES[self.status_index])
+
+    def load_products(self):
+        """Fill the grid with the filtered products as they are now"""
+        self.run_preview(BulkChange())
+
+    def preview_change(self):
+        """Dry run of the change bar over the filtered products - nothing is written"""
+        try:
+            change = self.read_change()
+        except BulkUpdateError as e:
+            show_snackbar(str(e))
+            return
+        except ValueError:
+            show_snackbar("Enter changes like +10%, -5 or =40")
+            return
+        if change.is_empty:
+            show_snackbar("Enter a price, stock or status change")
+            return
+        self.run_preview(change)
+
+    def run_preview(self, change):
+        if not self.app.store.exists("session"):
+            show_snackbar("Please login first")
+            return
+        phone = self.app.store.get("session")["phone"]
+        filters = self.filters()
+        self.ids.apply_button.disabled = True
+        self.app.db_executor.cancel(self)
+        self.app.db_executor.submit("preview_bulk_update", phone, change, *filters, owner=self,
+                                    on_result=lambda preview: self.show_preview(preview, change, filters),
+                                    on_error=lambda error: show_snackbar("Error loading products"),
+                                    on_slow=self.show_loading)
+
+    def show_loading(self):
+        """Shown only when the preview takes long enough to notice"""
+        if not self.ids.bulk_rv.data:
+            self.ids.empty_label.text = "Loading products..."
+
+    def show_preview(self, preview, change, filters):
+        """Replace the grid with one editable row per previewed product"""
+        if preview is None:
+            show_snackbar("Error loading products")
+            return
+        self.preview, self.change, self.preview_filters = preview, change, filters
+        self.hand_edited = False
+        self.row_index = {row.id: index for index, row in enumerate(preview.rows)}
+        self.ids.bulk_rv.data = [self.grid_row(row) for row in preview.rows]
+        self.ids.empty_label.text = "" if preview.rows else "No products match these filters."
+        self.update_summary()
+
+    def grid_row(self, row):
+        """Data dict for one BulkEditRow, showing the row's new values"""
+        if row.changed:
+            was_text = f"was ₹{row.price:.2f} · {row.stock_qty:g} {row.unit} · {row.status}"
+        else:
+            was_text = row.category or ""
+        return {
+            "screen": self,
+            "product_id": row.id,
+            "name_text": row.name,
+            "was_text": was_text,
+            "unit": row.unit or "",
+            "price": row.new_price,
+            "price_text": f"{row.new_price:.2f}",
+            "stock_qty": row.new_stock_qty,
+            "stock_text": f"{row.new_stock_qty:g}",
+            "status": row.new_status,
+            "changed": row.changed,
+            "invalid": row.new_price <= 0,
+        }
+
+    def edit_row(self, product_id, field, text):
+        """A grid cell lost focus or a status was toggled: store the value in bulk_rv.data"""
+        index = self.row_index.get(product_id)
+        if index is None:
+            return
+        entry = self.ids.bulk_rv.data[index]
+        if field == "status":
+            value = text
+        else:
+            try:
+                value = float(text)
+            except ValueError:
+                value = -1
+            if value < 0 or (field == "price" and value == 0):
+                show_snackbar("Price must be above 0 and stock cannot be negative")
+                self.ids.bulk_rv.refresh_from_data()
+                return
+        if entry[field] == value:
+            return  # Focus left without a change, or the row was rebound while scrolling
+        entry[field] = value
+        entry["price_text"] = f"{entry['price']:.2f}"
+        entry["stock_text"] = f"{entry['stock_qty']:g}"
+        current = self.preview.rows[index]
+        entry["changed"] = (entry["price"], entry["stock_qty"], entry["status"]) != \
+            (current.price, current.stock_qty, current.status)
+        entry["invalid"] = entry["price"] <= 0
+        self.hand_edited = True
+        self.ids.bulk_rv.refresh_from_data()
+        self.update_summary()
+
+    def update_summary(self):
+        """Counts under the buttons; Apply is enabled only for a valid, non-empty change"""
+        data = self.ids.bulk_rv.data
+        changed = sum(1 for entry in data if entry["changed"])
+        invalid = sum(1 for entry in data if entry["invalid"])
+        text = f"{len(data)} products · {changed} to update"
+        if invalid:
+            text += f" · {invalid} would drop to ₹0 or below"
+        self.ids.summary_label.text = text
+        self.ids.apply_button.disabled = not changed or bool(invalid)
+
+    def apply_changes(self):
+        """Write the grid: the previewed change as one set-based UPDATE, or hand edits via executemany"""
+        if self.preview is None or not self.app.store.exists("session"):
+            return
+        phone = self.app.store.get("session")["phone"]
+        self.ids.apply_button.disabled = True
+        if self.hand_edited:
+            # Hand-typed cells are absolute values, so every changed row is written as shown
+            edits = [(entry["product_id"], entry["price"], entry["stock_qty"], entry["status"])
+                     for entry in self.ids.bulk_rv.data if entry["changed"]]
+            self.app.db_executor.submit("update_products", phone, edits, owner=self,
+                                        on_result=self.on_applied, on_error=self.on_apply_error)
+        else:
+            # Relative changes are applied to the stored values at write time, so
+            # stock sold since the preview is not overwritten
+            self.app.db_executor.submit("bulk_update_products", phone, self.change, *self.preview_filters,
+                                        owner=self, on_result=self.on_applied, on_error=self.on_apply_error)
+
+    def on_applied(self, updated):
+        if updated is None:
+            show_snackbar("Failed to update products")
+            self.update_summary()
+            return
+        show_snackbar(f"✅ Updated {updated} products")
+        self.ids.price_change.text = ""
+        self.ids.stock_change.text = ""
+        self.status_index = 0
+        self.ids.status_change_button.text = "Status: keep"
+        self.load_products()
+
+    def on_apply_error(self, error):
+        show_snackbar(str(error) if isinstance(error, BulkUpdateError) else "Failed to update products")
+        self.update_summary()
@@ -137,7 +137,7 @@ def test_database():
     if products:
         print(f"✅ Found {len(products)} products for Rajesh:")
         for product in products:
-            print(f"  - ID: {product[0]}, Name: {product[2]}, Price: ₹{product[6]}/{product[5]}, Stock: {product[7]}")
+            print(f"  - ID: {product.id}, Name: {product.name}, Price: ₹{product.price}/{product.unit}, Stock: {product.stock_qty}")
     else:
         print("❌ No products found for Rajesh")
 
@@ -147,7 +147,7 @@ def test_database():
     if available_products:
         print(f"✅ Found {len(available_products)} available products:")
         for product in available_products:
-            print(f"  - {product[2]} by {product[11]} - ₹{product[6]}/{product[5]}")
+            print(f"  - {product.name} by {product.seller_name} - ₹{product.price}/{product.unit}")
     else:
         print("❌ No available products found")
 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for seller bulk edits: set-based price/stock/status changes, dry runs and grid saves
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.bulk import BulkChange, BulkUpdateError
+from database.indexes import explain_query_plans, find_full_scans
+from fixtures import make_db
+
+SELLER = "9000000081"
+OTHER_SELLER = "9000000082"
+
+USERS = [("Seller", SELLER, "seller", "Mandi"), ("Other", OTHER_SELLER, "seller", "Kullu")]
+PRODUCTS = [(SELLER, "Tomatoes", "Vegetables", "", "kg", 20, 10),
+            (SELLER, "Onions", "Vegetables", "", "kg", 33.33, 0),
+            (SELLER, "Apples", "Fruits", "", "kg", 80, 5),
+            (SELLER, "100% Organic Peas", "Vegetables", "", "kg", 60, 40),
+            (OTHER_SELLER, "Tomatoes", "Vegetables", "", "kg", 20, 10)]
+
+def snapshot(db, phone=SELLER):
+    return {p.name: (p.price, p.stock_qty, p.status) for p in db.get_user_products(phone)}
+
+def test_dry_run_matches_apply():
+    print("\n=== Testing dry run and apply ===")
+    db = make_db("bulk.db", USERS, PRODUCTS)
+    before = snapshot(db)
+    change = BulkChange(price_percent=7.5, stock_delta=-8)
+    preview = db.bulk_update_products(SELLER, change, dry_run=True)
+    assert snapshot(db) == before and preview.can_apply
+    assert [row.name for row in preview.changed] == ["100% Organic Peas", "Apples", "Onions", "Tomatoes"]
+    onions = next(row for row in preview.rows if row.name == "Onions")
+    assert (onions.new_price, onions.new_stock_qty) == (35.83, 0)  # rounded to paise, stock clamped at 0
+    print("✅ Dry run computed new values and wrote nothing")
+
+    assert db.bulk_update_products(SELLER, change) == 4
+    assert snapshot(db) == {row.name: (row.new_price, row.new_stock_qty, row.new_status) for row in preview.rows}
+    assert snapshot(db, OTHER_SELLER) == {"Tomatoes": (20, 10, "active")}
+    print("✅ Applied values equal the preview; other sellers untouched")
+
+    assert db.bulk_update_products(SELLER, BulkChange(stock_delta=-100)) == 2  # Onions and Apples already at 0
+    db.close()
+
+def test_filters():
+    print("\n=== Testing filters ===")
+    db = make_db("bulk.db", USERS, PRODUCTS)
+    assert db.bulk_update_products(SELLER, BulkChange(status="inactive"), category="Fruits") == 1
+    assert snapshot(db)["Apples"][2] == "inactive"
+    assert db.bulk_update_products(SELLER, BulkChange(price_delta=5), name_contains="%") == 1
+    assert snapshot(db)["100% Organic Peas"][0] == 65  # % is matched literally, not as a wildcard
+    assert db.bulk_update_products(SELLER, BulkChange(stock_qty=50), max_stock=5) == 2
+    assert snapshot(db)["Onions"][1] == snapshot(db)["Apples"][1] == 50
+    ids = [p.id for p in db.get_user_products(OTHER_SELLER)] + [p.id for p in db.get_user_products(SELLER)][:1]
+    assert db.bulk_update_products(SELLER, BulkChange(price=99), product_ids=ids) == 1
+    print("✅ Category, literal name, low-stock and id filters; ids of other sellers ignored")
+
+    # Onions (status active, category Vegetables) is already at 50
+    assert db.bulk_update_products(SELLER, BulkChange(stock_qty=50), category="Vegetables", status="active") == 2
+    assert not db.preview_bulk_update(SELLER, BulkChange(price=10), name_contains="Mango").rows
+    db.close()
+
+def test_invalid_changes_write_nothing():
+    print("\n=== Testing rejected changes ===")
+    db = make_db("bulk.db", USERS, PRODUCTS)
+    before = snapshot(db)
+    preview = db.preview_bulk_update(SELLER, BulkChange(price_delta=-25))
+    assert [row.name for row in preview.invalid] == ["Tomatoes"] and not preview.can_apply
+    try:
+        db.bulk_update_products(SELLER, BulkChange(price_delta=-25))
+        assert False, "price below 0 accepted"
+    except BulkUpdateError as e:
+        assert [name for _, name, _ in e.invalid] == ["Tomatoes"]
+    assert snapshot(db) == before
+    print("✅ A price that would drop to 0 blocks the whole update")
+
+    for bad in (dict(price_percent=5, price=10), dict(stock_delta=1, stock_qty=1), dict(price=0),
+                dict(price_percent=-100), dict(stock_qty=-1), dict(status="deleted")):
+        try:
+            BulkChange(**bad)
+            assert False, f"{bad} accepted"
+        except BulkUpdateError:
+            pass
+    print("✅ Conflicting or out-of-range changes rejected up front")
+    db.close()
+
+def test_grid_edits():
+    print("\n=== Testing grid saves ===")
+    db = make_db("bulk.db", USERS, PRODUCTS)
+    ids = {p.name: p.id for p in db.get_user_products(SELLER)}
+    with db.connection() as conn:
+        conn.execute("UPDATE products SET updated_at = '2026-01-01 00:00:00'")
+        conn.commit()
+    db.invalidate_tables("products")
+
+    try:
+        db.update_products(SELLER, [(ids["Tomatoes"], 22, 10, "active"), (ids["Onions"], 30, -1, "active")])
+        assert False, "negative stock accepted"
+    except BulkUpdateError as e:
+        assert e.invalid == [(ids["Onions"], None, "stock_qty")]
+    assert snapshot(db)["Tomatoes"][0] == 20
+
+    other_id = db.get_user_products(OTHER_SELLER)[0].id
+    edits = [(ids["Tomatoes"], 22, 10, "active"),      # price only
+             (ids["Apples"], 80, 5, "active"),          # unchanged
+             (ids["Onions"], 33.33, 12, "inactive"),    # stock and status
+             (other_id, 1, 1, "inactive")]              # not this seller's
+    assert db.update_products(SELLER, edits) == 2
+    after = {p.name: p for p in db.get_user_products(SELLER)}
+    assert (after["Tomatoes"].price, after["Onions"].stock_qty, after["Onions"].status) == (22, 12, "inactive")
+    assert after["Apples"].updated_at == "2026-01-01 00:00:00" and after["Tomatoes"].updated_at > "2026-01-01"
+    assert snapshot(db, OTHER_SELLER) == {"Tomatoes": (20, 10, "active")}
+    changed = db.get_user_products_changed(SELLER, "2026-01-02 00:00:00")
+    assert sorted(p.name for p in changed) == ["Onions", "Tomatoes"]
+    print("✅ Only changed rows written; updated_at feeds the incremental product list")
+    db.close()
+
+def test_apply_is_one_statement():
+    print("\n=== Testing query shape ===")
+    db = make_db("bulk.db", USERS, PRODUCTS)
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        db.bulk_update_products(SELLER, BulkChange(price_percent=10, stock_delta=5), category="Vegetables")
+        conn.set_trace_callback(None)
+    # Row triggers re-report the statement that fired them, so count distinct texts
+    updates = {sql for sql in statements if sql.lstrip().startswith("UPDATE")}
+    assert len(updates) == 1 and len(set(statements)) == 4, statements  # BEGIN, price check, UPDATE, COMMIT
+    assert db.get_user_stats(SELLER, "seller").products == 4
+    print("✅ Bulk change ran as a single set-based UPDATE")
+    db.close()
+
+def test_preview_plans_use_seller_index():
+    print("\n=== Testing preview query plans ===")
+    db = make_db("bulk.db", USERS, PRODUCTS)
+    probes = [("preview_bulk_update", (SELLER, BulkChange(price_percent=10))),
+              ("preview_bulk_update", (SELLER, BulkChange(stock_delta=-5, status="inactive"), [1, 2, 3])),
+              ("preview_bulk_update", (SELLER, BulkChange(price=10), None, "Vegetables", "active", "Tom", 5))]
+    report = explain_query_plans(db, probes)
+    assert not find_full_scans(report), find_full_scans(report)
+    for _, details in report["preview_bulk_update"]:
+        assert any(detail.startswith("SEARCH products USING INDEX") for detail in details), details
+    print("✅ Dry runs find the seller's products by index, whatever the filters")
+    db.close()
+
+if __name__ == "__main__":
+    test_dry_run_matches_apply()
+    test_filters()
+    test_invalid_changes_write_nothing()
+    test_grid_edits()
+    test_apply_is_one_statement()
+    test_preview_plans_use_seller_index()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory cart service and its batched write-back
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+import sqlite3
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.cart import CartService
+from fixtures import make_db
+
+BUYER = "9000000042"
+
+USERS = [("Seller", "9000000041", "seller", "Mandi"), ("Buyer", BUYER, "buyer", "Una")]
+PRODUCTS = [("9000000041", name, "Vegetables", "", "kg", price, 100)
+            for name, price in [("Tomatoes", 25), ("Onions", 30), ("Apples", 80)]]
+
+def make_cart_db():
+    db = make_db("cart.db", USERS, PRODUCTS)
+    products, _ = db.get_products_page()
+    return db, {product.name: product for product in products}
+
+def table_cart(db):
+    with db.connection() as conn:
+        return dict(conn.execute("SELECT product_id, quantity FROM cart WHERE buyer_phone = ?", (BUYER,)).fetchall())
+
+def test_taps_coalesce_into_one_flush():
+    print("\n=== Testing coalesced taps ===")
+    db, products = make_cart_db()
+    cart = CartService(db, flush_delay=None)
+    tomatoes, onions = products["Tomatoes"], products["Onions"]
+
+    for _ in range(10):
+        cart.add(BUYER, tomatoes)
+    cart.add(BUYER, onions, 2)
+    cart.add(BUYER, onions, -2)  # tapped away again before any flush
+    assert cart.quantity_of(BUYER, tomatoes.id) == 10 and cart.count(BUYER) == 1
+    assert table_cart(db) == {} and cart.pending(BUYER) == 2
+
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        assert cart.flush(BUYER)
+        conn.set_trace_callback(None)
+    writes = [sql for sql in statements if sql.lstrip().startswith(("INSERT", "DELETE"))]
+    assert table_cart(db) == {tomatoes.id: 10} and cart.pending() == 0
+    assert len(writes) == 2 and cart.flushes == 1
+    print(f"✅ 13 taps became {cart.rows_written} written rows in one flush")
+    db.close()
+
+def test_view_served_from_memory():
+    print("\n=== Testing memory-served view ===")
+    db, products = make_cart_db()
+    db.add_to_cart(BUYER, products["Apples"].id, 1)
+    db.add_to_cart(BUYER, products["Apples"].id, 2)  # UPSERT adds to the line
+    cart = CartService(db, flush_delay=None)
+    assert [(item.product_name, item.quantity) for item in cart.items(BUYER)] == [("Apples", 3)]
+
+    cart.add(BUYER, products["Onions"])
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        items = cart.items(BUYER)
+        count = cart.count(BUYER)
+        conn.set_trace_callback(None)
+    assert statements == [] and count == 2 and items[1].seller_name == "Seller"
+    print("✅ Loaded once from the table, then read with no queries")
+
+    cart.set_quantity(BUYER, products["Apples"].id, 0)
+    assert cart.flush() and table_cart(db) == {products["Onions"].id: 1}
+    assert cart.clear(BUYER) and table_cart(db) == {} and cart.items(BUYER) == []
+    print("✅ Removals and clear are written back as deletes")
+    db.close()
+
+def test_summary_loads_cart_for_taps():
+    print("\n=== Testing cart load on the summary worker ===")
+    db, products = make_cart_db()
+    db.add_to_cart(BUYER, products["Onions"].id, 2)
+    cart = CartService(db, flush_delay=None)
+    assert not cart.is_loaded(BUYER)
+    summary = cart.summary(BUYER)  # what CartScreen runs on app.db_executor
+    assert cart.is_loaded(BUYER) and summary.total == 60
+
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        cart.set_quantity(BUYER, products["Onions"].id, cart.quantity_of(BUYER, products["Onions"].id) + 1)
+        conn.set_trace_callback(None)
+    assert statements == [] and cart.pending(BUYER) == 1
+    print("✅ After the summary, +/- taps run no queries on the UI thread")
+    db.close()
+
+def test_failed_load_is_retried():
+    print("\n=== Testing a failed cart load ===")
+    db, products = make_cart_db()
+    db.add_to_cart(BUYER, products["Apples"].id, 2)
+    cart = CartService(db, flush_delay=None)
+    with db.connection() as conn:
+        conn.execute("ALTER TABLE cart RENAME TO cart_moved")
+    try:
+        cart.items(BUYER)
+        assert False, "a failed load returned a cart"
+    except sqlite3.OperationalError:
+        pass
+    assert not cart.is_loaded(BUYER)
+    print("✅ A failed load raises and caches nothing")
+
+    with db.connection() as conn:
+        conn.execute("ALTER TABLE cart_moved RENAME TO cart")
+    assert [(item.product_name, item.quantity) for item in cart.items(BUYER)] == [("Apples", 2)]
+    print("✅ The next access loads the saved cart")
+    db.close()
+
+def test_timer_flush_and_checkout():
+    print("\n=== Testing timed flush and checkout ===")
+    db, products = make_cart_db()
+    cart = CartService(db, flush_delay=0.05)
+    cart.add(BUYER, products["Tomatoes"], 3)
+    deadline = time.monotonic() + 5
+    while table_cart(db) == {} and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert table_cart(db) == {products["Tomatoes"].id: 3}
+    print("✅ Timer flushed pending taps without being asked")
+
+    cart.add(BUYER, products["Onions"], 1)
+    assert cart.flush(BUYER)
+    placed = db.create_order(BUYER, "Una bus stand")
+    cart.forget(BUYER)
+    assert sum(len(numbers) for numbers in placed.values()) == 2 and cart.items(BUYER) == []
+    print("✅ Flushed cart checked out; the service re-reads the emptied table")
+    cart.close()
+    db.close()
+
+if __name__ == "__main__":
+    test_taps_coalesce_into_one_flush()
+    test_view_served_from_memory()
+    test_summary_loads_cart_for_taps()
+    test_failed_load_is_retried()
+    test_timer_flush_and_checkout()
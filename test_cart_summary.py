@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQL cart summary: totals, seller subtotals and stock/price flags
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.cart import CartService
+from fixtures import make_db
+
+BUYER = "9000000052"
+SELLERS = ["9000000050", "9000000051"]
+
+USERS = [("Ramesh", SELLERS[0], "seller", "Mandi"), ("Sita", SELLERS[1], "seller", "Kullu"),
+         ("Buyer", BUYER, "buyer", "Una")]
+PRODUCTS = [(SELLERS[0], "Tomatoes", "Vegetables", "", "kg", 25.5, 100),
+            (SELLERS[0], "Onions", "Vegetables", "", "kg", 30, 2),
+            (SELLERS[1], "Apples", "Fruits", "", "kg", 80.25, 50)]
+
+def make_summary_db():
+    db = make_db("summary.db", USERS, PRODUCTS)
+    products, _ = db.get_products_page()
+    return db, {product.name: product.id for product in products}
+
+def test_totals_and_subtotals():
+    print("\n=== Testing totals ===")
+    db, ids = make_summary_db()
+    db.add_to_cart(BUYER, ids["Tomatoes"], 3)
+    db.add_to_cart(BUYER, ids["Apples"], 1.5)
+    db.add_to_cart(BUYER, ids["Onions"], 2)
+
+    summary = db.get_cart_summary(BUYER)
+    lines = {line.product_name: line for line in summary.lines}
+    assert lines["Tomatoes"].line_total == 76.5 and lines["Apples"].line_total == 120.38
+    assert [(phone, subtotal) for phone, _, subtotal, _ in summary.sellers] == [(SELLERS[0], 136.5),
+                                                                              (SELLERS[1], 120.38)]
+    assert [line.product_name for line in summary.sellers[0][3]] == ["Tomatoes", "Onions"]
+    assert summary.total == 256.88 and summary.can_checkout
+    assert not summary.price_changes and not summary.shortages
+    print(f"✅ 3 lines from 2 sellers total ₹{summary.total:.2f}")
+
+    placed = db.create_order(BUYER, "Una bus stand")
+    with db.connection() as conn:
+        charged = conn.execute("SELECT SUM(total_amount) FROM orders WHERE buyer_phone = ?", (BUYER,)).fetchone()[0]
+    assert round(charged, 2) == summary.total and len(placed) == 2
+    assert db.get_cart_summary(BUYER).lines == [] and db.get_cart_summary(BUYER).total == 0
+    print("✅ Summary total matches what checkout charged")
+    db.close()
+
+def test_stale_price_and_stock_flags():
+    print("\n=== Testing flags ===")
+    db, ids = make_summary_db()
+    cart = CartService(db, flush_delay=None)
+    products, _ = db.get_products_page()
+    for product in products:
+        cart.add(BUYER, product, 3)
+    with db.connection() as conn:
+        conn.execute("UPDATE products SET price = 28 WHERE id = ?", (ids["Tomatoes"],))
+        conn.execute("UPDATE products SET status = 'inactive' WHERE id = ?", (ids["Apples"],))
+        conn.commit()
+
+    summary = cart.summary(BUYER)  # flushes the taps first
+    assert cart.pending(BUYER) == 0 and len(summary.lines) == 3
+    assert [(line.product_name, line.price_at_add, line.price) for line in summary.price_changes] == \
+        [("Tomatoes", 25.5, 28)]
+    shortages = {line.product_name: line.available for line in summary.shortages}
+    assert shortages == {"Onions": 2, "Apples": 0} and not summary.can_checkout
+    print("✅ Price rise, short stock and delisted product flagged")
+
+    tomatoes = next(product for product in products if product.id == ids["Tomatoes"])
+    cart.add(BUYER, tomatoes, 2)  # more of a line keeps its original price_at_add
+    assert cart.summary(BUYER).price_changes[0].price_at_add == 25.5
+    db.close()
+
+def test_summary_is_one_indexed_query():
+    print("\n=== Testing query shape ===")
+    db, ids = make_summary_db()
+    db.add_to_cart(BUYER, ids["Tomatoes"], 1)
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        db.get_cart_summary(BUYER)
+        conn.set_trace_callback(None)
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + statements[0])]
+    assert len(statements) == 1
+    assert any(detail.startswith("SEARCH c USING INDEX") for detail in plan), plan
+    assert [detail for detail in plan if "TEMP B-TREE" in detail and "GROUP BY" in detail] == \
+        ["USE TEMP B-TREE FOR GROUP BY"], plan
+    print("✅ One statement, cart found by index, lines grouped per seller in one sort")
+    db.close()
+
+if __name__ == "__main__":
+    test_totals_and_subtotals()
+    test_stale_price_and_stock_flags()
+    test_summary_is_one_indexed_query()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for checkout: cart to per-seller orders with stock reservation
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.db_manager import CheckoutError
+from fixtures import make_db
+
+USERS = [("Seller One", "9000000011", "seller", "Mandi"), ("Seller Two", "9000000012", "seller", "Una"),
+         ("Buyer", "9000000013", "buyer", "Hamirpur")]
+
+def stock(db, product_id):
+    with db.connection() as conn:
+        return conn.execute("SELECT stock_qty FROM products WHERE id = ?", (product_id,)).fetchone()[0]
+
+def test_orders_split_per_seller():
+    print("\n=== Testing per-seller checkout ===")
+    db = make_db("checkout.db", USERS)
+    apples = db.add_product("9000000011", "Apples", "Fruits", "", "kg", 80, 10)
+    pears = db.add_product("9000000011", "Pears", "Fruits", "", "kg", 60, 10)
+    rice = db.add_product("9000000012", "Rice", "Grains", "", "kg", 40, 10)
+    for product_id, quantity in ((apples, 2), (pears, 1), (rice, 5)):
+        db.add_to_cart("9000000013", product_id, quantity)
+
+    placed = db.create_order("9000000013", "Ward 4, Hamirpur", "Cash on delivery")
+    assert sorted(len(numbers) for numbers in placed.values()) == [1, 2]
+    reference = placed["9000000011"][0].rsplit("-", 2)[0]
+    assert all(number.startswith(reference) for numbers in placed.values() for number in numbers)
+    assert (stock(db, apples), stock(db, pears), stock(db, rice)) == (8, 9, 5)
+    assert db.get_cart_items("9000000013") == []
+
+    orders = db.get_user_orders("9000000013", "buyer")
+    assert sorted(order.total_amount for order in orders) == [60, 160, 200]
+    assert len(db.get_user_orders("9000000012", "seller")) == 1
+    print(f"✅ Orders per seller: {placed}")
+    db.close()
+
+def test_oversell_rejected_atomically():
+    print("\n=== Testing oversell guard ===")
+    db = make_db("checkout.db", USERS)
+    apples = db.add_product("9000000011", "Apples", "Fruits", "", "kg", 80, 3)
+    rice = db.add_product("9000000012", "Rice", "Grains", "", "kg", 40, 10)
+    db.add_to_cart("9000000013", apples, 5)
+    db.add_to_cart("9000000013", rice, 1)
+    try:
+        db.create_order("9000000013")
+        raise AssertionError("checkout oversold apples")
+    except CheckoutError as e:
+        assert e.shortages == [(apples, "Apples", 5, 3)]
+        print(f"✅ Rejected: {e}")
+    # Nothing was ordered, reserved or removed from the cart
+    assert (stock(db, apples), stock(db, rice)) == (3, 10)
+    assert len(db.get_cart_items("9000000013")) == 2
+    assert db.get_user_orders("9000000013", "buyer") == []
+
+    db.clear_cart("9000000013")
+    try:
+        db.create_order("9000000013")
+        raise AssertionError("empty cart checked out")
+    except CheckoutError as e:
+        print(f"✅ Rejected: {e}")
+    db.close()
+
+def test_concurrent_checkouts_never_oversell():
+    print("\n=== Testing concurrent checkouts ===")
+    db = make_db("checkout.db", USERS)
+    product_id = db.add_product("9000000011", "Mangoes", "Fruits", "", "box", 500, 25)
+    buyers = [f"8{i:09d}" for i in range(60)]
+    for phone in buyers:
+        db.create_user("Buyer", phone, "", "secret1", "buyer", "")
+        db.add_to_cart(phone, product_id, 1)
+
+    outcomes = []
+    def checkout(phone):
+        try:
+            db.create_order(phone)
+            outcomes.append("ordered")
+        except CheckoutError:
+            outcomes.append("sold out")
+
+    threads = [threading.Thread(target=checkout, args=(phone,)) for phone in buyers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count("ordered") == 25 and outcomes.count("sold out") == 35
+    assert stock(db, product_id) == 0
+    print(f"✅ 60 buyers raced for 25 boxes: {outcomes.count('ordered')} orders, stock 0")
+    db.close()
+
+if __name__ == "__main__":
+    test_orders_split_per_seller()
+    test_oversell_rejected_atomically()
+    test_concurrent_checkouts_never_oversell()
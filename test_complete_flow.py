@@ -49,7 +49,7 @@ def test_complete_flow():
     if seller_products:
         print(f"✅ Seller has {len(seller_products)} products:")
         for product in seller_products:
-            product_id, seller_phone, name, category, variety, unit, price, stock_qty, description, image_path, status, created_at, updated_at = product
+            name, category, unit, price, stock_qty = product.name, product.category, product.unit, product.price, product.stock_qty
             print(f"   - {name} ({category}) - ₹{price}/{unit}")
     else:
         print("❌ Seller has no products")
@@ -60,7 +60,7 @@ def test_complete_flow():
     if marketplace_products:
         print(f"✅ Marketplace has {len(marketplace_products)} products available:")
         for product in marketplace_products:
-            product_id, seller_phone, name, category, variety, unit, price, stock_qty, description, image_path, status, created_at, updated_at = product
+            name, category, unit, price, stock_qty = product.name, product.category, product.unit, product.price, product.stock_qty
             print(f"   - {name} ({category}) - ₹{price}/{unit} - Stock: {stock_qty} {unit}")
     else:
         print("❌ No products in marketplace")
@@ -132,7 +132,7 @@ def test_product_retrieval():
             products = db.get_user_products(phone)
             print(f"📦 Seller {phone}: {len(products)} products")
             for product in products:
-                print(f"   - {product[2]} ({product[3]}) - ₹{product[6]}/{product[5]} - Stock: {product[7]}")
+                print(f"   - {product.name} ({product.category}) - ₹{product.price}/{product.unit} - Stock: {product.stock_qty}")
         except Exception as e:
             print(f"❌ Error retrieving products for {phone}: {e}")
 
@@ -147,10 +147,10 @@ def test_marketplace():
 
         categories = {}
         for product in products:
-            category = product[3]  # category
+            category = product.category
             if category not in categories:
                 categories[category] = []
-            categories[category].append(product[2])  # name
+            categories[category].append(product.name)
 
         print("📊 Products by category:")
         for category, product_names in categories.items():
@@ -171,7 +171,7 @@ def test_cart_functionality():
     try:
         products = db.get_all_products()
         if products:
-            product_ids = [p[0] for p in products[:2]]  # First 2 products
+            product_ids = [p.id for p in products[:2]]  # First 2 products
     except Exception as e:
         print(f"❌ Error getting product IDs: {e}")
         return
@@ -192,7 +192,7 @@ def test_cart_functionality():
         cart_items = db.get_cart_items(buyer_phone)
         print(f"🛒 Cart for {buyer_phone}: {len(cart_items)} items")
         for item in cart_items:
-            print(f"   - Product ID: {item[1]}, Quantity: {item[2]}")
+            print(f"   - Product ID: {item.product_id}, Quantity: {item.quantity}")
     except Exception as e:
         print(f"❌ Error getting cart: {e}")
 
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled SQLite connections behind DatabaseManager
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.pool import PoolClosedError
+from fixtures import make_db
+
+def test_connection_reused_on_ui_thread():
+    """The creating thread keeps one long-lived connection"""
+    print("\n=== Testing pinned connection reuse ===")
+    db = make_db("pool_test.db")
+
+    first = db.get_connection()
+    first.close()
+    second = db.get_connection()
+    second.close()
+
+    assert first.raw is second.raw
+    db.create_user("Pool Seller", "9000000001", "pool@example.com", "secret1", "seller", "Mandi")
+    assert db.authenticate_user("9000000001", "secret1") is not None
+    assert db.pool_stats()["created"] == 1
+    print(f"✅ Single connection reused: {db.pool_stats()}")
+    db.close()
+
+def test_background_threads_borrow_from_bounded_pool():
+    """Worker threads share at most max_size connections"""
+    print("\n=== Testing bounded pool under worker threads ===")
+    db = make_db("pool_test.db", pool_size=3)
+    db.create_user("Pool Seller", "9000000002", "pool@example.com", "secret1", "seller", "Mandi")
+    for i in range(5):
+        db.add_product("9000000002", f"Crop {i}", "Vegetables", "", "kg", 10 + i, 5, "")
+
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(20):
+                assert len(db.get_user_products("9000000002")) == 5
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = db.pool_stats()
+    assert not errors, errors
+    assert stats["open"] <= 3
+    assert stats["checkouts"] >= 160
+    print(f"✅ {stats['checkouts']} checkouts over {stats['open']} connections, "
+          f"{stats['waits']} waits (max {stats['max_wait_ms']:.2f} ms)")
+    db.close()
+
+def test_context_manager_and_shutdown():
+    """with db.connection() returns the connection; close() shuts the pool"""
+    print("\n=== Testing context manager checkout and shutdown ===")
+    db = make_db("pool_test.db")
+
+    with db.connection() as conn:
+        conn.execute("SELECT 1")
+        nested = db.get_connection()
+        assert nested is conn
+        nested.close()
+
+    db.close()
+    try:
+        db.get_connection()
+        raise AssertionError("closed pool handed out a connection")
+    except PoolClosedError:
+        print("✅ Closed pool refuses new checkouts")
+
+def test_double_close_is_harmless():
+    """Closing a borrowed connection twice queues it as idle only once"""
+    print("\n=== Testing double close ===")
+    db = make_db("pool_test.db", pool_size=3)
+    seen = {}
+
+    def borrow_twice():
+        conn = db.get_connection()
+        conn.close()
+        conn.close()
+        seen["idle"] = db.pool_stats()["idle"]
+        first, second = db.get_connection(), db.get_connection()
+        seen["nested"] = first is second
+        second.close()
+        # A second worker must get its own connection while this one is held
+        other = threading.Thread(target=lambda: seen.update(other=db.get_connection()))
+        other.start()
+        other.join()
+        seen["distinct"] = seen["other"].raw is not first.raw
+        seen["other"].close()
+        first.close()
+
+    worker = threading.Thread(target=borrow_twice)
+    worker.start()
+    worker.join()
+
+    assert seen["idle"] == 1, seen
+    assert seen["nested"] and seen["distinct"], seen
+    print("✅ Second close() ignored; concurrent checkouts never share a connection")
+    db.close()
+
+if __name__ == "__main__":
+    test_connection_reused_on_ui_thread()
+    test_background_threads_borrow_from_bounded_pool()
+    test_context_manager_and_shutdown()
+    test_double_close_is_harmless()
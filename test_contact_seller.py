@@ -79,7 +79,7 @@ def test_marketplace_products():
         if products:
             print("   Sample products:")
             for i, product in enumerate(products[:3]):  # Show first 3
-                product_id, seller_phone, name, category, variety, unit, price, quantity, description, image_path, status, created_at, updated_at = product
+                name, price, unit, seller_phone = product.name, product.price, product.unit, product.seller_phone
                 print(f"   {i+1}. {name} - ₹{price}/{unit} (Seller: {seller_phone})")
 
                 # Test seller info for this product
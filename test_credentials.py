@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for salted password hashing, rehash-on-login and the plaintext migration
+Uses throwaway databases so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.credentials import MIN_PBKDF2_ITERATIONS, PBKDF2, SCRYPT, PasswordHasher, decode, is_hashed
+from database.db_manager import DatabaseManager
+from database.migrations import MIGRATIONS, run_migrations
+from fixtures import temp_db_path
+
+def stored_password(db, phone):
+    with db.connection() as conn:
+        return conn.execute("SELECT password FROM users WHERE phone = ?", (phone,)).fetchone()[0]
+
+def test_hash_and_verify():
+    print("\n=== Testing hash formats ===")
+    for algorithm in (PBKDF2, SCRYPT):
+        hasher = PasswordHasher(algorithm)
+        first, second = hasher.hash("Kisan@123"), hasher.hash("Kisan@123")
+        assert is_hashed(first) and first != second  # fresh salt every time
+        assert hasher.verify("Kisan@123", first) and not hasher.verify("kisan@123", first)
+        assert not hasher.needs_rehash(first)
+        print(f"✅ {algorithm}: {first[:40]}...")
+    assert PasswordHasher().verify("plain", "plain") and not PasswordHasher().verify("x", "plain")
+    assert PasswordHasher().needs_rehash("plain")
+    assert not PasswordHasher().verify("x", "pbkdf2_sha256$garbage")
+    print("✅ Legacy plaintext still verifies and is flagged for rehash")
+
+def test_verification_cache():
+    print("\n=== Testing verification cache ===")
+    hasher = PasswordHasher(cost=50_000)
+    stored = hasher.hash("secret1")
+    calls = []
+    import database.credentials as credentials
+    real_derive = credentials.derive
+
+    def counting_derive(*args):
+        calls.append(args[2])
+        return real_derive(*args)
+
+    credentials.derive = counting_derive
+    try:
+        assert hasher.verify("secret1", stored) and hasher.verify("secret1", stored)
+        assert not hasher.verify("wrong", stored)
+        assert len(calls) == 2  # the repeat success was served from the cache
+        hasher.forget(stored)
+        assert hasher.verify("secret1", stored) and len(calls) == 3
+    finally:
+        credentials.derive = real_derive
+    print("✅ Repeat logins skip key derivation; wrong passwords never do")
+
+def test_calibration_persisted():
+    print("\n=== Testing per-device calibration ===")
+    params_path = temp_db_path("password_params.json")
+    hasher = PasswordHasher.for_device(params_path, target_ms=50)
+    assert hasher.cost >= MIN_PBKDF2_ITERATIONS and hasher.cost % 10_000 == 0
+    assert PasswordHasher.for_device(params_path, target_ms=50).cost == hasher.cost
+    print(f"✅ Calibrated to {hasher.cost:,} iterations and reused from {os.path.basename(params_path)}")
+
+def test_rehash_on_login():
+    print("\n=== Testing rehash on login ===")
+    path = temp_db_path("credentials.db")
+    db = DatabaseManager(path, password_hasher=PasswordHasher(cost=100_000))
+    db.init_database()
+    assert db.create_user("Asha", "9000000021", "", "secret1", "buyer", "Una")
+    old = stored_password(db, "9000000021")
+    assert decode(old)[1] == 100_000
+    db.close()
+
+    # Parameters raised, e.g. by recalibrating on a faster phone
+    db = DatabaseManager(path, password_hasher=PasswordHasher(cost=120_000))
+    assert db.authenticate_user("9000000021", "wrong") is None
+    assert stored_password(db, "9000000021") == old
+    assert db.authenticate_user("9000000021", "secret1") == ("Asha", "buyer", "Una")
+    new = stored_password(db, "9000000021")
+    assert new != old and decode(new)[1] == 120_000
+    assert db.authenticate_user("9000000021", "secret1") == ("Asha", "buyer", "Una")
+    print("✅ Password re-hashed at the new cost after a successful login only")
+    db.close()
+
+def test_plaintext_passwords_migrated():
+    print("\n=== Testing plaintext migration ===")
+    path = temp_db_path("plaintext.db")
+    conn = sqlite3.connect(path)
+    run_migrations(conn, [m for m in MIGRATIONS if m[0] < 9])
+    conn.execute("INSERT INTO users (name, phone, email, password, role) VALUES ('Old', '9000000022', '', 'pw1234', 'seller')")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(path, password_hasher=PasswordHasher())
+    db.init_database(defer=True)
+    assert stored_password(db, "9000000022") == "pw1234"
+    assert db.authenticate_user("9000000022", "pw1234") == ("Old", "seller", "")  # before the deferred pass
+    assert is_hashed(stored_password(db, "9000000022"))
+    db.close()
+
+    db = DatabaseManager(path, password_hasher=PasswordHasher())
+    with db.connection() as conn:
+        conn.execute("INSERT INTO users (name, phone, email, password, role) VALUES ('Late', '9000000023', '', 'pw5678', 'buyer')")
+        conn.commit()
+    db.run_deferred_init()
+    assert is_hashed(stored_password(db, "9000000023"))
+    assert db.authenticate_user("9000000023", "pw5678") == ("Late", "buyer", "")
+    print("✅ No plaintext password left after the deferred migration")
+    db.close()
+
+if __name__ == "__main__":
+    test_hash_and_verify()
+    test_verification_cache()
+    test_calibration_persisted()
+    test_rehash_on_login()
+    test_plaintext_passwords_migrated()
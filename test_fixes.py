@@ -69,7 +69,7 @@ def test_seller_products():
             passed += 1
             print(f"✅ Product test passed: {phone} has {len(products)} products")
             for product in products:
-                print(f"   - {product[2]}: {product[7]} {product[5]} @ ₹{product[6]}")
+                print(f"   - {product.name}: {product.stock_qty} {product.unit} @ ₹{product.price}")
         else:
             print(f"❌ Product test failed: {phone} expected {expected_count}, got {len(products)}")
 
@@ -35,7 +35,7 @@ def test_login():
         products = db.get_user_products(phone)
         print(f"Seller {phone} has {len(products)} products:")
         for product in products:
-            print(f"  - {product[2]} ({product[3]}) - ₹{product[6]}/{product[5]} - Stock: {product[7]}")
+            print(f"  - {product.name} ({product.category}) - ₹{product.price}/{product.unit} - Stock: {product.stock_qty}")
 
 if __name__ == "__main__":
     test_login()
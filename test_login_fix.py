@@ -41,7 +41,7 @@ def test_seller_products():
         products = db.get_user_products(phone)
         print(f"Seller {phone}: {len(products)} products")
         for product in products:
-            print(f"  - {product[2]} ({product[3]}): {product[7]} {product[5]} @ ₹{product[6]}")
+            print(f"  - {product.name} ({product.category}): {product.stock_qty} {product.unit} @ ₹{product.price}")
 
 if __name__ == "__main__":
     test_login()
@@ -44,7 +44,7 @@ def test_products():
         products = db.get_user_products(phone)
         print(f"Seller {phone}: {len(products)} products")
         for product in products:
-            print(f"  - {product[2]} ({product[3]}) - ₹{product[6]}/{product[5]} - Stock: {product[7]}")
+            print(f"  - {product.name} ({product.category}) - ₹{product.price}/{product.unit} - Stock: {product.stock_qty}")
 
 def test_marketplace():
     """Test marketplace products"""
@@ -55,7 +55,7 @@ def test_marketplace():
     products = db.get_all_products()
     print(f"Total marketplace products: {len(products)}")
     for product in products:
-        print(f"  - {product[2]} ({product[3]}) - ₹{product[6]}/{product[5]} - Seller: {product[1]}")
+        print(f"  - {product.name} ({product.category}) - ₹{product.price}/{product.unit} - Seller: {product.seller_phone}")
 
 if __name__ == "__main__":
     test_login()
@@ -23,7 +23,7 @@ def test_marketplace():
     if products:
         print(f"✅ Found {len(products)} products:")
         for product in products:
-            product_id, seller_phone, name, category, variety, unit, price, stock_qty, description, image_path, status, created_at, updated_at = product
+            name, category, unit, price, stock_qty = product.name, product.category, product.unit, product.price, product.stock_qty
             print(f"   - {name} ({category}) - ₹{price}/{unit} - Stock: {stock_qty} {unit}")
     else:
         print("❌ No products found")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for the versioned schema migration engine
+Uses throwaway databases so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.db_manager import DatabaseManager
+from database.maintenance import vacuum_if_fragmented
+from database.migrations import LATEST_VERSION, MIGRATIONS, get_schema_version, run_migrations
+from fixtures import temp_db_path
+
+def test_fresh_database_migrates_to_latest():
+    print("\n=== Testing fresh database ===")
+    db = DatabaseManager(temp_db_path("fresh.db"))
+    timings = db.init_database()
+
+    assert [version for version, _, _ in timings] == [v for v, _, _ in MIGRATIONS]
+    assert db.schema_version() == LATEST_VERSION
+    assert len(db.get_govt_schemes()) == 3
+    print(f"✅ Migrated to v{LATEST_VERSION}: {[(v, f'{ms:.1f} ms') for v, _, ms in timings]}")
+    db.close()
+
+def test_current_database_costs_one_query():
+    """Startup on an up-to-date schema is a single PRAGMA read"""
+    print("\n=== Testing fast path ===")
+    path = temp_db_path("current.db")
+    DatabaseManager(path).init_database()
+
+    db = DatabaseManager(path)
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        assert db.init_database() == []
+        conn.set_trace_callback(None)
+
+    assert statements == ["PRAGMA user_version"], statements
+    assert len(db.get_govt_schemes()) == 3  # seeding is not repeated
+    print("✅ Up-to-date start ran exactly one query")
+    db.close()
+
+def test_legacy_database_adopted():
+    """Pre-versioning databases without users.location are upgraded in place"""
+    print("\n=== Testing legacy database ===")
+    path = temp_db_path("legacy.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute("""CREATE TABLE users(id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+        phone TEXT UNIQUE NOT NULL, email TEXT, password TEXT NOT NULL,
+        role TEXT NOT NULL CHECK(role IN ('seller', 'buyer')),
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP, updated_at TEXT DEFAULT CURRENT_TIMESTAMP)""")
+    legacy.execute("INSERT INTO users (name, phone, email, password, role) VALUES ('Old', '9000000004', '', 'pw1234', 'buyer')")
+    legacy.commit()
+    legacy.close()
+
+    db = DatabaseManager(path)
+    db.init_database()
+    assert db.authenticate_user("9000000004", "pw1234") == ("Old", "buyer", "")
+    print("✅ Legacy users table gained the location column")
+    db.close()
+
+def test_failed_step_rolls_back():
+    """A failing step leaves the schema at the previous version"""
+    print("\n=== Testing transactional upgrade ===")
+    conn = sqlite3.connect(temp_db_path("broken.db"))
+
+    def broken_step(c):
+        c.execute("CREATE TABLE half_done(id INTEGER)")
+        raise RuntimeError("boom")
+
+    steps = MIGRATIONS[:1] + [(2, "broken", broken_step)]
+    try:
+        run_migrations(conn, steps)
+        raise AssertionError("broken migration did not raise")
+    except RuntimeError:
+        pass
+
+    assert get_schema_version(conn) == 1
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "half_done" not in tables
+    print("✅ Failed step rolled back, schema stayed at v1")
+    conn.close()
+
+def test_seeding_deferred_past_startup():
+    """defer=True migrates the schema but leaves seeding for the background pass"""
+    print("\n=== Testing deferred init ===")
+    path = temp_db_path("deferred.db")
+    db = DatabaseManager(path)
+    timings = db.init_database(defer=True)
+    assert db.schema_version() == LATEST_VERSION and len(timings) == len(MIGRATIONS)
+    assert db.get_govt_schemes() == [] and db.get_price_trends() == []
+    assert db.authenticate_user("9000000009", "nope") is None  # login path works already
+    db.close()
+
+    # Closed before the deferred pass ran: the next launch still seeds
+    db = DatabaseManager(path)
+    assert db.init_database(defer=True) == []
+    thread = db.start_deferred_init()
+    thread.join(10)
+    assert [version for version, _, _ in db.deferred_timings] == [3, 8, 9]
+    assert len(db.get_govt_schemes()) == 3 and len(db.get_price_trends()) == 10
+    report = db.maintenance_report
+    assert report["problems"] == [] and set(report["timings_ms"]) == {"quick_check", "optimize", "vacuum"}
+    print(f"✅ Seeds ran after startup: {[(v, f'{ms:.1f} ms') for v, _, ms in db.deferred_timings]}")
+    assert db.run_deferred_init() is not None and db.deferred_timings == []
+    db.close()
+
+def test_vacuum_only_when_fragmented():
+    print("\n=== Testing conditional VACUUM ===")
+    conn = sqlite3.connect(temp_db_path("fragmented.db"))
+    conn.execute("CREATE TABLE blobs(data BLOB)")
+    conn.executemany("INSERT INTO blobs VALUES (zeroblob(4000))", [()] * 500)
+    conn.commit()
+    assert vacuum_if_fragmented(conn) == 0
+    conn.execute("DELETE FROM blobs WHERE rowid > 100")
+    conn.commit()
+    freed = vacuum_if_fragmented(conn)
+    assert freed >= 256 and conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    print(f"✅ VACUUM skipped on a compact file, freed {freed} pages after mass delete")
+    conn.close()
+
+if __name__ == "__main__":
+    test_fresh_database_migrates_to_latest()
+    test_current_database_costs_one_query()
+    test_legacy_database_adopted()
+    test_failed_step_rolls_back()
+    test_seeding_deferred_past_startup()
+    test_vacuum_only_when_fragmented()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script for the __slots__ row records returned by DatabaseManager
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.models import CartItem, Product, ProductListing, Scheme
+from fixtures import make_db
+
+USERS = [("Kamla", "9000000009", "seller", "Una", "kamla@example.com"),
+         ("Arjun", "9000000010", "buyer", "Mandi", "arjun@example.com")]
+PRODUCTS = [("9000000009", "Maize", "Grains", "Desi", "kg", 22.5, 300, "Sun dried maize")]
+
+def test_records_have_names_not_dicts():
+    print("\n=== Testing slotted records ===")
+    record = ProductListing(1, "9000000009", "Maize")
+    assert record.name == "Maize" and record.seller_name is None
+    assert not hasattr(record, "__dict__")
+    try:
+        record.colour = "yellow"
+        raise AssertionError("slotted record accepted an unknown attribute")
+    except AttributeError:
+        pass
+    assert record == ProductListing(**record.as_dict())
+    print(f"✅ {record!r}")
+
+def test_queries_return_records():
+    print("\n=== Testing query row factories ===")
+    db = make_db("models.db", USERS, PRODUCTS)
+    product = db.get_user_products("9000000009")[0]
+    assert isinstance(product, Product)
+    assert (product.name, product.price, product.stock_qty, product.status) == ("Maize", 22.5, 300, "active")
+
+    listing = db.get_all_products()[0]
+    assert isinstance(listing, ProductListing)
+    assert (listing.id, listing.seller_name, listing.seller_location) == (product.id, "Kamla", "Una")
+
+    db.add_to_cart("9000000010", product.id, 4)
+    item = db.get_cart_items("9000000010")[0]
+    assert isinstance(item, CartItem)
+    assert (item.product_name, item.quantity, item.price, item.seller_name) == ("Maize", 4, 22.5, "Kamla")
+
+    assert all(isinstance(scheme, Scheme) and scheme.name for scheme in db.get_govt_schemes())
+    print("✅ Products, listings, cart items and schemes come back as records")
+    db.close()
+
+if __name__ == "__main__":
+    test_records_have_names_not_dicts()
+    test_queries_return_records()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent notification store behind NotificationManager
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import make_db
+from utils.notifications import NotificationManager
+
+SELLER = "9000000031"
+BUYER = "9000000032"
+
+def make_manager(name="notifications.db"):
+    db = make_db(name)
+    return db, NotificationManager(db)
+
+def test_paginated_per_user_feed():
+    print("\n=== Testing per-user feed ===")
+    db, manager = make_manager()
+    assert manager.send_bulk([SELLER] * 25, "Price Alert 📈", "Tomatoes up", "price_alert") == 25
+    manager.send_notification(BUYER, "Order Update 📦", "Order shipped", "order_update", system=False)
+
+    first, cursor = manager.get_notifications(SELLER, page_size=10)
+    seen = [n.id for n in first]
+    while cursor:
+        page, cursor = manager.get_notifications(SELLER, page_size=10, cursor=cursor)
+        seen.extend(n.id for n in page)
+    assert len(seen) == len(set(seen)) == 25 and seen == sorted(seen, reverse=True)
+    assert all(n.user_phone == SELLER for n in first) and first[0].notification_type == "price_alert"
+    buyer_items, _ = manager.get_notifications(BUYER)
+    assert [n.message for n in buyer_items] == ["Order shipped"]
+    print("✅ 25 bulk-inserted alerts paged newest first; the buyer only sees their own")
+    db.close()
+
+def test_unread_counter_and_bulk_read():
+    print("\n=== Testing unread counts ===")
+    db, manager = make_manager()
+    manager.send_bulk([SELLER] * 5 + [BUYER] * 2, "Hello", "Welcome")
+    assert manager.unread_count(SELLER) == 5 and manager.unread_count(BUYER) == 2
+    assert manager.unread_count("9000000000") == 0
+
+    unread, _ = manager.get_notifications(SELLER, unread_only=True)
+    assert manager.mark_as_read(SELLER, [unread[0].id, unread[1].id]) == 2
+    assert manager.mark_as_read(BUYER, [unread[2].id]) == 0  # not the buyer's
+    assert manager.unread_count(SELLER) == 3
+    assert len(manager.get_notifications(SELLER, unread_only=True)[0]) == 3
+
+    assert manager.mark_as_read(SELLER) == 3
+    assert manager.unread_count(SELLER) == 0 and manager.unread_count(BUYER) == 2
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        manager.unread_count(BUYER)
+        conn.set_trace_callback(None)
+        plan = conn.execute("EXPLAIN QUERY PLAN " + statements[0]).fetchall()
+    assert "PRIMARY KEY" in plan[0][3], plan
+    print("✅ Counter follows inserts and reads; badge is a primary-key lookup")
+    db.close()
+
+def test_retention_pruning():
+    print("\n=== Testing retention ===")
+    db, manager = make_manager()
+    manager.send_bulk([SELLER] * 4, "Old", "Old news")
+    with db.connection() as conn:
+        conn.execute("UPDATE notifications SET created_at = datetime('now', '-45 days') WHERE id <= 3")
+        conn.execute("UPDATE notifications SET is_read = 1 WHERE id <= 2")
+        conn.commit()
+    assert manager.prune() == 2  # old and read
+    assert manager.unread_count(SELLER) == 2
+    assert db.prune_notifications(include_unread=True) == 1
+    assert manager.unread_count(SELLER) == 1
+    print("✅ Read notifications past 30 days pruned, unread kept unless asked")
+    db.close()
+
+if __name__ == "__main__":
+    test_paginated_per_user_feed()
+    test_unread_counter_and_bulk_read()
+    test_retention_pruning()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for paginated, filtered order queries and the user_stats counters
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.stats import create_user_stats
+from fixtures import make_db
+
+SELLER = "9000000061"
+BUYER = "9000000062"
+
+USERS = [("Seller", SELLER, "seller", "Mandi"), ("Buyer", BUYER, "buyer", "Una")]
+PRODUCTS = [(SELLER, "Tomatoes", "Vegetables", "", "kg", 20, 1000),
+            (SELLER, "Onions", "Vegetables", "", "kg", 30, 1000)]
+
+def place_orders(db, count):
+    """count single-line orders of 1 kg tomatoes, one per day going back from 2026-03-31"""
+    with db.connection() as conn:
+        product_id = conn.execute("SELECT id FROM products WHERE name = 'Tomatoes'").fetchone()[0]
+        conn.executemany("""INSERT INTO orders (order_number, buyer_phone, seller_phone, product_id,
+                                                quantity, unit_price, total_amount, created_at)
+                            VALUES (?, ?, ?, ?, 1, 20, 20, datetime('2026-03-31 12:00:00', ?))""",
+                         [(f"T-{i}", BUYER, SELLER, product_id, f"-{i} days") for i in range(count)])
+        conn.commit()
+
+def test_keyset_pages_and_filters():
+    print("\n=== Testing order pages ===")
+    db = make_db("orders.db", USERS, PRODUCTS)
+    place_orders(db, 45)
+    seen, cursor = [], None
+    while True:
+        page, cursor = db.get_orders_page(SELLER, "seller", page_size=20, cursor=cursor)
+        seen.extend(page)
+        if not cursor:
+            break
+    assert len(seen) == 45 and len({o.id for o in seen}) == 45
+    assert [o.created_at for o in seen] == sorted((o.created_at for o in seen), reverse=True)
+    assert seen[0].counterparty_name == "Buyer" and seen[0].product_name == "Tomatoes"
+    buyer_page, _ = db.get_orders_page(BUYER, "buyer", page_size=5)
+    assert [o.counterparty_name for o in buyer_page] == ["Seller"] * 5
+    print("✅ 45 orders paged 20/20/5, newest first, with the other party's name")
+
+    with db.connection() as conn:
+        conn.execute("UPDATE orders SET status = 'delivered' WHERE order_number IN ('T-0', 'T-3', 'T-40')")
+        conn.commit()
+    delivered, _ = db.get_orders_page(BUYER, "buyer", status="delivered")
+    assert [o.order_number for o in delivered] == ["T-0", "T-3", "T-40"]
+    march, _ = db.get_orders_page(SELLER, "seller", page_size=50, since="2026-03-01", until="2026-03-31")
+    assert len(march) == 30 and all(o.created_at.startswith("2026-03") for o in march)
+    recent_delivered, _ = db.get_orders_page(SELLER, "seller", status="delivered", since="2026-03-25")
+    assert [o.order_number for o in recent_delivered] == ["T-0", "T-3"]
+    print("✅ Status and date-range filters combine")
+    db.close()
+
+def test_counters_follow_writes():
+    print("\n=== Testing user_stats counters ===")
+    db = make_db("orders.db", USERS, PRODUCTS)
+    place_orders(db, 4)
+    db.add_to_cart(BUYER, 2, 3)
+    db.create_order(BUYER, "Una bus stand")
+
+    seller, buyer = db.get_user_stats(SELLER, "seller"), db.get_user_stats(BUYER, "buyer")
+    assert seller.products == 2 and buyer.products == 0
+    assert seller.orders == buyer.orders == 5 and seller.orders_by_status == {"pending": 5}
+    assert seller.gmv == buyer.gmv == 170.0
+    print("✅ Products, orders and GMV counted on insert for both sides")
+
+    with db.connection() as conn:
+        conn.execute("UPDATE orders SET status = 'delivered' WHERE order_number = 'T-0'")
+        conn.execute("UPDATE orders SET status = 'cancelled' WHERE order_number = 'T-1'")
+        conn.execute("DELETE FROM orders WHERE order_number = 'T-2'")
+        conn.execute("DELETE FROM products WHERE name = 'Tomatoes' AND NOT EXISTS "
+                     "(SELECT 1 FROM orders WHERE product_id = products.id)")
+        conn.commit()
+    db.invalidate_tables("orders", "products")  # raw writes must drop cached reads
+    seller = db.get_user_stats(SELLER, "seller")
+    assert seller.orders_by_status == {"pending": 2, "delivered": 1, "cancelled": 1}
+    assert seller.gmv == 130.0  # cancelled and deleted orders drop out
+    print("✅ Status changes move orders between counters; cancelled orders leave GMV")
+
+    with db.connection() as conn:
+        stored = conn.execute("SELECT phone, stat, count, amount FROM user_stats ORDER BY 1, 2").fetchall()
+        conn.execute("DELETE FROM user_stats")
+        create_user_stats(conn.cursor())
+        rebuilt = conn.execute("SELECT phone, stat, count, amount FROM user_stats WHERE count != 0 "
+                               "ORDER BY 1, 2").fetchall()
+        conn.rollback()
+    assert [row for row in stored if row[2] != 0] == rebuilt
+    print("✅ Trigger-maintained counters match a rebuild from scratch")
+    db.close()
+
+def test_stats_read_is_one_lookup():
+    print("\n=== Testing stats query shape ===")
+    db = make_db("orders.db", USERS, PRODUCTS)
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        db.get_user_stats(SELLER, "seller")
+        conn.set_trace_callback(None)
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + statements[0])]
+    assert len(statements) == 1 and plan == ["SEARCH user_stats USING PRIMARY KEY (phone=?)"], plan
+    print("✅ Profile stats are one primary-key range read")
+    db.close()
+
+if __name__ == "__main__":
+    test_keyset_pages_and_filters()
+    test_counters_follow_writes()
+    test_stats_read_is_one_lookup()
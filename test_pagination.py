@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination of marketplace products
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import make_db
+
+def make_catalog():
+    db = make_db("pages.db", [("Seller A", "9000000005", "seller", "Mandi", "a@example.com"),
+                              ("Seller B", "9000000006", "seller", "Mandi", "b@example.com")])
+
+    with db.connection() as conn:
+        rows = []
+        for i in range(95):
+            seller = "9000000005" if i % 2 else "9000000006"
+            category = "Vegetables" if i % 3 else "Grains"
+            stock = 0 if i % 10 == 0 else 50
+            # Five products share each timestamp to exercise the id tie-breaker
+            created_at = f"2025-01-01 00:00:{i // 5:02d}"
+            rows.append((seller, f"Crop {i}", category, "kg", 10.0, stock, created_at))
+        conn.executemany("""INSERT INTO products (seller_phone, name, category, unit, price, stock_qty, created_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)""", rows)
+        conn.execute("UPDATE products SET status = 'inactive' WHERE name = 'Crop 7'")
+        conn.commit()
+    return db
+
+def collect_pages(db, **filters):
+    ids, cursor, pages = [], None, 0
+    while True:
+        products, cursor = db.get_products_page(20, cursor, **filters)
+        ids.extend(product.id for product in products)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+def test_pages_cover_catalog_once():
+    print("\n=== Testing keyset pages ===")
+    db = make_catalog()
+    ids, pages = collect_pages(db)
+
+    expected = [product.id for product in db.get_all_products()]
+    assert ids == expected, "pages must match the full newest-first listing"
+    assert len(ids) == len(set(ids)) == 94
+    print(f"✅ {len(ids)} products over {pages} pages, no gaps or duplicates")
+    db.close()
+
+def test_filters():
+    print("\n=== Testing page filters ===")
+    db = make_catalog()
+    for filters in ({"category": "Grains"}, {"seller_phone": "9000000005"}, {"in_stock": True},
+                    {"category": "Vegetables", "seller_phone": "9000000006", "in_stock": True}):
+        ids, _ = collect_pages(db, **filters)
+        expected = [p.id for p in db.get_all_products()
+                    if (not filters.get("category") or p.category == filters["category"])
+                    and (not filters.get("seller_phone") or p.seller_phone == filters["seller_phone"])
+                    and (not filters.get("in_stock") or p.stock_qty > 0)]
+        assert ids == expected, filters
+        print(f"✅ {filters}: {len(ids)} products")
+    db.close()
+
+def test_invalid_cursor():
+    print("\n=== Testing tampered cursor ===")
+    db = make_catalog()
+    assert db.get_products_page(20, "not-a-cursor") == ([], None)
+    print("✅ Invalid cursor returns an empty page")
+    db.close()
+
+if __name__ == "__main__":
+    test_pages_cover_catalog_once()
+    test_filters()
+    test_invalid_cursor()
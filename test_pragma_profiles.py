@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for PRAGMA profiles and WAL checkpoint management
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.db_manager import DatabaseManager
+from fixtures import make_db, temp_db_path
+
+def test_profiles_applied_to_every_connection():
+    """Each profile switches to WAL and applies its own cache size"""
+    print("\n=== Testing PRAGMA profiles ===")
+    for profile, cache_size in (("mobile-battery", -4000), ("server-throughput", -65536)):
+        db = make_db("pragma_test.db", pragma_profile=profile)
+        with db.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2   # MEMORY
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == cache_size
+        print(f"✅ {profile}: WAL, synchronous=NORMAL, cache_size={cache_size}")
+        db.close()
+
+def test_unknown_profile_rejected():
+    print("\n=== Testing unknown profile ===")
+    try:
+        DatabaseManager(temp_db_path("x.db"), pragma_profile="turbo")
+        raise AssertionError("unknown profile accepted")
+    except ValueError as e:
+        print(f"✅ Rejected: {e}")
+
+def test_checkpoint_thresholds():
+    """The scheduler only checkpoints once the WAL crosses a threshold"""
+    print("\n=== Testing WAL checkpoint thresholds ===")
+    db = make_db("pragma_test.db", pragma_profile="server-throughput")
+    checkpointer = db.checkpointer
+    checkpointer.passive_bytes = 64 * 1024
+    checkpointer.truncate_bytes = 1024 * 1024 * 1024
+
+    db.create_user("WAL Seller", "9000000003", "wal@example.com", "secret1", "seller", "Mandi")
+    for i in range(300):
+        db.add_product("9000000003", f"Crop {i}", "Grains", "", "kg", 20, 100, "x" * 200)
+
+    assert checkpointer.wal_size() >= checkpointer.passive_bytes
+    assert checkpointer.run_once() == "PASSIVE"
+    assert checkpointer.checkpoint("TRUNCATE") == "TRUNCATE"
+    assert checkpointer.wal_size() == 0
+    assert checkpointer.run_once() is None
+    print(f"✅ Checkpoints run: {checkpointer.checkpoints}")
+    db.close()
+
+if __name__ == "__main__":
+    test_profiles_applied_to_every_connection()
+    test_unknown_profile_rejected()
+    test_checkpoint_thresholds()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized price engine behind PriceMonitor
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import numpy as np
+    from utils.price_engine import PriceEngine
+except ImportError:
+    np = None  # numpy is in requirements.txt; without it these checks are skipped
+
+def make_engine():
+    return PriceEngine(["Tomatoes", "Onions", "Wheat", "Rice"], [25, 30, 22, 45], [0.15, 0.12, 0.08, 0.10],
+                       threshold=5.0, seed=1)
+
+def test_bulk_alerts():
+    print("\n=== Testing bulk percent-change alerts ===")
+    if np is None:
+        print("⚠️ numpy not installed, skipped")
+        return
+    engine = make_engine()
+    alerted, _, _ = engine.tick([25, 30, 22, 45])
+    assert len(alerted) == 0  # first snapshot has nothing to compare with
+
+    alerted, prices, changes = engine.tick([27, 30, 23, 40])
+    assert [engine.names[i] for i in alerted] == ["Tomatoes"]
+    assert np.allclose(changes, [8.0]) and np.allclose(prices, [27])
+    assert engine.price_of("Rice") == 40 and engine.price_of("Maize") is None
+    print("✅ Only rises above 5% are reported (+4.5% wheat and falls are not)")
+
+def test_ingest_and_fan_out():
+    print("\n=== Testing ingestion and seller fan-out ===")
+    if np is None:
+        print("⚠️ numpy not installed, skipped")
+        return
+    engine = make_engine()
+    engine.tick([25, 30, 22, 45])
+    engine.set_holdings([("9000000001", "Onions"), ("9000000002", "Onions"),
+                         ("9000000002", "Rice"), ("9000000003", "Maize")])
+
+    alerted, _, _ = engine.ingest(["Onions", "Rice", "Maize"], [33, 50, 99])
+    assert sorted(engine.names[i] for i in alerted) == ["Onions", "Rice"]
+    assert engine.price_of("Wheat") == 22  # not observed, carried forward
+
+    sellers, commodities = engine.seller_alerts(alerted)
+    pairs = sorted((engine.sellers[s], engine.names[c]) for s, c in zip(sellers, commodities))
+    assert pairs == [("9000000001", "Onions"), ("9000000002", "Onions"), ("9000000002", "Rice")]
+    print(f"✅ Alerts fanned out to sellers: {pairs}")
+
+def test_simulation_stays_in_band():
+    print("\n=== Testing simulated ticks ===")
+    if np is None:
+        print("⚠️ numpy not installed, skipped")
+        return
+    engine = make_engine()
+    for _ in range(100):
+        engine.tick()
+        ratio = engine.last_prices / engine.base_prices
+        assert np.all(np.abs(ratio - 1) <= engine.volatilities + 1e-12)
+    print("✅ Simulated prices stay within base ± volatility")
+
+if __name__ == "__main__":
+    test_bulk_alerts()
+    test_ingest_and_fan_out()
+    test_simulation_stays_in_band()
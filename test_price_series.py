@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the price time-series store and its hourly/daily rollups
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.db_manager import DatabaseManager
+from database.indexes import explain_query_plans, find_full_scans
+from database.migrations import MIGRATIONS, run_migrations
+from database.timeseries import format_timestamp, range_bounds
+from fixtures import make_db, temp_db_path
+
+SAMPLES = [
+    ("Tomatoes", 20, "Hamirpur", "2026-03-01 09:10:00"),
+    ("Tomatoes", 26, "Hamirpur", "2026-03-01 09:40:00"),
+    ("Tomatoes", 22, "Hamirpur", "2026-03-01 09:55:00"),
+    ("Tomatoes", 24, "Hamirpur", "2026-03-01 15:00:00"),
+    ("Tomatoes", 30, "Hamirpur", "2026-03-02 10:00:00"),
+    ("Tomatoes", 99, "Mandi", "2026-03-02 10:00:00"),
+    ("Onions", 31, "Hamirpur", "2026-03-02 11:00:00"),
+]
+
+def test_ohlc_rollups():
+    print("\n=== Testing OHLC rollups ===")
+    db = make_db("prices.db")
+    assert db.record_prices(SAMPLES) == len(SAMPLES)
+
+    hours = db.get_price_series("Tomatoes", "hour", "2026-03-01", "2026-03-03")
+    assert [bar.bucket for bar in hours] == ["2026-03-01 09:00:00", "2026-03-01 15:00:00", "2026-03-02 10:00:00"]
+    first = hours[0]
+    assert (first.open, first.high, first.low, first.close, first.samples) == (20, 26, 20, 22, 3)
+    assert abs(first.average - 68 / 3) < 1e-9 and first.sma_short is None
+
+    days = db.get_price_series("Tomatoes", "day", "2026-03-01", "2026-03-03")
+    assert [(bar.open, bar.high, bar.low, bar.close) for bar in days] == [(20, 26, 20, 24), (30, 30, 30, 30)]
+    assert [bar.sma_short for bar in days] == [24, 27]
+    assert db.get_price_series("Tomatoes", "day", "2026-03-01", "2026-03-03", location="Mandi")[0].close == 99
+    print("✅ Hourly and daily bars with moving averages")
+    db.close()
+
+def test_late_samples_merge():
+    print("\n=== Testing late and out-of-order samples ===")
+    db = make_db("prices.db")
+    db.record_prices(SAMPLES)
+    # Earlier than the day's open and higher than its high, in a later batch
+    db.record_price_data("Tomatoes", 40, "Hamirpur")
+    db.record_prices([("Tomatoes", 28, "Hamirpur", "2026-03-01 08:00:00")])
+    day = db.get_price_series("Tomatoes", "day", "2026-03-01", "2026-03-01")[0]
+    assert (day.open, day.high, day.close, day.samples) == (28, 28, 24, 5)
+    # Day 2's 7-day average picks up day 1's unchanged close
+    assert db.get_price_series("Tomatoes", "day", "2026-03-02", "2026-03-02")[0].sma_short == 27
+    print("✅ A late sample moved the open without touching the close")
+    db.close()
+
+def test_range_queries_skip_raw_rows():
+    print("\n=== Testing range query reads rollups only ===")
+    db = make_db("prices.db")
+    # A location of its own, away from the seeded sample prices
+    db.record_prices([(name, price, "Palampur" if location == "Hamirpur" else location, at)
+                      for name, price, location, at in SAMPLES])
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        db.get_price_series("Tomatoes", "hour", "2026-03-01", "2026-03-02", location="Palampur")
+        trends = db.get_price_trends("Palampur")
+        conn.set_trace_callback(None)
+    assert not any("price_history" in sql for sql in statements)
+    assert [(t.product_name, t.close, t.previous_close) for t in trends] == [("Onions", 31, None), ("Tomatoes", 30, 24)]
+    assert trends[1].change_percent == 25 and trends[0].change_percent == 0
+    print(f"✅ Trends: {[(t.product_name, round(t.change_percent, 1)) for t in trends]}")
+    db.close()
+
+def test_trends_seek_each_commodity():
+    print("\n=== Testing trend query plan ===")
+    db = make_db("prices.db")
+    db.record_prices([(name, 20 + day % 7 + offset, location, f"2026-{1 + day // 28:02d}-{1 + day % 28:02d} 10:00:00")
+                      for offset, name in enumerate(["Garlic", "Ginger", "Peas"])
+                      for location in ("Kangra", "Chamba") for day in range(84)])
+    with db.connection() as conn:
+        conn.execute("ANALYZE")
+        conn.commit()
+    trends = db.get_price_trends("Kangra")
+    assert [(t.product_name, t.bucket, t.close, t.previous_close) for t in trends] == \
+        [("Garlic", "2026-03-28", 26, 25), ("Ginger", "2026-03-28", 27, 26), ("Peas", "2026-03-28", 28, 27)]
+
+    report = explain_query_plans(db, [("get_price_trends", ("Kangra",))])
+    assert not find_full_scans(report), find_full_scans(report)
+    (_, details), = report["get_price_trends"]
+    assert "SEARCH d USING PRIMARY KEY (product_name=? AND location=? AND bucket=?)" in details, details
+    print("✅ Latest closes found by index seeks after ANALYZE, no price_daily scan")
+    db.close()
+
+def test_aware_timestamps_are_utc():
+    print("\n=== Testing time zones ===")
+    assert format_timestamp("2026-03-02T01:10:00+05:30") == "2026-03-01 19:40:00"
+    assert format_timestamp("2026-03-01 19:40:00") == "2026-03-01 19:40:00"  # naive text is already UTC
+    assert range_bounds("2026-03-01T00:00:00+05:30", "2026-03-02T04:00:00+05:30", "hour") == \
+        ("2026-02-28 18:00:00", "2026-03-01 22:00:00")
+
+    db = make_db("prices.db")
+    db.record_prices([("Peas", 40, "Kangra", "2026-03-02T01:10:00+05:30")])
+    bars = db.get_price_series("Peas", "hour", "2026-03-01", "2026-03-02", location="Kangra")
+    assert [bar.bucket for bar in bars] == ["2026-03-01 19:00:00"]
+    assert db.get_price_series("Peas", "day", "2026-03-01", "2026-03-01", location="Kangra")[0].close == 40
+    print("✅ A +05:30 sample lands in its UTC hour and day")
+    db.close()
+
+def test_migration_backfills_existing_history():
+    print("\n=== Testing rollup backfill ===")
+    db = DatabaseManager(temp_db_path("legacy_prices.db"))
+    with db.connection() as conn:
+        run_migrations(conn, [m for m in MIGRATIONS if m[0] < 7])
+        conn.executemany("INSERT INTO price_history (product_name, market_price, recorded_at) VALUES (?, ?, ?)",
+                         [("Wheat", 21, "2026-02-01 10:00:00"), ("Wheat", 23, "2026-02-01 12:00:00")])
+        conn.commit()
+    db.init_database()
+    bar = db.get_price_series("Wheat", "day", "2026-02-01", "2026-02-01")[0]
+    assert (bar.open, bar.close, bar.samples) == (21, 23, 2)
+    print("✅ Pre-existing price_history rows were rolled up")
+    db.close()
+
+if __name__ == "__main__":
+    test_ohlc_rollups()
+    test_late_samples_merge()
+    test_range_queries_skip_raw_rows()
+    test_trends_seek_each_commodity()
+    test_aware_timestamps_are_utc()
+    test_migration_backfills_existing_history()
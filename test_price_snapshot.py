@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached market price snapshot behind MarketPricesScreen
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.cache import SnapshotCache
+from fixtures import make_db
+
+def test_seeded_prices_in_snapshot():
+    print("\n=== Testing price snapshot ===")
+    db = make_db("snapshot.db")
+    snapshot = db.price_snapshot
+    assert snapshot.stale and snapshot.snapshot is None
+
+    trends = snapshot.refresh()
+    tomatoes = next(t for t in trends if t.product_name == "Tomatoes")
+    assert tomatoes.close == 25.5 and round(tomatoes.change_percent, 1) == 2.5
+    assert len(trends) == 10 and not snapshot.stale
+    print(f"✅ {len(trends)} seeded commodities, Tomatoes {tomatoes.change_percent:+.1f}%")
+
+    db.record_prices([("Tomatoes", 27.0)])
+    assert snapshot.stale
+    done = threading.Event()
+    snapshot.refresh_async(lambda rows, version: done.set())
+    assert done.wait(5)
+    assert next(t for t in snapshot.snapshot if t.product_name == "Tomatoes").close == 27.0
+    print("✅ Recording prices invalidates; the background refresh picks them up")
+    db.close()
+
+def test_concurrent_refreshes_coalesce():
+    print("\n=== Testing refresh coalescing ===")
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return ["row"]
+
+    cache = SnapshotCache(loader)
+    cache.invalidate()
+    finished = []
+    all_done = threading.Event()
+
+    def on_ready(rows, version):
+        finished.append(version)
+        if len(finished) == 3:
+            all_done.set()
+
+    for _ in range(3):
+        cache.refresh_async(on_ready)
+    release.set()
+    assert all_done.wait(5)
+    assert len(calls) == 1 and finished == [1, 1, 1] and cache.snapshot == ["row"]
+    print("✅ Three refresh requests shared one load")
+
+def test_failed_refresh_reports_error():
+    print("\n=== Testing failed refresh ===")
+    def loader():
+        raise RuntimeError("database is locked")
+
+    cache = SnapshotCache(loader)
+    cache.invalidate()
+    errors, ready = [], []
+    done = threading.Event()
+    cache.refresh_async(lambda rows, version: ready.append((rows, version)), errors.append)
+    cache.refresh_async(lambda rows, version: (ready.append((rows, version)), done.set()))
+    assert done.wait(5)
+    assert [str(e) for e in errors] == ["database is locked"]
+    assert ready == [(None, -1)] and cache.stale  # the caller without on_error still hears back
+    print("✅ A failed rebuild reaches on_error instead of leaving the screen loading")
+
+if __name__ == "__main__":
+    test_seeded_prices_in_snapshot()
+    test_concurrent_refreshes_coalesce()
+    test_failed_refresh_reports_error()
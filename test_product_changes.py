@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the updated_at watermark queries behind ProductListScreen refreshes
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import make_db
+
+USERS = [("Mohan", "9000000014", "seller", "Kullu")]
+
+def backdate(db, product_id):
+    """Pretend the product was last touched long ago"""
+    with db.connection() as conn:
+        conn.execute("UPDATE products SET updated_at = '2020-01-01 00:00:00' WHERE id = ?", (product_id,))
+        conn.commit()
+
+def test_updates_bump_updated_at():
+    print("\n=== Testing updated_at trigger ===")
+    db = make_db("changes.db", USERS)
+    product_id = db.add_product("9000000014", "Peas", "Vegetables", "", "kg", 30, 50)
+    backdate(db, product_id)
+    with db.connection() as conn:
+        conn.execute("UPDATE products SET price = 35 WHERE id = ?", (product_id,))
+        conn.commit()
+        updated_at = conn.execute("SELECT updated_at FROM products WHERE id = ?", (product_id,)).fetchone()[0]
+    assert updated_at > "2020-01-01 00:00:00", updated_at
+    print(f"✅ Plain UPDATE moved updated_at to {updated_at}")
+    db.close()
+
+def test_changed_since_watermark():
+    print("\n=== Testing watermark query ===")
+    db = make_db("changes.db", USERS)
+    ids = [db.add_product("9000000014", name, "Vegetables", "", "kg", 30, 50) for name in ("Peas", "Beans", "Okra")]
+    for product_id in ids:
+        backdate(db, product_id)
+
+    everything = db.get_user_products_changed("9000000014")
+    assert [p.name for p in everything] == ["Okra", "Beans", "Peas"]
+    watermark = max(p.updated_at for p in everything)
+    assert db.get_user_products_changed("9000000014", watermark) == everything  # same-second rows repeat
+
+    with db.connection() as conn:
+        conn.execute("UPDATE products SET stock_qty = 0 WHERE id = ?", (ids[1],))
+        conn.execute("DELETE FROM products WHERE id = ?", (ids[2],))
+        conn.commit()
+    new_id = db.add_product("9000000014", "Chillies", "Spices", "", "kg", 90, 5)
+
+    changed = db.get_user_products_changed("9000000014", "2020-01-01 00:00:01")
+    assert sorted(p.name for p in changed) == ["Beans", "Chillies"]
+    assert db.get_user_product_ids("9000000014") == {ids[0], ids[1], new_id}
+    print("✅ Only the updated and inserted rows come back; the ids query reveals the delete")
+    db.close()
+
+if __name__ == "__main__":
+    test_updates_bump_updated_at()
+    test_changed_since_watermark()
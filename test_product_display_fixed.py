@@ -22,24 +22,24 @@ def test_product_display():
 
     for i, product in enumerate(products):
         print(f"\nProduct {i+1}:")
-        print(f"  ID: {product[0]}")
-        print(f"  Seller Phone: {product[1]}")
-        print(f"  Name: {product[2]}")
-        print(f"  Category: {product[3]}")
-        print(f"  Variety: {product[4]}")
-        print(f"  Unit: {product[5]}")
-        print(f"  Price: {product[6]}")
-        print(f"  Quantity: {product[7]}")
-        print(f"  Description: {product[8]}")
-        print(f"  Status: {product[10]}")
+        print(f"  ID: {product.id}")
+        print(f"  Seller Phone: {product.seller_phone}")
+        print(f"  Name: {product.name}")
+        print(f"  Category: {product.category}")
+        print(f"  Variety: {product.variety}")
+        print(f"  Unit: {product.unit}")
+        print(f"  Price: {product.price}")
+        print(f"  Quantity: {product.stock_qty}")
+        print(f"  Description: {product.description}")
+        print(f"  Status: {product.status}")
 
         # Simulate the display logic
-        name = product[2]
-        category = product[3]
-        price = product[6]
-        unit = product[5]
-        quantity = product[7]
-        status = product[10] or 'Active'
+        name = product.name
+        category = product.category
+        price = product.price
+        unit = product.unit
+        quantity = product.stock_qty
+        status = product.status or 'Active'
 
         print("\nDisplay simulation:")
         print(f"  Product: {name}")
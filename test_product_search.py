@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the FTS5 product search
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.search import build_match_query
+from fixtures import make_db
+
+USERS = [("Ramesh Patel", "9000000007", "seller", "Mandi", "r@example.com")]
+PRODUCTS = [("9000000007", "Tomatoes", "Vegetables", "Hybrid", "kg", 25, 100, "Fresh red tomatoes"),
+            ("9000000007", "Wheat", "Grains", "Sharbati", "quintal", 2000, 10, "Golden wheat, good for tomato-free diets"),
+            ("9000000007", "Potatoes", "Vegetables", "Kufri", "kg", 15, 0, "Out of stock for now")]
+
+def names(rows):
+    return [row.name for row in rows]
+
+def test_match_query_is_safe():
+    print("\n=== Testing match query builder ===")
+    assert build_match_query("red tom") == '"red"* "tom"*'
+    assert build_match_query('to"m NEAR(') == '"to"* "m"* "NEAR"*'
+    assert build_match_query("  !! ") is None
+    print("✅ User text becomes quoted prefix terms")
+
+def test_prefix_search_and_ranking():
+    print("\n=== Testing prefix search and bm25 ranking ===")
+    db = make_db("search.db", USERS, PRODUCTS)
+    rows, cursor = db.search_products_page("tom")
+    # A name hit outranks a description-only hit
+    assert names(rows) == ["Tomatoes", "Wheat"], names(rows)
+    assert cursor is None
+    assert rows[0].name_highlight == "[b]Tomatoes[/b]"
+    assert "[b]tomato[/b]" in rows[1].description_snippet
+    assert names(db.search_products("sharb")) == ["Wheat"]
+    assert names(db.search_products("ramesh veg")) == ["Tomatoes"]  # seller name is indexed
+    assert db.search_products_page("pot")[0] == []  # out of stock
+    assert names(db.search_products_page("pot", in_stock=False)[0]) == ["Potatoes"]
+    print("✅ Prefix matches ranked with highlights")
+    db.close()
+
+def test_triggers_keep_index_in_sync():
+    print("\n=== Testing FTS sync triggers ===")
+    db = make_db("search.db", USERS, PRODUCTS)
+    with db.connection() as conn:
+        conn.execute("UPDATE products SET name = 'Cherry Tomatoes' WHERE name = 'Tomatoes'")
+        conn.execute("DELETE FROM products WHERE name = 'Wheat'")
+        conn.commit()
+    assert names(db.search_products("cherry")) == ["Cherry Tomatoes"]
+    assert db.search_products("sharbati") == []
+
+    db.update_user("9000000007", name="Suresh Patel")
+    assert names(db.search_products("suresh")) == ["Cherry Tomatoes"]
+    assert db.search_products("ramesh") == []
+    print("✅ Inserts, updates, deletes and seller renames reach the index")
+    db.close()
+
+def test_pagination():
+    print("\n=== Testing paginated search ===")
+    db = make_db("search.db", USERS, PRODUCTS)
+    for i in range(45):
+        db.add_product("9000000007", f"Tomato lot {i}", "Vegetables", "", "kg", 20, 5, "")
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = db.search_products_page("tomato", 20, cursor)
+        seen.extend(row.id for row in rows)
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3 and len(seen) == len(set(seen)) == 47
+    print(f"✅ {len(seen)} matches over {pages} pages")
+    db.close()
+
+if __name__ == "__main__":
+    test_match_query_is_safe()
+    test_prefix_search_and_ranking()
+    test_triggers_keep_index_in_sync()
+    test_pagination()
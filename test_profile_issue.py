@@ -66,14 +66,13 @@ def test_profile_loading():
                 if products:
                     print("   Products:")
                     for product in products[:3]:  # Show first 3
-                        print(f"   - {product[2]} ({product[3]}) - ₹{product[6]}/{product[5]} - Stock: {product[7]}")
+                        print(f"   - {product.name} ({product.category}) - ₹{product.price}/{product.unit} - Stock: {product.stock_qty}")
 
                 # Show order details
                 if orders:
                     print("   Recent orders:")
                     for order in orders[:2]:  # Show first 2
-                        order_id, order_number, buyer_phone, seller_phone, product_id, quantity, unit_price, total_amount, status, delivery_address, payment_method, notes, created_at, delivered_at, product_name, buyer_name = order
-                        print(f"   - Order #{order_number}: {product_name} x{quantity} = ₹{total_amount} ({status})")
+                        print(f"   - Order #{order.order_number}: {order.product_name} x{order.quantity} = ₹{order.total_amount} ({order.status})")
 
         except Exception as e:
             print(f"❌ Error during profile loading: {e}")
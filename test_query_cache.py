@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the read-through query cache and its table-level invalidation
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.cache import QueryCache, tables_read
+from fixtures import make_db
+
+SELLER = "9000000071"
+BUYER = "9000000072"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_ttl_and_memory_cap():
+    print("\n=== Testing QueryCache eviction ===")
+    clock = FakeClock()
+    cache = QueryCache(max_entries=2, ttl=10, clock=clock)
+    loads = []
+    def load(key):
+        return lambda: loads.append(key) or [key] * 3
+
+    cache.get_or_load("a", {"t"}, load("a"))
+    cache.get_or_load("b", {"t"}, load("b"))
+    assert cache.get_or_load("a", {"t"}, load("a")) == ["a"] * 3  # hit, now most recent
+    cache.get_or_load("c", {"t"}, load("c"))                      # evicts b
+    cache.get_or_load("b", {"t"}, load("b"))
+    assert loads == ["a", "b", "c", "b"] and cache.evictions == 2
+    print("✅ Least recently used entry evicted at the entry limit")
+
+    clock.now = 11
+    cache.get_or_load("b", {"t"}, load("b"))
+    assert loads[-1] == "b" and cache.expirations == 1
+    print("✅ Entries past their TTL are reloaded")
+
+    small = QueryCache(max_bytes=1500)
+    small.get_or_load("big", {"t"}, lambda: ["x" * 5000])
+    small.get_or_load("one", {"t"}, lambda: ["x" * 500])
+    small.get_or_load("two", {"t"}, lambda: ["y" * 500])
+    small.get_or_load("three", {"t"}, lambda: ["z" * 500])
+    assert len(small) == 2 and small.bytes <= 1500 and "big" not in small._entries
+    print(f"✅ Byte cap held: {small.bytes} bytes in {len(small)} entries")
+
+def test_invalidation_is_by_table_and_race_safe():
+    print("\n=== Testing QueryCache invalidation ===")
+    cache = QueryCache()
+    cache.get_or_load("schemes", tables_read("SELECT * FROM govt_schemes"), lambda: [1])
+    cache.get_or_load("listings", tables_read("SELECT * FROM products p JOIN users u ON 1"), lambda: [2])
+    assert cache.invalidate("users") == 1 and len(cache) == 1 and "schemes" in cache._entries
+    print("✅ Only entries that read the written table are dropped")
+
+    def slow_load():
+        cache.invalidate("products")  # a write lands while the read is running
+        return ["stale"]
+    assert cache.get_or_load("listings", {"products"}, slow_load) == ["stale"]
+    assert "listings" not in cache._entries
+    print("✅ A read overtaken by a write is returned but not cached")
+
+def test_database_manager_read_through():
+    print("\n=== Testing DatabaseManager cache ===")
+    db = make_db("cache.db", [("Seller", SELLER, "seller", "Mandi"), ("Buyer", BUYER, "buyer", "Una")],
+                 [(SELLER, "Tomatoes", "Vegetables", "", "kg", 25, 10)])
+
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        for _ in range(5):
+            db.get_govt_schemes()
+            db.get_all_products()
+            db.get_user_products(SELLER)
+        conn.set_trace_callback(None)
+    assert len([sql for sql in statements if sql.lstrip().startswith("SELECT")]) == 3
+    stats = db.cache_stats()
+    assert stats["hits"] == 12 and stats["misses"] == 3 and stats["entries"] == 3
+    print(f"✅ 15 screen reads ran 3 queries (hit rate {stats['hit_rate']:.0%})")
+
+    products = db.get_user_products(SELLER)
+    products.clear()  # callers get their own list
+    assert len(db.get_user_products(SELLER)) == 1
+
+    db.add_product(SELLER, "Onions", "Vegetables", "", "kg", 30, 10)
+    assert [p.name for p in db.get_user_products(SELLER)] == ["Onions", "Tomatoes"]
+    assert len(db.get_all_products()) == 2
+    assert db.cache_stats()["invalidations"] == 2  # schemes kept
+    db.get_govt_schemes()
+    assert db.cache_stats()["misses"] == 5
+    print("✅ add_product dropped both product reads and kept the schemes")
+
+    assert db.get_user_stats(SELLER, "seller").orders == 0
+    db.add_to_cart(BUYER, 1, 2)
+    db.create_order(BUYER, "Una bus stand")
+    assert db.get_user_stats(SELLER, "seller").orders == 1
+    assert db.get_all_products()[-1].stock_qty == 8
+    print("✅ Checkout refreshed trigger-maintained stats and stock")
+    db.close()
+
+if __name__ == "__main__":
+    test_lru_ttl_and_memory_cap()
+    test_invalidation_is_by_table_and_race_safe()
+    test_database_manager_read_through()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the background query executor used by the screens
+A fake main loop stands in for Kivy's Clock; uses a throwaway database
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.executor import QueryExecutor
+from fixtures import make_db
+
+class FakeMainLoop:
+    """Collects dispatched callbacks; pump() runs them on the calling (main) thread"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queue = []
+
+    def dispatch(self, callback, delay=0):
+        with self.lock:
+            self.queue.append((time.monotonic() + delay, callback))
+
+    def pump(self, seconds=0.0, until=None):
+        deadline = time.monotonic() + seconds
+        while True:
+            now = time.monotonic()
+            with self.lock:
+                due = [item for item in self.queue if item[0] <= now]
+                self.queue = [item for item in self.queue if item[0] > now]
+            for _, callback in due:
+                callback()
+            if (until is not None and until()) or now >= deadline:
+                return
+            time.sleep(0.005)
+
+USERS = [("Seller", "9000000001", "seller", "Hamirpur", "s@example.com")]
+PRODUCTS = [("9000000001", "Tomatoes", "Vegetables", "Desi", "kg", 25, 100)]
+
+def test_results_arrive_on_main_loop():
+    print("\n=== Testing result delivery ===")
+    db = make_db("executor.db", USERS, PRODUCTS)
+    loop = FakeMainLoop()
+    executor = QueryExecutor(db, dispatch=loop.dispatch)
+    main_thread = threading.get_ident()
+    results = []
+
+    executor.submit("get_user_products", "9000000001", owner="screen",
+                    on_result=lambda rows: results.append((threading.get_ident(), rows)))
+    loop.pump(5, until=lambda: results)
+    thread_id, rows = results[0]
+    assert thread_id == main_thread and [p.name for p in rows] == ["Tomatoes"]
+    assert executor.pending("screen") == 0 and executor.delivered == 1
+    print("✅ Query ran on a worker, result delivered on the main thread")
+
+    errors = []
+    executor.submit(lambda: 1 / 0, on_result=results.append, on_error=errors.append)
+    loop.pump(5, until=lambda: errors)
+    assert isinstance(errors[0], ZeroDivisionError) and len(results) == 1
+    print("✅ Exceptions go to on_error")
+    executor.shutdown()
+    db.close()
+
+def test_cancel_on_leave_and_loading_state():
+    print("\n=== Testing cancellation and loading state ===")
+    db = make_db("executor.db", USERS, PRODUCTS)
+    loop = FakeMainLoop()
+    executor = QueryExecutor(db, max_workers=1, dispatch=loop.dispatch)
+    release = threading.Event()
+    delivered, slow = [], []
+
+    def slow_query():
+        release.wait(5)
+        return db.get_user_products("9000000001")
+
+    executor.submit(slow_query, owner="marketplace", on_result=delivered.append, on_slow=lambda: slow.append(1))
+    queued = executor.submit("get_cart_items", "9000000002", owner="marketplace", on_result=delivered.append)
+    loop.pump(QueryExecutor.SLOW_AFTER + 0.1)
+    assert slow == [1] and not delivered
+    print("✅ A query still running after SLOW_AFTER triggers the loading state")
+
+    assert executor.cancel("marketplace") == 2
+    assert queued.future.cancelled()  # never reached a worker
+    release.set()
+    loop.pump(0.3)
+    assert not delivered and executor.pending("marketplace") == 0 and executor.dropped == 2
+    print("✅ Leaving the screen dropped both results")
+
+    fast = []
+    executor.submit("get_cart_items", "9000000002", on_result=fast.append, on_slow=lambda: slow.append(2))
+    loop.pump(QueryExecutor.SLOW_AFTER + 0.1)
+    assert fast == [[]] and slow == [1]
+    print("✅ Fast queries never flash a loading state")
+    executor.shutdown()
+    db.close()
+
+if __name__ == "__main__":
+    test_results_arrive_on_main_loop()
+    test_cancel_on_leave_and_loading_state()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script checking that every public DatabaseManager query uses an index
+Runs EXPLAIN QUERY PLAN on the SQL each method actually executes
+"""
+
+import sys
+import os
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.db_manager import DatabaseManager
+from database.indexes import INDEXES, explain_query_plans, find_full_scans
+from fixtures import make_db, temp_db_path
+
+def test_no_full_table_scans():
+    """No public query method falls back to a full table scan"""
+    print("\n=== Testing query plans ===")
+    db = make_db("plans.db")
+
+    for method_name, statements in explain_query_plans(db).items():
+        for _, details in statements:
+            print(f"   {method_name}: {' | '.join(details)}")
+
+    scans = db.verify_query_plans()
+    assert scans == [], scans
+    print("✅ All hot queries are index-backed")
+    db.close()
+
+def analyze(db):
+    with db.connection() as conn:
+        conn.execute("ANALYZE")
+        conn.commit()
+
+def test_no_full_table_scans_after_analyze():
+    """Statistics of a small, real-looking database do not turn lookups into scans"""
+    print("\n=== Testing query plans after ANALYZE ===")
+    db = make_db("analyzed.db", [("Seller", "9000000091", "seller", "Mandi"), ("Buyer", "9000000092", "buyer", "Mandi")],
+                 [("9000000091", name, "Vegetables", "", "kg", price, 10)
+                  for name, price in [("Tomatoes", 20), ("Onions", 30), ("Apples", 80), ("Potatoes", 18)]])
+    for product_id in (1, 2, 3):
+        db.add_to_cart("9000000092", product_id, 1)
+    db.record_prices([(name, 20 + day, "Hamirpur", f"2026-03-{day:02d} 10:00:00")
+                      for name in ("Tomatoes", "Onions") for day in range(1, 11)])
+    analyze(db)
+    assert db.verify_query_plans() == []
+    report = explain_query_plans(db)
+    for method_name in ("search_products", "search_products_page"):
+        for _, details in report[method_name]:
+            # The MATCH drives the join, rather than running once per product row
+            assert "VIRTUAL TABLE INDEX" in details[0], details
+    print("✅ One buyer, four listings: only small-table and by-design scans")
+
+    # Grown past the small-table allowance, nothing is exempt any more
+    for seller in range(5):
+        phone = f"70000000{seller:02d}"
+        db.create_user(f"Seller {seller}", phone, "", "secret1", "seller", "Kullu")
+        for crop in range(30):
+            db.add_product(phone, f"Crop {crop}", "Fruits" if crop % 2 else "Vegetables", "", "kg", 10 + crop, 5)
+    for buyer in range(120):
+        phone = f"8000000{buyer:03d}"
+        db.create_user(f"Buyer {buyer}", phone, "", "secret1", "buyer", "Mandi")
+        db.add_to_cart(phone, 1 + buyer % 150, 1)
+    analyze(db)
+    scans = find_full_scans(explain_query_plans(db), ignore=())
+    assert scans == [], scans
+    print("✅ 150 listings, 120 buyers: every query, carts included, is index-backed")
+    db.close()
+
+def test_indexes_added_to_existing_database():
+    """A database created before the index set gets it on the next init"""
+    print("\n=== Testing index migration ===")
+    path = temp_db_path("legacy.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute("""CREATE TABLE products(id INTEGER PRIMARY KEY AUTOINCREMENT,
+        seller_phone TEXT NOT NULL, name TEXT NOT NULL, category TEXT NOT NULL, variety TEXT,
+        unit TEXT NOT NULL, price REAL NOT NULL, stock_qty REAL NOT NULL, description TEXT,
+        image_path TEXT, status TEXT DEFAULT 'active', created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP)""")
+    legacy.commit()
+    legacy.close()
+
+    db = DatabaseManager(path)
+    db.init_database()
+    with db.connection() as conn:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    missing = [name for name, _ in INDEXES if name not in existing]
+    assert not missing, missing
+    print(f"✅ {len(INDEXES)} indexes present after migration")
+    db.close()
+
+if __name__ == "__main__":
+    test_no_full_table_scans()
+    test_no_full_table_scans_after_analyze()
+    test_indexes_added_to_existing_database()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the lazy screen registry behind create_screen_manager
+Checks declarations statically, so it runs without Kivy installed
+"""
+
+import sys
+import os
+import ast
+import importlib.util
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from screens.registry import LIKELY_NEXT, SCREENS, ScreenRegistry
+
+def test_declarations_resolve():
+    print("\n=== Testing screen declarations ===")
+    for name, target in SCREENS.items():
+        module_name, class_name = target.split(":")
+        spec = importlib.util.find_spec(module_name)
+        assert spec is not None, f"{name}: no module {module_name}"
+        with open(spec.origin, encoding="utf-8") as source:
+            tree = ast.parse(source.read())
+        classes = {node.name for node in tree.body if isinstance(node, ast.ClassDef)}
+        assert class_name in classes, f"{name}: {class_name} not defined in {module_name}"
+    for current, following in LIKELY_NEXT.items():
+        assert current in SCREENS and all(name in SCREENS for name in following), current
+    print(f"✅ {len(SCREENS)} screens point at classes that exist")
+
+def test_modules_import_on_first_use():
+    print("\n=== Testing lazy import ===")
+    package_dir = tempfile.mkdtemp()
+    with open(os.path.join(package_dir, "lazy_demo_screens.py"), "w") as module:
+        module.write("class DemoScreen:\n    pass\n\nclass OtherScreen:\n    pass\n")
+    sys.path.insert(0, package_dir)
+    try:
+        registry = ScreenRegistry({"demo": "lazy_demo_screens:DemoScreen",
+                                   "other": "lazy_demo_screens:OtherScreen"},
+                                  {"demo": ["other", "missing"]})
+        assert "lazy_demo_screens" not in sys.modules and not registry.is_loaded("demo")
+
+        cls = registry.screen_class("demo")
+        assert cls.__name__ == "DemoScreen" and "lazy_demo_screens" in sys.modules
+        assert registry.screen_class("demo") is cls and list(registry.load_times) == ["demo"]
+        print("✅ Module imported on first lookup and cached")
+
+        assert registry.preload_candidates("demo") == ["other"]
+        assert registry.preload_candidates("demo", loaded=["other"]) == []
+        assert registry.preload_candidates("other") == []
+        print("✅ Preload candidates skip built and unknown screens")
+    finally:
+        sys.path.remove(package_dir)
+        sys.modules.pop("lazy_demo_screens", None)
+
+if __name__ == "__main__":
+    test_declarations_resolve()
+    test_modules_import_on_first_use()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for joined seller data in listings and the seller profile cache
+Uses a throwaway database so data/agrimart.db is never touched
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.cache import TTLCache
+from fixtures import make_db
+
+USERS = [("Reema", "9000000008", "seller", "Kangra", "reema@example.com")]
+PRODUCTS = [("9000000008", "Apples", "Fruits", "Royal", "kg", 80, 40, "Crisp apples")]
+
+def test_listing_carries_seller_details():
+    print("\n=== Testing joined listing query ===")
+    db = make_db("sellers.db", USERS, PRODUCTS)
+    products, _ = db.get_products_page(20)
+    product = products[0]
+    seller = (product.seller_name, product.seller_location, product.seller_email)
+    assert product.name == "Apples"
+    assert seller == ("Reema", "Kangra", "reema@example.com")
+    print(f"✅ Listing row includes seller: {seller}")
+    db.close()
+
+def test_contact_dialog_served_from_memory():
+    print("\n=== Testing seller profile cache ===")
+    db = make_db("sellers.db", USERS, PRODUCTS)
+    db.get_products_page(20)
+
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        profile = db.get_seller_profile("9000000008")
+        conn.set_trace_callback(None)
+    assert statements == [], statements
+    assert profile == {'name': "Reema", 'email': "reema@example.com", 'location': "Kangra"}
+    print("✅ Contact details came from the cache without a query")
+
+    db.update_user("9000000008", name="Reema Devi")
+    assert db.get_seller_profile("9000000008")['name'] == "Reema Devi"
+    assert db.get_seller_profile("9000000000")['name'] == "Unknown Seller"
+    print("✅ update_user invalidated the cached profile")
+    db.close()
+
+def test_ttl_expiry():
+    print("\n=== Testing TTL expiry ===")
+    now = [1000.0]
+    cache = TTLCache(ttl=10, clock=lambda: now[0])
+    cache.set("9000000008", {"name": "Reema"})
+    assert cache.get("9000000008") == {"name": "Reema"}
+    now[0] += 11
+    assert cache.get("9000000008") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    print("✅ Entries expire after their TTL")
+
+if __name__ == "__main__":
+    test_listing_carries_seller_details()
+    test_contact_dialog_served_from_memory()
+    test_ttl_expiry()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the startup profiler and the cold-start time budget
+The headless phases (imports, database init) run in a fresh interpreter;
+a trace recorded from the real app via AGRI_STARTUP_TRACE is checked too
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.startup_profiler import STARTUP_BUDGET_MS, TRACE_ENV_VAR, StartupProfiler, load_trace
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+HEADLESS_STARTUP = """
+import sys
+from utils.startup_profiler import StartupProfiler
+profiler = StartupProfiler()
+with profiler.phase("imports"):
+    from database.db_manager import DatabaseManager
+    from database.executor import QueryExecutor
+    from screens.registry import ScreenRegistry
+with profiler.phase("db_init"):
+    db = DatabaseManager(sys.argv[2])
+    db.init_database(defer=True)
+profiler.finish()
+profiler.dump(sys.argv[1])
+db.close()
+"""
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_phases_and_trace():
+    print("\n=== Testing phase recording ===")
+    clock = FakeClock()
+    profiler = StartupProfiler(clock=clock)
+    with profiler.phase("imports"):
+        clock.now = 0.4
+    start = profiler.begin()
+    clock.now = 0.5
+    profiler.mark("interactive")
+    profiler.end("first_frame", start)
+    profiler.finish()
+
+    durations = {name: round(ms, 6) for name, ms in profiler.durations().items()}
+    assert durations == {"imports": 400.0, "first_frame": 100.0, "total": 500.0}
+    trace = json.loads(json.dumps(profiler.trace()))
+    assert [(e["name"], e["ph"]) for e in trace["traceEvents"]] == [
+        ("imports", "X"), ("interactive", "i"), ("first_frame", "X")]
+    assert round(trace["traceEvents"][2]["ts"]) == 400000 and round(trace["traceEvents"][2]["dur"]) == 100000
+    assert profiler.over_budget({"imports": 300, "first_frame": 200}) == [("imports", 400.0, 300)]
+    print("✅ Phases, marks and budget overruns recorded")
+
+    disabled = StartupProfiler(enabled=False)
+    with disabled.phase("imports"):
+        pass
+    disabled.finish()
+    assert disabled.durations() == {} and disabled.trace()["traceEvents"] == []
+    print("✅ A disabled profiler records nothing")
+
+def test_headless_startup_within_budget():
+    print("\n=== Testing headless startup budget ===")
+    workdir = tempfile.mkdtemp()
+    trace_file = os.path.join(workdir, "startup.json")
+    subprocess.run([sys.executable, "-c", HEADLESS_STARTUP, trace_file, os.path.join(workdir, "startup.db")],
+                   cwd=ROOT, check=True, capture_output=True)
+    phases = load_trace(trace_file)
+    print(f"   {', '.join(f'{name} {ms:.0f} ms' for name, ms in phases.items())}")
+    over = [(name, ms) for name, ms in phases.items() if ms > STARTUP_BUDGET_MS[name]]
+    assert not over, f"over budget: {over}"
+    print("✅ Imports and database init of a fresh install are within budget")
+
+def test_recorded_app_trace_within_budget():
+    print("\n=== Testing recorded app trace ===")
+    trace_file = os.environ.get(TRACE_ENV_VAR)
+    if not trace_file or not os.path.exists(trace_file):
+        print(f"⚠️ Set {TRACE_ENV_VAR} to a trace from `python main.py` to check it, skipped")
+        return
+    phases = load_trace(trace_file)
+    over = [(name, ms) for name, ms in phases.items() if name in STARTUP_BUDGET_MS and ms > STARTUP_BUDGET_MS[name]]
+    assert not over, f"over budget: {over}"
+    print(f"✅ App reached its first frame in {phases['total']:.0f} ms")
+
+if __name__ == "__main__":
+    test_phases_and_trace()
+    test_headless_startup_within_budget()
+    test_recorded_app_trace_within_budget()
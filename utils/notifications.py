@@ -1,64 +1,69 @@
 # utils/notifications.py - Notification management system
-from datetime import datetime
-
 class NotificationManager:
-    def __init__(self):
-        self.notifications = []
+    """Sends notifications to users and keeps them in the notifications table
+
+    Everything is persisted through DatabaseManager, so the in-app list and
+    unread badge survive restarts and only ever show the user's own items.
+    """
 
-    def send_notification(self, title, message, notification_type="general"):
-        """Send notification to user"""
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def notify_system(self, title, message):
+        """Show a system notification where the platform supports it"""
         try:
-            # Try system notification first
-            try:
-                from plyer import notification as plyer_notification
-                plyer_notification.notify(
-                    title=title,
-                    message=message,
-                    timeout=10
-                )
-            except:
-                pass  # System notifications not available
+            from plyer import notification as plyer_notification
+            plyer_notification.notify(
+                title=title,
+                message=message,
+                timeout=10
+            )
+        except Exception:
+            pass  # System notifications not available
 
+    def send_notification(self, user_phone, title, message, notification_type="general", system=True):
+        """Send notification to user; returns the stored notification id or None"""
+        try:
+            if system:
+                self.notify_system(title, message)
             # Store notification for in-app display
-            notification = {
-                "id": len(self.notifications) + 1,
-                "title": title,
-                "message": message,
-                "type": notification_type,
-                "timestamp": datetime.now().isoformat(),
-                "read": False
-            }
-            self.notifications.append(notification)
-
-            return True
+            return self.db_manager.add_notification(user_phone, title, message, notification_type)
         except Exception as e:
             print(f"Error sending notification: {e}")
-            return False
+            return None
+
+    def send_bulk(self, user_phones, title, message, notification_type="general"):
+        """Store the same notification for many users in one transaction; returns how many"""
+        return self.db_manager.add_notifications(
+            (user_phone, title, message, notification_type) for user_phone in user_phones)
+
+    def get_notifications(self, user_phone, page_size=20, cursor=None, unread_only=False):
+        """One page of the user's notifications, newest first: (notifications, next_cursor)"""
+        return self.db_manager.get_notifications_page(user_phone, page_size, cursor, unread_only)
+
+    def unread_count(self, user_phone):
+        return self.db_manager.get_unread_count(user_phone)
 
-    def get_notifications(self, user_phone=None):
-        """Get notifications for user"""
-        return self.notifications
+    def mark_as_read(self, user_phone, notification_ids=None):
+        """Mark notifications read - all of the user's when no ids are given"""
+        return self.db_manager.mark_notifications_read(user_phone, notification_ids)
 
-    def mark_as_read(self, notification_id):
-        """Mark notification as read"""
-        for notification in self.notifications:
-            if notification["id"] == notification_id:
-                notification["read"] = True
-                return True
-        return False
+    def prune(self, retention_days=None):
+        """Drop read notifications past the retention period"""
+        return self.db_manager.prune_notifications(retention_days)
 
-    def send_price_alert(self, product_name, old_price, new_price):
+    def send_price_alert(self, user_phone, product_name, old_price, new_price):
         """Send price increase alert"""
         increase_percent = ((new_price - old_price) / old_price) * 100
 
         title = "Price Alert 📈"
         message = f"{product_name} price increased by {increase_percent:.1f}% (₹{old_price:.2f} → ₹{new_price:.2f})"
 
-        return self.send_notification(title, message, "price_alert")
+        return self.send_notification(user_phone, title, message, "price_alert")
 
-    def send_order_notification(self, order_details):
+    def send_order_notification(self, user_phone, order_details):
         """Send order-related notification"""
         title = "Order Update 📦"
         message = f"Order #{order_details.get('order_number', 'Unknown')} status: {order_details.get('status', 'Updated')}"
 
-        return self.send_notification(title, message, "order_update")
\ No newline at end of file
+        return self.send_notification(user_phone, title, message, "order_update")
@@ -0,0 +1,91 @@
+# utils/price_engine.py - Vectorized market price simulation and alert detection
+import numpy as np
+
+
+class PriceEngine:
+    """Market prices for many commodities held in flat NumPy arrays
+
+    One tick prices every commodity at once (simulated or ingested), compares
+    the whole snapshot with the previous one and returns every alert above the
+    threshold, with no per-commodity Python loop. Seller holdings are kept as
+    parallel (seller, commodity) index arrays so alerts fan out to sellers in
+    the same pass.
+    """
+
+    def __init__(self, names, base_prices, volatilities, threshold=5.0, seed=None):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.base_prices = np.asarray(base_prices, dtype=np.float64)
+        self.volatilities = np.asarray(volatilities, dtype=np.float64)
+        self.threshold = threshold
+        self.rng = np.random.default_rng(seed)
+        # Previous snapshot; NaN until a commodity has been priced once
+        self.last_prices = np.full(len(self.names), np.nan)
+
+        self.sellers = []
+        self.holding_sellers = np.empty(0, dtype=np.int64)
+        self.holding_commodities = np.empty(0, dtype=np.int64)
+
+    @classmethod
+    def from_market_data(cls, market_data, **kwargs):
+        """Build from a {name: {"base_price": ..., "volatility": ...}} table"""
+        names = list(market_data)
+        return cls(names,
+                   [market_data[name]["base_price"] for name in names],
+                   [market_data[name]["volatility"] for name in names],
+                   **kwargs)
+
+    def set_holdings(self, pairs):
+        """Replace seller holdings with (seller, commodity name) pairs; unknown names are ignored"""
+        seller_index = {}
+        sellers, commodities = [], []
+        for seller, name in pairs:
+            commodity = self.index.get(name)
+            if commodity is None:
+                continue
+            sellers.append(seller_index.setdefault(seller, len(seller_index)))
+            commodities.append(commodity)
+        self.sellers = list(seller_index)
+        self.holding_sellers = np.asarray(sellers, dtype=np.int64)
+        self.holding_commodities = np.asarray(commodities, dtype=np.int64)
+
+    def simulate(self):
+        """One random market snapshot: base * (1 +/- volatility) for every commodity"""
+        return self.base_prices * (1 + self.rng.uniform(-self.volatilities, self.volatilities))
+
+    def tick(self, prices=None):
+        """Advance to a new snapshot (simulated when prices is None)
+
+        Returns (commodity indices, new prices, percent changes) for every
+        commodity whose price rose by more than the threshold.
+        """
+        prices = self.simulate() if prices is None else np.asarray(prices, dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            change = (prices - self.last_prices) / self.last_prices * 100
+        # NaN (first sighting) compares False, so new commodities never alert
+        alerted = np.flatnonzero(change > self.threshold)
+        self.last_prices = prices
+        return alerted, prices[alerted], change[alerted]
+
+    def ingest(self, names, prices):
+        """Tick with observed prices for some commodities; the rest keep their last price"""
+        snapshot = self.last_prices.copy()
+        known = [(self.index[name], price) for name, price in zip(names, prices) if name in self.index]
+        if known:
+            indices, values = zip(*known)
+            snapshot[list(indices)] = values
+        return self.tick(snapshot)
+
+    def seller_alerts(self, alerted):
+        """Fan commodity alerts out to holdings: (seller indices, commodity indices)"""
+        mask = np.zeros(len(self.names), dtype=bool)
+        mask[alerted] = True
+        hit = mask[self.holding_commodities]
+        return self.holding_sellers[hit], self.holding_commodities[hit]
+
+    def price_of(self, name):
+        """Last known price of one commodity, or None"""
+        i = self.index.get(name)
+        if i is None or np.isnan(self.last_prices[i]):
+            return None
+        return float(self.last_prices[i])
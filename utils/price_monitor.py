@@ -4,6 +4,9 @@ import threading
 from datetime import datetime
 from kivymd.uix.snackbar import Snackbar
 
+from utils.notifications import NotificationManager
+from utils.price_engine import PriceEngine
+
 # Sample market data for price simulation
 MARKET_DATA = {
     "Tomatoes": {"base_price": 25, "volatility": 0.15},
@@ -18,7 +21,9 @@ MARKET_DATA = {
 class PriceMonitor:
     def __init__(self, app):
         self.app = app
-        self.last_prices = {}
+        # Prices for every commodity move together in one NumPy tick
+        self.engine = PriceEngine.from_market_data(MARKET_DATA, threshold=5.0)
+        self.notifications = NotificationManager(app.db_manager)
 
     def check_price_updates(self, dt):
         """Check for price updates and send alerts (called periodically)"""
@@ -37,34 +42,21 @@ class PriceMonitor:
         try:
             phone = self.app.store.get("session")["phone"]
             products = self.app.db_manager.get_user_products(phone)
+            listed = {product.name for product in products}
 
-            for product in products:
-                product_name = product[2]  # name column
-                current_seller_price = product[6]  # price column
-
-                # Simulate market price check
-                if product_name in MARKET_DATA:
-                    market_data = MARKET_DATA[product_name]
-                    base_price = market_data["base_price"]
-                    volatility = market_data["volatility"]
-
-                    # Simulate market price with volatility
-                    current_market_price = base_price * (1 + random.uniform(-volatility, volatility))
-
-                    # Check if price increased significantly (>5%)
-                    last_price = self.last_prices.get(product_name, current_market_price)
-                    price_increase_percent = (current_market_price - last_price) / last_price * 100
-
-                    if price_increase_percent > 5.0:
-                        self._send_price_alert(product_name, current_market_price, price_increase_percent)
-
-                    # Update last known price
-                    self.last_prices[product_name] = current_market_price
+            # Whole market in one step; only rises above the threshold come back
+            # These ticks are simulated, so they never go into price_history or
+            # its rollups - those hold observed and entered prices only
+            alerted, prices, changes = self.engine.tick()
+            for commodity, price, change in zip(alerted, prices, changes):
+                product_name = self.engine.names[commodity]
+                if product_name in listed:
+                    self._send_price_alert(phone, product_name, float(price), float(change))
 
         except Exception as e:
             print(f"Error in price monitoring: {e}")
 
-    def _send_price_alert(self, product_name, new_price, increase_percent):
+    def _send_price_alert(self, phone, product_name, new_price, increase_percent):
         """Send price increase alert"""
         try:
             message = f"🚀 {product_name} price rising! Market: ₹{new_price:.2f} (+{increase_percent:.1f}%). Update your listing!"
@@ -73,16 +65,8 @@ class PriceMonitor:
             from kivy.clock import Clock
             Clock.schedule_once(lambda dt: Snackbar(text=message, duration=5).open(), 0)
 
-            # Try system notification if available
-            try:
-                from plyer import notification
-                notification.notify(
-                    title="Price Alert 📈",
-                    message=f"{product_name} price increased by {increase_percent:.1f}%",
-                    timeout=10
-                )
-            except:
-                pass  # Notification not available
+            # System notification where available, and kept in the seller's notification list
+            self.notifications.send_notification(phone, "Price Alert 📈", message, "price_alert")
 
         except Exception as e:
             print(f"Error sending price alert: {e}")
@@ -0,0 +1,109 @@
+# utils/startup_profiler.py - Cold-start phase timings, dumped as a JSON trace
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Set to a file path to record a startup trace: AGRI_STARTUP_TRACE=startup.json python main.py
+TRACE_ENV_VAR = "AGRI_STARTUP_TRACE"
+
+# Milliseconds each phase may take before test_startup_budget fails
+STARTUP_BUDGET_MS = {
+    "imports": 2500,
+    "db_init": 1000,
+    "kv_parse": 1500,
+    "screen_build": 1000,
+    "first_frame": 1000,
+    "total": 6000,
+}
+
+
+class StartupProfiler:
+    """Records named startup phases relative to the moment it was created
+
+    Phases nest and may run on any thread. trace() is Chrome trace-event JSON
+    (load it in chrome://tracing or Perfetto) plus a per-phase summary.
+    A disabled profiler's phase() and mark() cost one attribute check.
+    """
+
+    def __init__(self, enabled=True, clock=time.perf_counter):
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+        self.events = []    # (name, start, end, thread id); end is None for marks
+        self.finished = None
+
+    @contextmanager
+    def phase(self, name):
+        start = self.begin()
+        try:
+            yield
+        finally:
+            self.end(name, start)
+
+    def begin(self):
+        """Start of a phase that cannot be wrapped in phase(), e.g. one ended by an event"""
+        return self._clock() if self.enabled else None
+
+    def end(self, name, start):
+        if self.enabled and start is not None:
+            self._record(name, start, self._clock())
+
+    def mark(self, name):
+        """Instant event, e.g. the first frame being presented"""
+        if self.enabled:
+            self._record(name, self._clock(), None)
+
+    def finish(self):
+        """End of startup; total is measured up to this point"""
+        if self.enabled and self.finished is None:
+            self.finished = self._clock()
+
+    def _record(self, name, start, end):
+        with self._lock:
+            self.events.append((name, start, end, threading.get_ident()))
+
+    def durations(self):
+        """{phase: milliseconds}, summed over repeats, plus total once finished"""
+        summary = {}
+        for name, start, end, _ in self.events:
+            if end is not None:
+                summary[name] = summary.get(name, 0.0) + (end - start) * 1000
+        if self.finished is not None:
+            summary["total"] = (self.finished - self.started) * 1000
+        return summary
+
+    def over_budget(self, budget=STARTUP_BUDGET_MS):
+        """[(phase, ms, limit_ms)] for every recorded phase that ran over its limit"""
+        return [(name, ms, budget[name]) for name, ms in self.durations().items()
+                if name in budget and ms > budget[name]]
+
+    def trace(self):
+        pid = os.getpid()
+        events = []
+        for name, start, end, thread_id in self.events:
+            event = {"name": name, "pid": pid, "tid": thread_id, "ts": (start - self.started) * 1e6}
+            if end is None:
+                event.update(ph="i", s="g")
+            else:
+                event.update(ph="X", dur=(end - start) * 1e6)
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms", "phases_ms": self.durations()}
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.trace(), f, indent=2)
+        print(f"⏱️ Startup trace written to {path}")
+
+
+def load_trace(path):
+    """{phase: milliseconds} summary of a trace written by dump()"""
+    with open(path) as f:
+        return json.load(f)["phases_ms"]
+
+
+# Created at import, so importing this module first in main.py starts the clock
+trace_path = os.environ.get(TRACE_ENV_VAR)
+startup_profiler = StartupProfiler(enabled=bool(trace_path))